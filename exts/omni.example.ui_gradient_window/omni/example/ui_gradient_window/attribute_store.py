@@ -0,0 +1,315 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = [
+    "FLOAT", "INT", "BOOL",
+    "AttributeStore", "AttributeValueModel", "AttributeItemModel", "AttributeComboModel",
+]
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+import numpy as np
+
+import omni.ui as ui
+
+FLOAT = "float"
+INT = "int"
+BOOL = "bool"
+
+_DTYPES = {FLOAT: np.float64, INT: np.int64, BOOL: np.bool_}
+_INITIAL_CAPACITY = 16
+
+
+class _Column:
+    """The values of one dtype in the contiguous array"""
+
+    def __init__(self, dtype):
+        self.values = np.zeros(_INITIAL_CAPACITY, dtype=dtype)
+        self.defaults = np.zeros(_INITIAL_CAPACITY, dtype=dtype)
+        # The index of the attribute that owns the slot
+        self.owners = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self.size = 0
+
+    def allocate(self, defaults: np.ndarray, owner: int) -> int:
+        """Add the slots with the default values, returns the offset of the first one"""
+        offset = self.size
+        end = offset + len(defaults)
+        if end > len(self.values):
+            capacity = max(end, 2 * len(self.values))
+            for name in ("values", "defaults", "owners"):
+                array = getattr(self, name)
+                grown = np.zeros(capacity, dtype=array.dtype)
+                grown[: self.size] = array[: self.size]
+                setattr(self, name, grown)
+        self.values[offset:end] = defaults
+        self.defaults[offset:end] = defaults
+        self.owners[offset:end] = owner
+        self.size = end
+        return offset
+
+
+class _Attribute:
+    __slots__ = ("name", "index", "dtype", "offset", "size", "options", "model")
+
+    def __init__(self, name, index, dtype, offset, size, options):
+        self.name = name
+        self.index = index
+        self.dtype = dtype
+        self.offset = offset
+        self.size = size
+        self.options = options
+        # The adapter the widgets bind to, created on demand
+        self.model = None
+
+
+class AttributeValueModel(ui.AbstractValueModel):
+    """The value model of the scalar attribute, or of one component of the vector attribute"""
+
+    def __init__(self, store: "AttributeStore", name: str, component: int = 0):
+        super().__init__()
+        self.__store = store
+        self.__name = name
+        self.__component = component
+
+    def get_value_as_float(self) -> float:
+        return float(self.__store.get_component(self.__name, self.__component))
+
+    def get_value_as_int(self) -> int:
+        return int(self.__store.get_component(self.__name, self.__component))
+
+    def get_value_as_bool(self) -> bool:
+        return bool(self.__store.get_component(self.__name, self.__component))
+
+    def get_value_as_string(self) -> str:
+        return str(self.__store.get_component(self.__name, self.__component))
+
+    def set_value(self, value):
+        self.__store.set_component(self.__name, self.__component, value)
+
+    def _notify(self):
+        self._value_changed()
+
+
+class _ComponentItem(ui.AbstractItem):
+    def __init__(self, model: ui.AbstractValueModel):
+        super().__init__()
+        self.model = model
+
+
+class AttributeItemModel(ui.AbstractItemModel):
+    """The item model of the vector attribute, for MultiFloatDragField and ColorWidget"""
+
+    def __init__(self, store: "AttributeStore", name: str, size: int):
+        super().__init__()
+        self.__items = [_ComponentItem(AttributeValueModel(store, name, i)) for i in range(size)]
+
+    def get_item_children(self, item=None):
+        return self.__items if item is None else []
+
+    def get_item_value_model_count(self, item=None):
+        return 1
+
+    def get_item_value_model(self, item=None, column_id=0):
+        return item.model if item else None
+
+    def _notify(self):
+        for item in self.__items:
+            item.model._notify()
+            self._item_changed(item)
+
+
+class AttributeComboModel(ui.AbstractItemModel):
+    """The item model of the ComboBox. The attribute is the current index."""
+
+    def __init__(self, store: "AttributeStore", name: str, options: Sequence[str]):
+        super().__init__()
+        self.__index = AttributeValueModel(store, name)
+        self.__items = [_ComponentItem(ui.SimpleStringModel(option)) for option in options]
+
+    def get_item_children(self, item=None):
+        return self.__items if item is None else []
+
+    def get_item_value_model_count(self, item=None):
+        return 1
+
+    def get_item_value_model(self, item=None, column_id=0):
+        return item.model if item else self.__index
+
+    def _notify(self):
+        self.__index._notify()
+        self._item_changed(None)
+
+
+class AttributeStore:
+    """
+    The values of the window in one contiguous NumPy array per dtype. The
+    widgets bind to the model adapters of the attributes. Bulk reads, writes
+    and diffs against the defaults are vector operations, and only the models
+    of the attributes that really changed are notified.
+
+    The widgets listen to their models, so unlike the store of the Julia
+    modeler, it has no listeners of the whole store.
+    """
+
+    def __init__(self):
+        self.__columns = {dtype: _Column(np_dtype) for dtype, np_dtype in _DTYPES.items()}
+        self.__attributes: Dict[str, _Attribute] = {}
+        self.__by_index: List[_Attribute] = []
+
+    def destroy(self):
+        self.__attributes = {}
+        self.__by_index = []
+
+    def __len__(self):
+        return len(self.__by_index)
+
+    def __contains__(self, name: str):
+        return name in self.__attributes
+
+    @property
+    def names(self) -> List[str]:
+        """The names of the attributes in the order they are added"""
+        return [attribute.name for attribute in self.__by_index]
+
+    def add(self, name: str, default, dtype: str = FLOAT, options: Optional[Sequence[str]] = None):
+        """
+        Add the attribute. The sequence default makes the vector attribute.
+        The options make the attribute the index of the ComboBox.
+        """
+        if name in self.__attributes:
+            raise ValueError(f"The attribute '{name}' already exists")
+        if dtype not in _DTYPES:
+            raise ValueError(f"Unknown dtype '{dtype}'")
+
+        defaults = np.atleast_1d(np.asarray(default, dtype=_DTYPES[dtype]))
+        index = len(self.__by_index)
+        offset = self.__columns[dtype].allocate(defaults, index)
+        attribute = _Attribute(name, index, dtype, offset, len(defaults), list(options) if options else None)
+        self.__attributes[name] = attribute
+        self.__by_index.append(attribute)
+
+    def get_model(self, name: str):
+        """The model adapter of the attribute the widgets bind to"""
+        attribute = self.__attributes[name]
+        if attribute.model is None:
+            if attribute.options:
+                attribute.model = AttributeComboModel(self, name, attribute.options)
+            elif attribute.size > 1:
+                attribute.model = AttributeItemModel(self, name, attribute.size)
+            else:
+                attribute.model = AttributeValueModel(self, name)
+        return attribute.model
+
+    def get(self, name: str) -> Any:
+        """The value of the attribute, the tuple for the vector attribute"""
+        attribute = self.__attributes[name]
+        values = self.__columns[attribute.dtype].values[attribute.offset : attribute.offset + attribute.size]
+        if attribute.size == 1:
+            return values[0].item()
+        return tuple(values.tolist())
+
+    def get_component(self, name: str, component: int) -> Any:
+        attribute = self.__attributes[name]
+        return self.__columns[attribute.dtype].values[attribute.offset + component]
+
+    def get_default(self, name: str) -> Any:
+        attribute = self.__attributes[name]
+        defaults = self.__columns[attribute.dtype].defaults[attribute.offset : attribute.offset + attribute.size]
+        if attribute.size == 1:
+            return defaults[0].item()
+        return tuple(defaults.tolist())
+
+    def set(self, name: str, value):
+        """Set the value of the attribute"""
+        self.update({name: value})
+
+    def set_component(self, name: str, component: int, value):
+        attribute = self.__attributes[name]
+        column = self.__columns[attribute.dtype]
+        slot = attribute.offset + component
+        value = column.values.dtype.type(value)
+        if column.values[slot] != value:
+            column.values[slot] = value
+            self.__notify([attribute])
+
+    def update(self, values: Mapping[str, Any]):
+        """Set the values of many attributes at once, e.g. the preset"""
+        slots = {dtype: [] for dtype in _DTYPES}
+        new_values = {dtype: [] for dtype in _DTYPES}
+        for name, value in values.items():
+            attribute = self.__attributes[name]
+            slots[attribute.dtype].extend(range(attribute.offset, attribute.offset + attribute.size))
+            new_values[attribute.dtype].extend(np.atleast_1d(value).tolist())
+
+        changed = []
+        for dtype, column in self.__columns.items():
+            if slots[dtype]:
+                changed.extend(self.__write(column, np.asarray(slots[dtype]), new_values[dtype]))
+        self.__notify(changed)
+
+    def get_array(self, dtype: str = FLOAT) -> np.ndarray:
+        """The read-only view of all the values of the dtype"""
+        column = self.__columns[dtype]
+        view = column.values[: column.size]
+        view.flags.writeable = False
+        return view
+
+    def set_array(self, dtype: str, values: np.ndarray):
+        """Set all the values of the dtype, e.g. from `get_array` of another store"""
+        column = self.__columns[dtype]
+        self.__notify(self.__write(column, slice(0, column.size), values))
+
+    def export(self) -> Dict[str, np.ndarray]:
+        """The copy of all the values per dtype, e.g. to save the preset"""
+        return {dtype: column.values[: column.size].copy() for dtype, column in self.__columns.items()}
+
+    def load(self, arrays: Mapping[str, np.ndarray]):
+        """Set the values saved with `export`"""
+        changed = []
+        for dtype, values in arrays.items():
+            column = self.__columns[dtype]
+            changed.extend(self.__write(column, slice(0, column.size), values))
+        self.__notify(changed)
+
+    def changed(self) -> List[str]:
+        """The names of the attributes that differ from their defaults"""
+        owners = []
+        for column in self.__columns.values():
+            size = column.size
+            differs = np.nonzero(column.values[:size] != column.defaults[:size])[0]
+            owners.append(column.owners[differs])
+        return [self.__by_index[i].name for i in np.unique(np.concatenate(owners))]
+
+    def reset(self, names: Optional[Sequence[str]] = None):
+        """Set the attributes, or all of them, to their defaults"""
+        if names is not None:
+            self.update({name: self.get_default(name) for name in names})
+            return
+
+        changed = []
+        for column in self.__columns.values():
+            changed.extend(self.__write(column, slice(0, column.size), column.defaults[: column.size]))
+        self.__notify(changed)
+
+    def __write(self, column: _Column, slots, values) -> List[_Attribute]:
+        """Write the values to the slots, returns the attributes that are changed"""
+        values = np.asarray(values, dtype=column.values.dtype)
+        changed_slots = np.nonzero(column.values[slots] != values)[0]
+        if not len(changed_slots):
+            return []
+        column.values[slots] = values
+        if isinstance(slots, slice):
+            owners = column.owners[changed_slots + slots.start]
+        else:
+            owners = column.owners[slots[changed_slots]]
+        return [self.__by_index[i] for i in np.unique(owners)]
+
+    def __notify(self, attributes: List[_Attribute]):
+        """Notify the models of the changed attributes"""
+        for attribute in attributes:
+            if attribute.model is not None:
+                attribute.model._notify()
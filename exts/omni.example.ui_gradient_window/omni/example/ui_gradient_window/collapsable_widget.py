@@ -6,8 +6,9 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 #
-__all__ = ["CustomCollsableFrame"]
+__all__ = ["CustomCollsableFrame", "LazyFrameBody"]
 
+from typing import Callable, Optional
 import omni.ui as ui
 
 
@@ -23,10 +24,73 @@ def build_collapsable_header(collapsed, title):
             image_name = "collapsable_closed"
         ui.Image(name=image_name, fill_policy=ui.FillPolicy.PRESERVE_ASPECT_FIT, width=16, height=16)
 
+class LazyFrameBody:
+    """
+    The body of CollapsableFrame that is built only when the frame is expanded
+    for the first time. The built body is kept when the frame is collapsed
+    again. If the frame is expanded or `lazy` is False, it's built immediately.
+
+    It owns the collapsed changed callback of the frame, the callback of the
+    caller is passed as `collapsed_changed_fn` or set with
+    `set_collapsed_changed_fn` and is called after the body is built.
+    """
+
+    def __init__(
+        self,
+        collapsable_frame: ui.CollapsableFrame,
+        build_fn: Callable[[], None],
+        lazy=True,
+        collapsed_changed_fn: Optional[Callable[[bool], None]] = None,
+    ):
+        self.__frame = collapsable_frame
+        self.__build_fn = build_fn
+        self.__built = False
+        self.__collapsed_changed_fn = collapsed_changed_fn
+
+        collapsable_frame.set_collapsed_changed_fn(self.__on_collapsed_changed)
+        if not lazy or not collapsable_frame.collapsed:
+            self.build()
+
+    @property
+    def frame(self) -> ui.CollapsableFrame:
+        """The frame the body is built in"""
+        return self.__frame
+
+    @property
+    def built(self) -> bool:
+        """True when the body is already built"""
+        return self.__built
+
+    def set_collapsed_changed_fn(self, fn: Optional[Callable[[bool], None]]):
+        """The callback of the frame, it's called after the body is built"""
+        self.__collapsed_changed_fn = fn
+
+    def build(self):
+        """Build the body now if it's not built yet"""
+        if self.__built:
+            return
+        self.__built = True
+        with self.__frame:
+            self.__build_fn()
+
+    def __on_collapsed_changed(self, collapsed):
+        if not collapsed:
+            self.build()
+        if self.__collapsed_changed_fn:
+            self.__collapsed_changed_fn(collapsed)
+
+
 class CustomCollsableFrame:
     """The compound widget for color input"""
 
-    def __init__(self, frame_name, collapsed=False):
+    def __init__(
+        self,
+        frame_name,
+        collapsed=False,
+        build_fn: Optional[Callable[[], None]] = None,
+        lazy=True,
+        collapsed_changed_fn: Optional[Callable[[bool], None]] = None,
+    ):
         with ui.ZStack():
             self.collapsable_frame = ui.CollapsableFrame(
                 frame_name, name="group", build_header_fn=build_collapsable_header, collapsed=collapsed)
@@ -37,5 +101,9 @@ class CustomCollsableFrame:
                     ui.Image(name="separator", fill_policy=ui.FillPolicy.STRETCH, height=15)
                     ui.Spacer(width=20)
 
-
-        
+        # The body can be provided with build_fn, then it's built on the first expand
+        self.body = None
+        if build_fn:
+            self.body = LazyFrameBody(self.collapsable_frame, build_fn, lazy, collapsed_changed_fn)
+        elif collapsed_changed_fn:
+            self.collapsable_frame.set_collapsed_changed_fn(collapsed_changed_fn)
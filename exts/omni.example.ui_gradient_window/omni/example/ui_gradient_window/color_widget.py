@@ -12,7 +12,7 @@ from ctypes import Union
 from typing import List, Optional
 import omni.ui as ui
 
-from .style import build_gradient_image, cl_attribute_red, cl_attribute_green, cl_attribute_blue, cl_attribute_dark
+from .style import build_gradient_image, release_gradient_provider, cl_attribute_red, cl_attribute_green, cl_attribute_blue, cl_attribute_dark
 SPACING = 16
 
 
@@ -28,11 +28,22 @@ class ColorWidget:
 
         self.__draw_colorpicker = kwargs.pop("draw_colorpicker", True)
 
+        # The gradients are shared with other widgets, we release them on destroy
+        self.color_button_gradient_R: Optional[ui.ByteImageProvider] = None
+        self.color_button_gradient_G: Optional[ui.ByteImageProvider] = None
+        self.color_button_gradient_B: Optional[ui.ByteImageProvider] = None
+
         self.__frame = ui.Frame()
         with self.__frame:
             self._build_fn()
 
     def destroy(self):
+        for provider in (self.color_button_gradient_R, self.color_button_gradient_G, self.color_button_gradient_B):
+            if provider:
+                release_gradient_provider(provider)
+        self.color_button_gradient_R = None
+        self.color_button_gradient_G = None
+        self.color_button_gradient_B = None
         self.__model = None
         self.__multifield = None
         self.__colorpicker = None
@@ -75,42 +86,40 @@ class ColorWidget:
             rect_default.visible = True
 
         with ui.HStack(spacing=SPACING):
-            # The construction of multi field depends on what the user provided,
-            # defaults or a model
-            if self.__model:
-                # the user provided a model
-                self.__multifield = ui.MultiFloatDragField(
-                    min=0, max=1, model=self.__model, h_spacing=SPACING, name="attribute_color"
-                )
-                model = self.__model
-            else:
-                # the user provided a list of default values
-                with ui.ZStack():
-                    with ui.HStack():
-                        self.color_button_gradient_R = build_gradient_image([cl_attribute_dark, cl_attribute_red], 22, "button_background_gradient")
-                        ui.Spacer(width=9)
-                        with ui.VStack(width=6):
-                            ui.Spacer(height=8)
-                            ui.Circle(name="group_circle", width=4, height=4)
-                        self.color_button_gradient_G = build_gradient_image([cl_attribute_dark, cl_attribute_green], 22, "button_background_gradient")
-                        ui.Spacer(width=9)
-                        with ui.VStack(width=6):
-                            ui.Spacer(height=8)
-                            ui.Circle(name="group_circle", width=4, height=4)
-                        self.color_button_gradient_B = build_gradient_image([cl_attribute_dark, cl_attribute_blue], 22, "button_background_gradient")
-                        ui.Spacer(width=2)
-                    with ui.HStack():
-                        with ui.VStack():
-                            ui.Spacer(height=1)
+            with ui.ZStack():
+                with ui.HStack():
+                    self.color_button_gradient_R = build_gradient_image([cl_attribute_dark, cl_attribute_red], 22, "button_background_gradient")
+                    ui.Spacer(width=9)
+                    with ui.VStack(width=6):
+                        ui.Spacer(height=8)
+                        ui.Circle(name="group_circle", width=4, height=4)
+                    self.color_button_gradient_G = build_gradient_image([cl_attribute_dark, cl_attribute_green], 22, "button_background_gradient")
+                    ui.Spacer(width=9)
+                    with ui.VStack(width=6):
+                        ui.Spacer(height=8)
+                        ui.Circle(name="group_circle", width=4, height=4)
+                    self.color_button_gradient_B = build_gradient_image([cl_attribute_dark, cl_attribute_blue], 22, "button_background_gradient")
+                    ui.Spacer(width=2)
+                with ui.HStack():
+                    with ui.VStack():
+                        ui.Spacer(height=1)
+                        # The construction of multi field depends on what the user provided,
+                        # defaults or a model
+                        if self.__model:
+                            # the user provided a model
+                            self.__multifield = ui.MultiFloatDragField(
+                                min=0, max=1, model=self.__model, h_spacing=SPACING, name="attribute_color")
+                        else:
+                            # the user provided a list of default values
                             self.__multifield = ui.MultiFloatDragField(
                                 *self.__defaults, min=0, max=1, h_spacing=SPACING, name="attribute_color")
-                        ui.Spacer(width=3)
-                    with ui.HStack(spacing=22):
-                        labels = ["R", "G", "B"] if self.__draw_colorpicker else ["X", "Y", "Z"]
-                        ui.Label(labels[0], name="attribute_r")
-                        ui.Label(labels[1], name="attribute_g")
-                        ui.Label(labels[2], name="attribute_b")
-                model = self.__multifield.model
+                    ui.Spacer(width=3)
+                with ui.HStack(spacing=22):
+                    labels = ["R", "G", "B"] if self.__draw_colorpicker else ["X", "Y", "Z"]
+                    ui.Label(labels[0], name="attribute_r")
+                    ui.Label(labels[1], name="attribute_g")
+                    ui.Label(labels[2], name="attribute_b")
+            model = self.__multifield.model
             if self.__draw_colorpicker:
                 self.__colorpicker = ui.ColorWidget(model, width=0)
             rect_changed, rect_default = self.__build_value_changed_widget()
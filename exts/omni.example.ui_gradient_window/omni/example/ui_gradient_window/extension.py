@@ -11,10 +11,22 @@ __all__ = ["ExampleWindowExtension"]
 from .window import PropertyWindowExample
 from functools import partial
 import asyncio
+import time
+import carb.settings
 import omni.ext
 import omni.kit.ui
 import omni.ui as ui
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# How often the memory of the process is checked while the window is kept warm, in seconds
+MEMORY_CHECK_INTERVAL = 10.0
+
+SETTINGS_PATH = "/exts/omni.example.ui_gradient_window"
+
 
 class ExampleWindowExtension(omni.ext.IExt):
     """The entry point for Gradient Style Window Example"""
@@ -23,6 +35,12 @@ class ExampleWindowExtension(omni.ext.IExt):
     MENU_PATH = f"Window/{WINDOW_NAME}"
 
     def on_startup(self):
+        self._window = None
+        # The task that destroys the hidden window in keep-warm mode
+        self._expire_task = None
+        # The missing psutil is reported once
+        self._memory_cap_warned = False
+
         # The ability to show up the window if the system requires it. We use it
         # in QuickLayout.
         ui.Workspace.set_show_window_fn(ExampleWindowExtension.WINDOW_NAME, partial(self.show_window, None))
@@ -39,6 +57,7 @@ class ExampleWindowExtension(omni.ext.IExt):
 
     def on_shutdown(self):
         self._menu = None
+        self._cancel_expiration()
         if self._window:
             self._window.destroy()
             self._window = None
@@ -52,24 +71,95 @@ class ExampleWindowExtension(omni.ext.IExt):
         if editor_menu:
             editor_menu.set_value(ExampleWindowExtension.MENU_PATH, value)
 
-    async def _destroy_window_async(self):
+    async def _destroy_window_async(self, window):
         # wait one frame, this is due to the one frame defer
         # in Window::_moveToMainOSWindow()
         await omni.kit.app.get_app().next_update_async()
-        if self._window:
-            self._window.destroy()
-            self._window = None
+        window.destroy()
+
+    def _release_window(self):
+        """Forget the window and destroy it on the next frame"""
+        window, self._window = self._window, None
+        self._cancel_expiration()
+        if window:
+            asyncio.ensure_future(self._destroy_window_async(window))
+
+    def _memory_cap(self) -> float:
+        """The keep-warm memory cap in megabytes, 0 if it's not set or can't be checked"""
+        memory_cap = carb.settings.get_settings().get(f"{SETTINGS_PATH}/keep_warm_memory_cap") or 0
+        if memory_cap > 0 and not psutil:
+            if not self._memory_cap_warned:
+                self._memory_cap_warned = True
+                carb.log_warn(
+                    f"{SETTINGS_PATH}/keep_warm_memory_cap is set, but psutil is not available. "
+                    "The memory of the hidden window is not limited."
+                )
+            return 0
+        return memory_cap
+
+    def _over_memory_cap(self) -> bool:
+        """True if the process uses more memory than the keep-warm memory cap"""
+        memory_cap = self._memory_cap()
+        # Megabytes used by the whole process
+        return memory_cap > 0 and psutil.Process().memory_info().rss / (1024 * 1024) > memory_cap
+
+    def _keep_warm(self) -> bool:
+        """True if the hidden window can be kept for reopening"""
+        if not carb.settings.get_settings().get(f"{SETTINGS_PATH}/keep_warm"):
+            return False
+        return not self._over_memory_cap()
+
+    async def _expire_window_async(self, timeout):
+        """
+        Destroy the hidden window when the timeout is over, or earlier if the
+        process goes over the memory cap while the window is hidden
+        """
+        deadline = time.monotonic() + timeout if timeout > 0 else None
+        while True:
+            delay = MEMORY_CHECK_INTERVAL if self._memory_cap() > 0 else None
+            if deadline is not None:
+                remaining = max(deadline - time.monotonic(), 0.0)
+                delay = remaining if delay is None else min(delay, remaining)
+            if delay is None:
+                # No timeout and no cap, the window is kept until it's shown
+                self._expire_task = None
+                return
+            await asyncio.sleep(delay)
+            if (deadline is not None and time.monotonic() >= deadline) or self._over_memory_cap():
+                break
+
+        self._expire_task = None
+        if self._window and not self._window.visible:
+            self._release_window()
+
+    def _cancel_expiration(self):
+        if self._expire_task:
+            self._expire_task.cancel()
+            self._expire_task = None
 
     def _visiblity_changed_fn(self, visible):
         # Called when the user pressed "X"
         self._set_menu(visible)
-        if not visible:
+        if visible:
+            self._cancel_expiration()
+        elif self._keep_warm():
+            # Keep the hidden window with all its state, so it's shown
+            # instantly. It's destroyed if it's not reopened in time.
+            self._cancel_expiration()
+            timeout = carb.settings.get_settings().get(f"{SETTINGS_PATH}/keep_warm_timeout") or 0
+            self._expire_task = asyncio.ensure_future(self._expire_window_async(timeout))
+        else:
             # Destroy the window, since we are creating new window
             # in show_window
-            asyncio.ensure_future(self._destroy_window_async())
+            self._release_window()
 
     def show_window(self, menu, value):
         if value:
+            if self._window:
+                # The window is kept warm
+                self._cancel_expiration()
+                self._window.visible = True
+                return
             self._window = PropertyWindowExample(ExampleWindowExtension.WINDOW_NAME, width=450, height=900)
             self._window.set_visibility_changed_fn(self._visiblity_changed_fn)
         elif self._window:
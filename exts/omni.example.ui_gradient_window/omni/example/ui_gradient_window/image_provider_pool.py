@@ -0,0 +1,69 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["ByteImageProviderPool"]
+
+from typing import Callable, Dict, Hashable
+import omni.ui as ui
+
+
+class ByteImageProviderPool:
+    """
+    The pool of ByteImageProviders shared between the widgets that show the
+    same image. The providers are keyed by the content of the image and
+    reference counted. The provider is freed when the last user releases it.
+    """
+
+    def __init__(self):
+        self.__providers: Dict[Hashable, ui.ByteImageProvider] = {}
+        self.__refcounts: Dict[Hashable, int] = {}
+        # id of provider -> key, to release by provider
+        self.__keys: Dict[int, Hashable] = {}
+
+    def __len__(self):
+        return len(self.__providers)
+
+    def __contains__(self, key: Hashable):
+        return key in self.__providers
+
+    def acquire(self, key: Hashable, create_fn: Callable[[], ui.ByteImageProvider]) -> ui.ByteImageProvider:
+        """
+        Return the provider for the given key and increment its reference
+        count. `create_fn` is called only when there is no such provider yet.
+        """
+        provider = self.__providers.get(key)
+        if provider is None:
+            provider = create_fn()
+            self.__providers[key] = provider
+            self.__refcounts[key] = 0
+            self.__keys[id(provider)] = key
+
+        self.__refcounts[key] += 1
+        return provider
+
+    def release(self, provider: ui.ByteImageProvider):
+        """Decrement the reference count of the provider and free it if it's not used anymore"""
+        key = self.__keys.get(id(provider))
+        if key is None:
+            return
+
+        self.__refcounts[key] -= 1
+        if self.__refcounts[key] <= 0:
+            del self.__keys[id(provider)]
+            del self.__refcounts[key]
+            del self.__providers[key]
+
+    def refcount(self, key: Hashable) -> int:
+        """The number of users of the provider"""
+        return self.__refcounts.get(key, 0)
+
+    def clear(self):
+        """Forget all the providers"""
+        self.__providers.clear()
+        self.__refcounts.clear()
+        self.__keys.clear()
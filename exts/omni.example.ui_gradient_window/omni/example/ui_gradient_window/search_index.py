@@ -0,0 +1,159 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["AttributeSearchIndex"]
+
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Hashable, List, Set, Tuple
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class AttributeSearchIndex:
+    """
+    The index over the labels of the attributes and the names of their
+    sections. Every word of the query should be found in the label or in the
+    section. Short words match the beginning of the words, and the words of 3
+    and more letters match anywhere, they are looked up with the trigram index.
+
+    When the query extends the previous one, which is the usual case when the
+    user is typing, only the previous result is narrowed down.
+    """
+
+    def __init__(self):
+        self.__texts: Dict[Hashable, str] = {}
+        # Sorted (word, order), for the prefix search
+        self.__words: List[Tuple[str, int]] = []
+        self.__words_sorted = True
+        # Trigram -> keys
+        self.__trigrams: Dict[str, Set[Hashable]] = defaultdict(set)
+        # Keys are not always comparable, so the words refer to the order of addition
+        self.__keys: Dict[int, Hashable] = {}
+        self.__orders: Dict[Hashable, int] = {}
+        self.__next_order = 0
+        self.__last_query = None
+        self.__last_result: Set[Hashable] = set()
+
+    def __len__(self):
+        return len(self.__texts)
+
+    def add(self, key: Hashable, label: str, section: str = ""):
+        """Add the attribute to the index, it replaces the attribute with the same key"""
+        self.remove(key)
+        text = " ".join(f"{label} {section}".lower().split())
+        self.__texts[key] = text
+        order = self.__next_order
+        self.__next_order += 1
+        self.__keys[order] = key
+        self.__orders[key] = order
+        for word in set(text.split()):
+            self.__words.append((word, order))
+        self.__words_sorted = False
+        for trigram in _trigrams(text):
+            self.__trigrams[trigram].add(key)
+        self.__last_query = None
+
+    def remove(self, key: Hashable):
+        """Remove the attribute from the index"""
+        text = self.__texts.pop(key, None)
+        if text is None:
+            return
+        order = self.__orders.pop(key)
+        del self.__keys[order]
+        self.__sort_words()
+        for word in set(text.split()):
+            del self.__words[bisect_left(self.__words, (word, order))]
+        for trigram in _trigrams(text):
+            keys = self.__trigrams.get(trigram)
+            if keys:
+                keys.discard(key)
+        self.__last_query = None
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__texts
+
+    def clear(self):
+        """Remove everything from the index"""
+        self.__texts.clear()
+        self.__words.clear()
+        self.__trigrams.clear()
+        self.__keys.clear()
+        self.__orders.clear()
+        self.__last_query = None
+        self.__last_result = set()
+
+    def query(self, text: str) -> Set[Hashable]:
+        """Return the keys of the attributes that match all the words of the text"""
+        terms = text.lower().split()
+        if not terms:
+            return set(self.__texts)
+
+        query = " ".join(terms)
+        if self.__can_narrow(query, terms):
+            # Narrowing: the new query can only match a subset of the previous result
+            result = {key for key in self.__last_result if self.__matches(self.__texts[key], terms)}
+        else:
+            result = None
+            for term in terms:
+                found = self.__find(term)
+                result = found if result is None else result & found
+                if not result:
+                    break
+
+        self.__last_query = query
+        self.__last_result = result
+        return set(result)
+
+    def __can_narrow(self, query: str, terms: List[str]) -> bool:
+        if self.__last_query is None or not query.startswith(self.__last_query):
+            return False
+        # A short word matches the beginning of words only. When it becomes
+        # longer, it matches anywhere, and the result can grow.
+        previous = self.__last_query.split()
+        return all(old == new or len(old) >= 3 or len(new) < 3 for old, new in zip(previous, terms))
+
+    def __find(self, term: str) -> Set[Hashable]:
+        if len(term) < 3:
+            return self.__find_prefix(term)
+
+        trigrams = iter(_trigrams(term))
+        candidates = set(self.__trigrams.get(next(trigrams), ()))
+        for trigram in trigrams:
+            if not candidates:
+                break
+            candidates &= self.__trigrams.get(trigram, set())
+        # Trigrams can be in the different places of the text, verify
+        return {key for key in candidates if term in self.__texts[key]}
+
+    def __find_prefix(self, term: str) -> Set[Hashable]:
+        self.__sort_words()
+        result = set()
+        index = bisect_left(self.__words, (term, -1))
+        while index < len(self.__words) and self.__words[index][0].startswith(term):
+            result.add(self.__keys[self.__words[index][1]])
+            index += 1
+        return result
+
+    def __sort_words(self):
+        """Sort the words added since the last search, they are appended unsorted"""
+        if not self.__words_sorted:
+            self.__words.sort()
+            self.__words_sorted = True
+
+    @staticmethod
+    def __matches(text: str, terms: List[str]) -> bool:
+        for term in terms:
+            if len(term) < 3:
+                if not any(word.startswith(term) for word in text.split()):
+                    return False
+            elif term not in text:
+                return False
+        return True
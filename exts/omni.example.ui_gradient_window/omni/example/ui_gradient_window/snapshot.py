@@ -0,0 +1,285 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = [
+    "FLOAT", "INT", "BOOL", "STRING", "VECTOR", "COMBO",
+    "CallbackGate", "ModelRegistry", "encode_values", "decode_values",
+]
+
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import struct
+
+import omni.ui as ui
+
+# The kinds of the values. The kind is stored with the value, so the snapshot
+# can be read without the models.
+FLOAT = 0
+INT = 1
+BOOL = 2
+STRING = 3
+# The float components of the item model, like MultiFloatDragField and ColorWidget
+VECTOR = 4
+# The current index of the ComboBox model
+COMBO = 5
+
+MAGIC = b"UISN"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHI")
+_ENTRY = struct.Struct("<BH")
+_FLOAT = struct.Struct("<d")
+_INT = struct.Struct("<q")
+_BOOL = struct.Struct("<?")
+_LENGTH = struct.Struct("<I")
+_COUNT = struct.Struct("<B")
+_INDEX = struct.Struct("<i")
+
+
+def encode_values(values: List[Tuple[str, int, Any]]) -> bytes:
+    """Pack the list of (key, kind, value) to the versioned binary form"""
+    data = bytearray(_HEADER.pack(MAGIC, VERSION, len(values)))
+    for key, kind, value in values:
+        key_bytes = key.encode("utf-8")
+        data += _ENTRY.pack(kind, len(key_bytes))
+        data += key_bytes
+        if kind == FLOAT:
+            data += _FLOAT.pack(value)
+        elif kind == INT:
+            data += _INT.pack(value)
+        elif kind == BOOL:
+            data += _BOOL.pack(value)
+        elif kind == STRING:
+            string_bytes = value.encode("utf-8")
+            data += _LENGTH.pack(len(string_bytes))
+            data += string_bytes
+        elif kind == VECTOR:
+            data += _COUNT.pack(len(value))
+            data += struct.pack(f"<{len(value)}d", *value)
+        elif kind == COMBO:
+            data += _INDEX.pack(value)
+        else:
+            raise ValueError(f"Unknown kind {kind} of '{key}'")
+    return bytes(data)
+
+
+def decode_values(data: bytes) -> List[Tuple[str, int, Any]]:
+    """Unpack the list of (key, kind, value) from the binary form"""
+    view = memoryview(data)
+    try:
+        magic, version, count = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("The data is not a snapshot")
+        if version > VERSION:
+            raise ValueError(f"The snapshot version {version} is newer than {VERSION}")
+
+        offset = _HEADER.size
+        values = []
+        for _ in range(count):
+            kind, key_length = _ENTRY.unpack_from(view, offset)
+            offset += _ENTRY.size
+            key = bytes(view[offset : offset + key_length]).decode("utf-8")
+            offset += key_length
+            if kind == FLOAT:
+                (value,) = _FLOAT.unpack_from(view, offset)
+                offset += _FLOAT.size
+            elif kind == INT:
+                (value,) = _INT.unpack_from(view, offset)
+                offset += _INT.size
+            elif kind == BOOL:
+                (value,) = _BOOL.unpack_from(view, offset)
+                offset += _BOOL.size
+            elif kind == STRING:
+                (length,) = _LENGTH.unpack_from(view, offset)
+                offset += _LENGTH.size
+                value = bytes(view[offset : offset + length]).decode("utf-8")
+                offset += length
+            elif kind == VECTOR:
+                (length,) = _COUNT.unpack_from(view, offset)
+                offset += _COUNT.size
+                value = struct.unpack_from(f"<{length}d", view, offset)
+                offset += 8 * length
+            elif kind == COMBO:
+                (value,) = _INDEX.unpack_from(view, offset)
+                offset += _INDEX.size
+            else:
+                raise ValueError(f"Unknown kind {kind} of '{key}'")
+            values.append((key, kind, value))
+    except struct.error as e:
+        raise ValueError(f"The snapshot is truncated: {e}")
+    return values
+
+
+def _get_kind(model) -> int:
+    """The kind of the model when it's not given explicitly"""
+    if isinstance(model, ui.SimpleBoolModel):
+        return BOOL
+    if isinstance(model, ui.SimpleIntModel):
+        return INT
+    if isinstance(model, ui.SimpleStringModel):
+        return STRING
+    if isinstance(model, ui.AbstractItemModel):
+        return VECTOR
+    return FLOAT
+
+
+def _get_value(kind: int, model) -> Any:
+    if kind == FLOAT:
+        return model.get_value_as_float()
+    if kind == INT:
+        return model.get_value_as_int()
+    if kind == BOOL:
+        return model.get_value_as_bool()
+    if kind == STRING:
+        return model.get_value_as_string()
+    if kind == VECTOR:
+        return tuple(
+            model.get_item_value_model(item).get_value_as_float() for item in model.get_item_children()
+        )
+    return model.get_item_value_model().get_value_as_int()
+
+
+def _set_value(kind: int, model, value):
+    """Set the value to the model. The models that already have it are not touched, so they don't notify."""
+    if kind == VECTOR:
+        for item, component in zip(model.get_item_children(), value):
+            component_model = model.get_item_value_model(item)
+            if component_model.get_value_as_float() != component:
+                component_model.set_value(component)
+    elif kind == COMBO:
+        index_model = model.get_item_value_model()
+        if index_model.get_value_as_int() != value:
+            index_model.set_value(value)
+    elif _get_value(kind, model) != value:
+        model.set_value(value)
+
+
+class CallbackGate:
+    """
+    Holds the calls of the wrapped callbacks while it's held. When the last
+    hold ends, each callback is called once with its latest arguments.
+    """
+
+    def __init__(self):
+        self.__holds = 0
+        self.__pending: Dict[Callable, Tuple] = {}
+
+    @property
+    def held(self) -> bool:
+        """True if the calls are held"""
+        return self.__holds > 0
+
+    def wrap(self, fn: Callable) -> Callable:
+        """The callback that is held by this gate"""
+
+        def gated_fn(*args):
+            if self.__holds:
+                self.__pending[fn] = args
+            else:
+                fn(*args)
+
+        return gated_fn
+
+    @contextmanager
+    def hold(self):
+        """Hold the callbacks in this context"""
+        self.__holds += 1
+        try:
+            yield
+        finally:
+            self.__holds -= 1
+            if not self.__holds:
+                self.flush()
+
+    def flush(self):
+        """Call the held callbacks"""
+        while self.__pending:
+            pending, self.__pending = self.__pending, {}
+            for fn, args in pending.items():
+                fn(*args)
+
+
+class ModelRegistry:
+    """
+    The models of the window by key. The values of all the models are saved
+    to the compact binary snapshot and restored from it in one pass.
+    """
+
+    def __init__(self):
+        self.__models: Dict[str, Tuple[int, Any]] = {}
+        # The restored values of the models that are not registered yet, like
+        # the ones in the collapsed lazy sections. They are set on register.
+        self.__pending: Dict[str, Tuple[int, Any]] = {}
+        self.__gate = CallbackGate()
+
+    def destroy(self):
+        self.__models = {}
+        self.__pending = {}
+
+    def __len__(self):
+        return len(self.__models)
+
+    def __contains__(self, key: str):
+        return key in self.__models
+
+    @property
+    def gate(self) -> CallbackGate:
+        """The callbacks wrapped with this gate are held while the snapshot is restored"""
+        return self.__gate
+
+    def keys(self) -> List[str]:
+        """The keys of the registered models"""
+        return list(self.__models.keys())
+
+    def get_model(self, key: str):
+        """The model registered with the key"""
+        entry = self.__models.get(key, None)
+        return entry[1] if entry else None
+
+    def register(self, key: str, model, kind: Optional[int] = None):
+        """Add the model. The kind is detected from the model type when it's not given."""
+        if kind is None:
+            kind = _get_kind(model)
+        self.__models[key] = (kind, model)
+
+        pending = self.__pending.pop(key, None)
+        if pending and pending[0] == kind:
+            _set_value(kind, model, pending[1])
+
+    def unregister(self, key: str):
+        """Remove the model"""
+        self.__models.pop(key, None)
+
+    def clear(self):
+        """Remove all the models, e.g. when the window is rebuilt"""
+        self.__models = {}
+
+    def snapshot(self) -> bytes:
+        """Save the values of all the models"""
+        values = [(key, kind, _get_value(kind, model)) for key, (kind, model) in self.__models.items()]
+        # The values that are restored but not shown yet are kept
+        values += [(key, kind, value) for key, (kind, value) in self.__pending.items() if key not in self.__models]
+        return encode_values(values)
+
+    def restore(self, data: bytes) -> int:
+        """
+        Set the values saved with `snapshot`. The gated callbacks are called
+        once, when all the values are set. Returns the number of models set.
+        """
+        values = decode_values(data)
+        self.__pending = {}
+        restored = 0
+        with self.__gate.hold():
+            for key, kind, value in values:
+                entry = self.__models.get(key, None)
+                if entry is None:
+                    self.__pending[key] = (kind, value)
+                elif entry[0] == kind:
+                    _set_value(kind, entry[1], value)
+                    restored += 1
+        return restored
@@ -11,10 +11,14 @@ __all__ = ["main_window_style"]
 from omni.ui import color as cl
 from omni.ui import constant as fl
 from omni.ui import url
+import functools
+import numpy as np
 import omni.kit.app
 import omni.ui as ui
 import pathlib
 
+from .image_provider_pool import ByteImageProviderPool
+
 EXTENSION_FOLDER_PATH = pathlib.Path(
     omni.kit.app.get_app().get_extension_manager().get_extension_path_by_module(__name__)
 )
@@ -96,6 +100,11 @@ main_window_style = {
     },
     "Label::attribute_name:hovered": {"color": cl_text_hovered},
 
+    "Label::search": {
+        "alignment": ui.Alignment.LEFT_CENTER,
+        "color": cl_field_text
+    },
+
     "Label::header_attribute_name": {
         "alignment": ui.Alignment.LEFT_CENTER,
         "color": cl_text
@@ -196,16 +205,113 @@ def get_gradient_color(value, max, colors):
         color = _interpolate_color(colors[idx], colors[idx+1], percentage)
     return color
 
-def generate_byte_data(colors):
-    data = []
-    for color in colors:
-        data += hex_to_color(color)
+# How many different gradient strips to keep. Each entry is a few KB at most.
+GRADIENT_CACHE_SIZE = 256
+# The bit offsets of red, green, blue and alpha in the packed color
+_CHANNEL_SHIFTS = np.array([0, 8, 16, 24], dtype=np.uint32)
+
+
+def interpolate_gradient(colors, width: int) -> np.ndarray:
+    """
+    Compute a strip of `width` RGBA pixels linearly interpolated between the
+    color stops. The stops are evenly distributed, the first and the last
+    stops are placed exactly at the ends of the strip.
+    """
+    packed = np.asarray(colors, dtype=np.uint32)
+    stops = ((packed[:, None] >> _CHANNEL_SHIFTS) & 255).astype(np.float32)
+    if len(stops) == 1 or width == 1:
+        return np.repeat(stops[:1], width, axis=0).astype(np.uint8)
+
+    positions = np.linspace(0.0, 1.0, len(stops))
+    samples = np.linspace(0.0, 1.0, width)
+    rgba = np.stack([np.interp(samples, positions, stops[:, c]) for c in range(4)], axis=-1)
+    return np.rint(rgba).astype(np.uint8)
+
+
+@functools.lru_cache(maxsize=GRADIENT_CACHE_SIZE)
+def _gradient_bytes(colors: tuple, width: int, height: int) -> tuple:
+    strip = interpolate_gradient(colors, width)
+    # Tuple, so the cached buffer can't be modified by the caller
+    return tuple(np.tile(strip, (height, 1)).ravel().tolist())
+
+
+def generate_gradient_bytes(colors, width: int = None, height: int = 1):
+    """
+    Return the RGBA bytes and the size of the gradient image that is ready to
+    be passed to `ByteImageProvider.set_bytes_data`. The result is cached by
+    the colors and the size, so the same gradient is computed only once.
+
+    By default the image has one pixel per color stop, and the GPU stretches
+    it. A bigger width gives the precise interpolation on the CPU.
+    """
+    width = width or len(colors)
+    return _gradient_bytes(tuple(colors), width, height), [width, height]
+
+
+# The number of colors in the precomputed gradient lookup table
+GRADIENT_LUT_SIZE = 256
+# The style of the slider handle without the color, that is taken from the gradient
+slider_handle_style = {"border_width": 2, "border_color": cl_combobox_background}
+
+
+class GradientLUT:
+    """
+    The gradient compiled into the fixed number of colors together with the
+    prebuilt styles of the slider handle, so picking the color of the handle
+    is an index lookup without any allocation.
+    """
+
+    def __init__(self, colors, size: int = GRADIENT_LUT_SIZE):
+        strip = interpolate_gradient(colors, size).astype(np.uint32)
+        self.size = size
+        self.colors = np.bitwise_or.reduce(strip << _CHANNEL_SHIFTS, axis=1).tolist()
+        self.styles = [dict(slider_handle_style, background_color=color) for color in self.colors]
+
+    def index(self, value: float, max: float) -> int:
+        """The index of the color that corresponds to value in the range [0, max]"""
+        if max <= 0:
+            return 0
+        index = int(value / max * (self.size - 1) + 0.5)
+        return 0 if index < 0 else min(index, self.size - 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_gradient_lut(colors: tuple) -> GradientLUT:
+    return GradientLUT(colors)
+
+
+def get_gradient_lut(colors) -> GradientLUT:
+    """Return the lookup table of the gradient. It's compiled once per gradient."""
+    return _get_gradient_lut(tuple(colors))
+
+
+def generate_byte_data(colors, width: int = None, height: int = 1):
+    data, size = generate_gradient_bytes(colors, width, height)
 
     _byte_provider = ui.ByteImageProvider()
-    _byte_provider.set_bytes_data(data, [len(colors), 1])
+    _byte_provider.set_bytes_data(data, size)
     return _byte_provider
 
-def build_gradient_image(colors, height, style_name):
-    byte_provider = generate_byte_data(colors)
+# The gradients shown by several widgets share the same provider
+gradient_provider_pool = ByteImageProviderPool()
+
+
+def acquire_gradient_provider(colors, width: int = None, height: int = 1) -> ui.ByteImageProvider:
+    """
+    Return the shared provider of the gradient. The caller should call
+    `release_gradient_provider` when the widget that uses it is destroyed.
+    """
+    width = width or len(colors)
+    key = (tuple(colors), width, height)
+    return gradient_provider_pool.acquire(key, lambda: generate_byte_data(colors, width, height))
+
+
+def release_gradient_provider(provider: ui.ByteImageProvider):
+    """Release the provider returned by `acquire_gradient_provider` or `build_gradient_image`"""
+    gradient_provider_pool.release(provider)
+
+
+def build_gradient_image(colors, height, style_name, width: int = None):
+    byte_provider = acquire_gradient_provider(colors, width)
     ui.ImageWithProvider(byte_provider,fill_policy=omni.ui.IwpFillPolicy.IWP_STRETCH, height=height, name=style_name)
-    return byte_provider
\ No newline at end of file
+    return byte_provider
@@ -6,4 +6,8 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 #
+from .test_benchmark import TestBenchmark
+from .test_gradient import TestGradient
+from .test_search_index import TestSearchIndex
+from .test_snapshot import TestSnapshot
 from .test_window import TestWindow
\ No newline at end of file
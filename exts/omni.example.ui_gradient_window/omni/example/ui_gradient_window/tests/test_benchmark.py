@@ -0,0 +1,23 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestBenchmark"]
+
+from omni.example.ui_gradient_window import PropertyWindowExample
+from functools import partial
+import omni.kit.test
+
+from .benchmark import run_benchmark
+
+
+class TestBenchmark(omni.kit.test.AsyncTestCase):
+    async def test_benchmark(self):
+        """Measuring the cost of the window and comparing it with the stored baseline"""
+        await run_benchmark(
+            self, {"PropertyWindowExample": partial(PropertyWindowExample, "Benchmark", width=450, height=900)}
+        )
@@ -0,0 +1,59 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestGradient"]
+
+from omni.example.ui_gradient_window.style import acquire_gradient_provider, release_gradient_provider
+from omni.example.ui_gradient_window.style import generate_gradient_bytes, get_gradient_lut, gradient_provider_pool, hex_to_color
+from omni.ui import color as cl
+import omni.kit.test
+
+
+class TestGradient(omni.kit.test.AsyncTestCase):
+    async def test_gradient_bytes(self):
+        """Testing the interpolation and the cache of the gradient pixels"""
+        colors = [cl("#000000"), cl("#ffffff")]
+        data, size = generate_gradient_bytes(colors)
+        self.assertEqual(size, [2, 1])
+        self.assertEqual(list(data), hex_to_color(colors[0]) + hex_to_color(colors[1]))
+
+        data, size = generate_gradient_bytes(colors, width=3, height=2)
+        self.assertEqual(size, [3, 2])
+        self.assertEqual(list(data[4:8]), [128, 128, 128, 255])
+        self.assertEqual(data[:12], data[12:])
+
+        # The same gradient gives the same buffer
+        self.assertIs(generate_gradient_bytes(colors, width=3, height=2)[0], data)
+
+    async def test_gradient_lut(self):
+        """Testing the color lookup of the slider handle"""
+        colors = [cl("#ff0000"), cl("#00ff00"), cl("#0000ff")]
+        lut = get_gradient_lut(colors)
+        self.assertIs(get_gradient_lut(colors), lut)
+
+        self.assertEqual(lut.index(0, 100), 0)
+        self.assertEqual(lut.index(100, 100), lut.size - 1)
+        self.assertEqual(lut.index(150, 100), lut.size - 1)
+        self.assertEqual(lut.index(10, 0), 0)
+
+        self.assertEqual(lut.colors[0], colors[0])
+        self.assertEqual(lut.colors[-1], colors[-1])
+        self.assertEqual(lut.styles[0]["background_color"], colors[0])
+
+    async def test_provider_pool(self):
+        """Testing the shared gradient providers are reference counted"""
+        colors = [cl("#123456"), cl("#654321")]
+        key = (tuple(colors), len(colors), 1)
+        provider = acquire_gradient_provider(colors)
+        self.assertIs(acquire_gradient_provider(colors), provider)
+        self.assertEqual(gradient_provider_pool.refcount(key), 2)
+
+        release_gradient_provider(provider)
+        self.assertIn(key, gradient_provider_pool)
+        release_gradient_provider(provider)
+        self.assertNotIn(key, gradient_provider_pool)
@@ -0,0 +1,83 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestSearchIndex"]
+
+from omni.example.ui_gradient_window.search_index import AttributeSearchIndex
+import omni.kit.test
+
+
+class TestSearchIndex(omni.kit.test.AsyncTestCase):
+    async def test_query(self):
+        """Testing the prefix and the substring search"""
+        index = AttributeSearchIndex()
+        index.add("diffuse", "Diffuse Multiplier", "LIGHT PROPERTIES")
+        index.add("angle", "Cone Angle", "LIGHT PROPERTIES SHAPING")
+        index.add("position", "Position", "TRANSFORMS")
+
+        self.assertEqual(index.query(""), {"diffuse", "angle", "position"})
+        self.assertEqual(index.query("light"), {"diffuse", "angle"})
+        # Short words match the beginning of the words only
+        self.assertEqual(index.query("ul"), set())
+        # Longer words match anywhere
+        self.assertEqual(index.query("ulti"), {"diffuse"})
+        self.assertEqual(index.query("pos tr"), {"position"})
+
+    async def test_narrowing(self):
+        """Testing the result of the typing the query letter by letter"""
+        index = AttributeSearchIndex()
+        index.add("diffuse", "Diffuse Multiplier", "LIGHT PROPERTIES")
+        index.add("angle", "Cone Angle", "LIGHT PROPERTIES SHAPING")
+        index.add("softness", "Cone Softness", "LIGHT PROPERTIES SHAPING")
+
+        expected = {
+            "c": {"angle", "softness"},
+            "co": {"angle", "softness"},
+            "con": {"angle", "softness"},
+            "cone": {"angle", "softness"},
+            "cone ": {"angle", "softness"},
+            "cone s": {"angle", "softness"},
+            "cone so": {"softness"},
+            "cone sof": {"softness"},
+        }
+        for query, keys in expected.items():
+            self.assertEqual(index.query(query), keys, query)
+
+        self.assertEqual(index.query("m"), {"diffuse"})
+        # "m" doesn't match the middle of "Cone Angle", "mul" does
+        self.assertEqual(index.query("mul"), {"diffuse"})
+
+    async def test_remove(self):
+        """Testing the removed and the replaced attributes are not found by their old words"""
+        index = AttributeSearchIndex()
+        index.add("diffuse", "Diffuse Multiplier", "LIGHT PROPERTIES")
+        index.add("angle", "Cone Angle", "LIGHT PROPERTIES SHAPING")
+        self.assertEqual(index.query("co"), {"angle"})
+
+        index.remove("angle")
+        self.assertNotIn("angle", index)
+        self.assertEqual(index.query("co"), set())
+        self.assertEqual(index.query("angle"), set())
+        self.assertEqual(len(index), 1)
+
+        index.add("diffuse", "Exposure", "LIGHT PROPERTIES")
+        self.assertEqual(index.query("di"), set())
+        self.assertEqual(index.query("ex"), {"diffuse"})
+        self.assertEqual(index.query("light"), {"diffuse"})
+
+        # The words are removed before they are searched, and after it
+        for name in ("Focus Tint", "Radius", "Focus"):
+            index.add("focus", name, "LIGHT PROPERTIES SHAPING")
+        index.remove("diffuse")
+        self.assertEqual(index.query("fo"), {"focus"})
+        self.assertEqual(index.query("ti") | index.query("ra"), set())
+        index.remove("focus")
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.query("li"), set())
+        index.add("diffuse", "Diffuse Multiplier", "LIGHT PROPERTIES")
+        self.assertEqual(index.query("li"), {"diffuse"})
@@ -0,0 +1,79 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestSnapshot"]
+
+from omni.example.ui_gradient_window import PropertyWindowExample
+from omni.example.ui_gradient_window.snapshot import (
+    BOOL, COMBO, FLOAT, INT, STRING, VECTOR, ModelRegistry, decode_values, encode_values
+)
+import omni.kit.app
+import omni.kit.test
+import omni.ui as ui
+
+
+class TestSnapshot(omni.kit.test.AsyncTestCase):
+    async def test_encoding(self):
+        """Testing the binary form keeps all the kinds of values"""
+        values = [
+            ("a/float", FLOAT, 0.25),
+            ("a/int", INT, -7),
+            ("a/bool", BOOL, True),
+            ("b/string", STRING, "/World/tree"),
+            ("b/vector", VECTOR, (0.25, 0.5, 0.75)),
+            ("b/combo", COMBO, 2),
+        ]
+        self.assertEqual(decode_values(encode_values(values)), values)
+
+        with self.assertRaises(ValueError):
+            decode_values(b"not a snapshot")
+        with self.assertRaises(ValueError):
+            decode_values(encode_values(values)[:-1])
+
+    async def test_restore(self):
+        """Testing the callbacks are called once when all the values are restored"""
+        registry = ModelRegistry()
+        first = ui.SimpleFloatModel(1.0)
+        second = ui.SimpleFloatModel(2.0)
+        registry.register("first", first)
+        registry.register("second", second)
+        data = registry.snapshot()
+
+        calls = []
+        callback = registry.gate.wrap(lambda m: calls.append((first.as_float, second.as_float)))
+        first.add_value_changed_fn(callback)
+        second.add_value_changed_fn(callback)
+        first.set_value(3.0)
+        second.set_value(4.0)
+        calls.clear()
+
+        self.assertEqual(registry.restore(data), 2)
+        self.assertEqual(calls, [(1.0, 2.0)])
+
+        # The value of the model that is registered later is set on register
+        registry.unregister("second")
+        second.set_value(5.0)
+        registry.restore(data)
+        registry.register("second", second)
+        self.assertEqual(second.as_float, 2.0)
+
+    async def test_window(self):
+        """Testing the snapshot of the window"""
+        window = PropertyWindowExample("Test", width=450, height=900, lazy_sections=False)
+        for _ in range(2):
+            await omni.kit.app.get_app().next_update_async()
+
+        key = "LIGHT PROPERTIES/Intensity"
+        self.assertIn(key, window.models)
+        data = window.snapshot()
+
+        window.models.get_model(key).set_value(42.0)
+        window.restore_snapshot(data)
+        self.assertEqual(window.models.get_model(key).as_float, 3000.0)
+
+        window.destroy()
@@ -9,10 +9,15 @@
 __all__ = ["TestWindow"]
 
 from omni.example.ui_gradient_window import PropertyWindowExample
+from omni.example.ui_gradient_window.collapsable_widget import CustomCollsableFrame
 from omni.ui.tests.test_base import OmniUiTest
 from pathlib import Path
+import asyncio
 import omni.kit.app
 import omni.kit.test
+import omni.ui as ui
+
+from .image_readiness import wait_for_images
 
 
 EXTENSION_FOLDER_PATH = Path(omni.kit.app.get_app().get_extension_manager().get_extension_path_by_module(__name__))
@@ -23,6 +28,8 @@ class TestWindow(OmniUiTest):
     async def test_general(self):
         """Testing general look of section"""
         window = PropertyWindowExample("Test")
+        # Subscribe to the progress of the images before they are built and loaded
+        images_loaded = asyncio.ensure_future(wait_for_images(window))
         await omni.kit.app.get_app().next_update_async()
         await self.docked_test_window(
             window=window,
@@ -31,7 +38,55 @@ class TestWindow(OmniUiTest):
         )
 
         # Wait for images
-        for _ in range(20):
-            await omni.kit.app.get_app().next_update_async()
+        self.assertTrue(await images_loaded)
 
         await self.finalize_test(golden_img_dir=TEST_DATA_PATH, golden_img_name="window.png")
+
+    async def test_lazy_sections(self):
+        """Testing the collapsed section is built on the first expand and is not built again"""
+        builds = []
+        changes = []
+        test_window = ui.Window("Lazy", width=200, height=200)
+        with test_window.frame:
+            with ui.VStack():
+                section = CustomCollsableFrame(
+                    "LAZY", collapsed=True, build_fn=lambda: builds.append(ui.Label("Body")),
+                    collapsed_changed_fn=changes.append)
+                eager = CustomCollsableFrame(
+                    "EAGER", collapsed=True, build_fn=lambda: ui.Label("Body"), lazy=False)
+        await omni.kit.app.get_app().next_update_async()
+        self.assertEqual(builds, [])
+        self.assertFalse(section.body.built)
+        self.assertTrue(eager.body.built)
+
+        for collapsed in (False, True, False):
+            section.collapsable_frame.collapsed = collapsed
+            await omni.kit.app.get_app().next_update_async()
+        # One body, and the callback of the caller still gets the changes
+        self.assertEqual(len(builds), 1)
+        self.assertEqual(ui.Inspector.get_children(section.collapsable_frame), builds)
+        self.assertEqual(changes, [False, True, False])
+
+        test_window.destroy()
+
+    async def test_search(self):
+        """Testing the search expands the collapsed sections with the found rows"""
+        window = PropertyWindowExample("Test")
+        await self.docked_test_window(window=window, width=450, height=600)
+        await omni.kit.app.get_app().next_update_async()
+        sections = window.sections
+        sections["LIGHT PROPERTIES"].frame.collapsed = True
+        sections["SHAPING"].frame.collapsed = True
+        await omni.kit.app.get_app().next_update_async()
+
+        window.search_text = "position"
+        await omni.kit.app.get_app().next_update_async()
+        self.assertTrue(sections["LIGHT PROPERTIES"].frame.collapsed)
+
+        # The parent is expanded with the subsection of the found row
+        window.search_text = "cone soft"
+        await omni.kit.app.get_app().next_update_async()
+        self.assertFalse(sections["LIGHT PROPERTIES"].frame.collapsed)
+        self.assertFalse(sections["SHAPING"].frame.collapsed)
+
+        window.destroy()
@@ -9,16 +9,37 @@
 __all__ = ["PropertyWindowExample"]
 
 from ast import With
+from contextlib import contextmanager
 from ctypes import alignment
 import omni.kit
 import omni.ui as ui
-from .style import main_window_style, get_gradient_color, build_gradient_image
+from . import attribute_store
+from .attribute_store import AttributeStore
+from .style import main_window_style, get_gradient_lut, build_gradient_image, release_gradient_provider
 from .style import cl_combobox_background, cls_temperature_gradient, cls_color_gradient, cls_tint_gradient, cls_grey_gradient, cls_button_gradient
 from .color_widget import ColorWidget
-from .collapsable_widget import CustomCollsableFrame, build_collapsable_header
+from .collapsable_widget import CustomCollsableFrame, LazyFrameBody, build_collapsable_header
+from .profiler import BuildProfiler
+from .search_index import AttributeSearchIndex
+from .snapshot import BOOL, COMBO, FLOAT, STRING, VECTOR, ModelRegistry
+from .virtualized_list import AttributeRowDelegate, VirtualizedList
 
 LABEL_WIDTH = 120
 SPACING = 10
+ATTRIBUTE_ROW_HEIGHT = 32
+ATTRIBUTES_HEIGHT = 400
+
+# The labels of the rows by the path of their section. They are added to the
+# search index when the section is declared, so the rows of the sections that
+# are not built yet can be found.
+SECTION_LABELS = {
+    "TRANSFORMS": ("Position", "Rotation", "Scale"),
+    "LIGHT PROPERTIES": (
+        "Type", "Color", "Enable Color Temperature", "Color Temperature", "Diffuse Multiplier", "Exposture",
+        "Intensity", "Normalize Power", "Purpose", "Radius", "Specular Multiplier", "Treat As Point",
+    ),
+    "LIGHT PROPERTIES/SHAPING": ("Cone Angle", "Cone Softness", "Focus", "Focus Tint"),
+}
 
 
 def _get_plus_glyph():
@@ -28,11 +49,58 @@ def _get_search_glyph():
     return omni.kit.ui.get_custom_glyph_code("${glyphs}/menu_search.svg")
 
 
+class _GradientAttributeRowDelegate(AttributeRowDelegate):
+    """The rows of the "ATTRIBUTES" group look like the gradient float sliders"""
+
+    def __init__(self, attributes, label_width, gradient_providers):
+        super().__init__(attributes, label_width)
+        self.__gradient_providers = gradient_providers
+
+    def build_row(self):
+        with ui.HStack():
+            label = ui.Label("", name="attribute_name", width=self.label_width)
+            self._labels.append(label)
+            with ui.ZStack():
+                self.__gradient_providers.append(
+                    build_gradient_image(cls_button_gradient, 22, "button_background_gradient"))
+                with ui.VStack():
+                    ui.Spacer(height=1.5)
+                    with ui.HStack():
+                        slider = ui.FloatSlider(name="float_slider", height=0)
+                        ui.Spacer(width=1.5)
+            ui.Spacer(width=24)
+        return label, slider
+
+
 class PropertyWindowExample(ui.Window):
     """The class that represents the window"""
 
     def __init__(self, title: str, delegate=None, **kwargs):
         self.__label_width = LABEL_WIDTH
+        # The labels that follow label_width
+        self.__labels = []
+        # When True, the body of a collapsed section is built on the first expand
+        self.__lazy_sections = kwargs.pop("lazy_sections", True)
+        # The list of (name, model) shown in the virtualized "ATTRIBUTES" group
+        self.__attributes = kwargs.pop("attributes", None)
+        self.__attribute_list = None
+        # The shared gradient providers and the compound widgets that hold
+        # them. They are released when the window is rebuilt or destroyed.
+        self.__gradient_providers = []
+        self.__color_widgets = []
+        # The search field filters the rows registered in this index
+        self.__search_index = AttributeSearchIndex()
+        self.__search_rows = {}
+        self.__search_text = ""
+        self.__section_names = []
+        # The LazyFrameBody of each section by name
+        self.__sections = {}
+        # Opt-in, records the cost of each section builder, only the time with profile_memory=False
+        self.__profiler = BuildProfiler(kwargs.pop("profile", False), kwargs.pop("profile_memory", True))
+        # The values of the widgets, they are kept when the window is rebuilt
+        self.__store = AttributeStore()
+        # The models of the widgets, saved and restored with snapshots
+        self.__models = ModelRegistry()
 
         super().__init__(title, **kwargs)
 
@@ -42,9 +110,26 @@ class PropertyWindowExample(ui.Window):
         self.frame.set_build_fn(self._build_fn)
 
     def destroy(self):
+        if self.__attribute_list:
+            self.__attribute_list.destroy()
+            self.__attribute_list = None
+        self._release_gradients(self.__gradient_providers, self.__color_widgets)
+        self.__gradient_providers = []
+        self.__color_widgets = []
+        self.__profiler.destroy()
+        self.__models.destroy()
+        self.__store.destroy()
         # It will destroy all the children
         super().destroy()
 
+    @staticmethod
+    def _release_gradients(providers, color_widgets):
+        """Give the shared gradient providers back to the pool"""
+        for provider in providers:
+            release_gradient_provider(provider)
+        for widget in color_widgets:
+            widget.destroy()
+
     @property
     def label_width(self):
         """The width of the attribute label"""
@@ -54,7 +139,174 @@ class PropertyWindowExample(ui.Window):
     def label_width(self, value):
         """The width of the attribute label"""
         self.__label_width = value
-        self.frame.rebuild()
+        # Only the width is changed, so the labels are updated in place
+        for label in self.__labels:
+            label.width = ui.Pixel(value)
+        if self.__attribute_list:
+            self.__attribute_list.delegate.label_width = value
+
+    @property
+    def lazy_sections(self):
+        """True if the collapsed sections are built when they are expanded"""
+        return self.__lazy_sections
+
+    @property
+    def sections(self):
+        """The bodies of the sections by name, `LazyFrameBody.built` is False until the section is expanded"""
+        return dict(self.__sections)
+
+    @property
+    def attributes(self):
+        """The list of (name, model) shown in the "ATTRIBUTES" group"""
+        return self.__attributes
+
+    @attributes.setter
+    def attributes(self, value):
+        """The list of (name, model) shown in the "ATTRIBUTES" group"""
+        had_attributes = bool(self.__attributes)
+        self._unregister_attributes()
+        self.__attributes = value
+        self._register_attributes()
+        if self.__attribute_list and value:
+            # Only the visible rows are rebound
+            self._show_attributes(self.__search_index.query(self.__search_text))
+        elif had_attributes != bool(value):
+            self.frame.rebuild()
+
+    @property
+    def profiler(self) -> BuildProfiler:
+        """The profiler of the section builders. Set `profiler.enabled` to start recording."""
+        return self.__profiler
+
+    @property
+    def store(self) -> AttributeStore:
+        """The values of the widgets by "SECTION/Label" name, for the bulk reads and writes"""
+        return self.__store
+
+    @property
+    def models(self) -> ModelRegistry:
+        """The models of the widgets by "SECTION/Label" key"""
+        return self.__models
+
+    def snapshot(self) -> bytes:
+        """Save the values of all the widgets to the compact binary form"""
+        return self.__models.snapshot()
+
+    def restore_snapshot(self, data: bytes) -> int:
+        """
+        Set the values saved with `snapshot`. The values of the sections that
+        are not built yet are set when they are built. Returns the number of
+        values set.
+        """
+        return self.__models.restore(data)
+
+    def _attribute(self, label, default, dtype=attribute_store.FLOAT, options=None):
+        """The model of the row in the store. It's added when the row is built the first time."""
+        name = "/".join(self.__section_names + [label.strip()])
+        if name not in self.__store:
+            self.__store.add(name, default, dtype, options)
+        return self.__store.get_model(name)
+
+    def _register_model(self, label, model, kind):
+        """Add the model of the row to the snapshot, the key is the section and the label"""
+        self.__models.register("/".join(self.__section_names + [label.strip()]), model, kind)
+
+    def _register_attributes(self):
+        """Add the models of the "ATTRIBUTES" group to the snapshot and their names to the search index"""
+        for name, model in self.__attributes or []:
+            self.__models.register(f"ATTRIBUTES/{name}", model, FLOAT)
+            self.__search_index.add(f"ATTRIBUTES/{name}", name, "ATTRIBUTES")
+
+    def _unregister_attributes(self):
+        for name, _ in self.__attributes or []:
+            self.__models.unregister(f"ATTRIBUTES/{name}")
+            self.__search_index.remove(f"ATTRIBUTES/{name}")
+
+    def _show_attributes(self, result):
+        """Bind the rows of the "ATTRIBUTES" group to the attributes found by the search"""
+        attributes = self.__attributes or []
+        if self.__search_text:
+            attributes = [(name, model) for name, model in attributes if f"ATTRIBUTES/{name}" in result]
+        self.__attribute_list.delegate.attributes = attributes
+        self.__attribute_list.refresh()
+
+    @property
+    def search_text(self):
+        """The text the rows are filtered with"""
+        return self.__search_text
+
+    @search_text.setter
+    def search_text(self, value):
+        """The text the rows are filtered with"""
+        self._filter_rows(value)
+
+    def _filter_rows(self, text):
+        """Show the rows that match the text and hide the rest"""
+        self.__search_text = text
+        result = self.__search_index.query(text)
+        for key, row in self.__search_rows.items():
+            visible = key in result
+            if row.visible != visible:
+                row.visible = visible
+        if text:
+            self._expand_sections(result)
+        if self.__attribute_list:
+            self._show_attributes(result)
+
+    def _expand_sections(self, result):
+        """Expand the collapsed sections that have the found rows, the lazy bodies are built on expand"""
+        # The parents are sorted before their subsections, so they are built first
+        for path in sorted({key.rsplit("/", 1)[0] for key in result}):
+            for name in path.split("/"):
+                body = self.__sections.get(name)
+                if body and body.frame.collapsed:
+                    body.frame.collapsed = False
+
+    def _declare_search_section(self, names):
+        """Add the labels of the section and its subsections to the search index before they are built"""
+        path = "/".join(names)
+        for section, labels in SECTION_LABELS.items():
+            if section != path and not section.startswith(f"{path}/"):
+                continue
+            for label in labels:
+                key = f"{section}/{label}"
+                if key not in self.__search_index:
+                    self.__search_index.add(key, label, " ".join(section.split("/")))
+
+    def _register_search_row(self, label, row):
+        """Connect the row to its key in the search index, so the search field can hide it"""
+        key = "/".join(self.__section_names + [label.strip()])
+        if key not in self.__search_index:
+            # The row that is not in SECTION_LABELS can be found only when it's built
+            self.__search_index.add(key, label.strip(), " ".join(self.__section_names))
+        self.__search_rows[key] = row
+        if self.__search_text:
+            # The row is built when the search is active, e.g. in the lazy section
+            row.visible = key in self.__search_index.query(self.__search_text)
+
+    @contextmanager
+    def _search_section(self, names):
+        """The rows built in this context belong to the section with the given names"""
+        previous = self.__section_names
+        self.__section_names = names
+        try:
+            yield
+        finally:
+            self.__section_names = previous
+
+    def _section_build_fn(self, name, build_fn):
+        """
+        Wrap the build function of the section, so the rows know their section
+        when built lazily. The labels of the section are searchable from now.
+        """
+        names = self.__section_names + [name]
+        self._declare_search_section(names)
+
+        def section_build_fn():
+            with self._search_section(names):
+                self.__profiler.call(build_fn)
+
+        return section_build_fn
 
     def _build_transform(self):
         """Build the widgets of the "Calculations" group"""
@@ -66,40 +318,69 @@ class PropertyWindowExample(ui.Window):
                     ui.Image(name="transform", fill_policy=ui.FillPolicy.PRESERVE_ASPECT_FIT, width=24, height=24)
                     ui.Spacer(width=30)
                 ui.Spacer()
-            with CustomCollsableFrame("TRANSFORMS").collapsable_frame:
-                with ui.VStack(height=0, spacing=SPACING):
-                    ui.Spacer(height=2)
-                    self._build_vector_widget("Position", 70)
-                    self._build_vector_widget("Rotation", 70)
-                    with ui.ZStack():
-                        self._build_vector_widget("Scale", 85)
-                        with ui.HStack():
-                            ui.Spacer(width=42)
-                            ui.Image(name="link", fill_policy=ui.FillPolicy.PRESERVE_ASPECT_FIT, width=20)
+            self.__sections["TRANSFORMS"] = CustomCollsableFrame(
+                "TRANSFORMS",
+                build_fn=self._section_build_fn("TRANSFORMS", self._build_transform_body),
+                lazy=self.lazy_sections,
+            ).body
+
+    def _build_transform_body(self):
+        with ui.VStack(height=0, spacing=SPACING):
+            ui.Spacer(height=2)
+            self._build_vector_widget("Position", 70)
+            self._build_vector_widget("Rotation", 70)
+            with ui.ZStack():
+                self._build_vector_widget("Scale", 85)
+                with ui.HStack():
+                    ui.Spacer(width=42)
+                    ui.Image(name="link", fill_policy=ui.FillPolicy.PRESERVE_ASPECT_FIT, width=20)
 
     def _build_path(self):
         CustomCollsableFrame("PATH", collapsed=True)
 
     def _build_light_properties(self):
         """Build the widgets of the "Parameters" group"""
-        with CustomCollsableFrame("LIGHT PROPERTIES").collapsable_frame:
-            with ui.VStack(height=0, spacing=SPACING):
-                ui.Spacer(height=2)
-                self._build_combobox("Type", ["Sphere Light", "Disk Light", "Rect Light"])
-                self.color_gradient_data, self.tint_gradient_data, self.grey_gradient_data = self._build_color_widget("Color")
-                self._build_color_temperature()
-
-                self.diffuse_button_data = self._build_gradient_float_slider("Diffuse Multiplier")
-                self.exposture_button_data = self._build_gradient_float_slider("Exposture")
-                self.intensity_button_data = self._build_gradient_float_slider("Intensity", default_value=3000, min=0, max=6000)
-
-                self._build_checkbox("Normalize Power", False)
-                self._build_combobox("Purpose", ["Default", "Customized"])
-                self.radius_button_data = self._build_gradient_float_slider("Radius")
-
-                self._build_shaping()
-                self.specular_button_data = self._build_gradient_float_slider("Specular Multiplier")
-                self._build_checkbox("Treat As Point")
+        self.__sections["LIGHT PROPERTIES"] = CustomCollsableFrame(
+            "LIGHT PROPERTIES",
+            build_fn=self._section_build_fn("LIGHT PROPERTIES", self._build_light_properties_body),
+            lazy=self.lazy_sections,
+        ).body
+
+    def _build_light_properties_body(self):
+        with ui.VStack(height=0, spacing=SPACING):
+            ui.Spacer(height=2)
+            self._build_combobox("Type", ["Sphere Light", "Disk Light", "Rect Light"])
+            self.color_gradient_data, self.tint_gradient_data, self.grey_gradient_data = self._build_color_widget("Color")
+            self._build_color_temperature()
+
+            self.diffuse_button_data = self._build_gradient_float_slider("Diffuse Multiplier")
+            self.exposture_button_data = self._build_gradient_float_slider("Exposture")
+            self.intensity_button_data = self._build_gradient_float_slider("Intensity", default_value=3000, min=0, max=6000)
+
+            self._build_checkbox("Normalize Power", False)
+            self._build_combobox("Purpose", ["Default", "Customized"])
+            self.radius_button_data = self._build_gradient_float_slider("Radius")
+
+            self._build_shaping()
+            self.specular_button_data = self._build_gradient_float_slider("Specular Multiplier")
+            self._build_checkbox("Treat As Point")
+
+    def _build_attributes(self):
+        """Build the "ATTRIBUTES" group. Only the visible rows have widgets."""
+        if self.__attribute_list:
+            self.__attribute_list.destroy()
+            self.__attribute_list = None
+        if not self.__attributes:
+            return
+
+        with CustomCollsableFrame("ATTRIBUTES").collapsable_frame:
+            with ui.VStack(height=0):
+                ui.Spacer(height=SPACING)
+                self.__attribute_list = VirtualizedList(
+                    _GradientAttributeRowDelegate(self.__attributes, self.label_width, self.__gradient_providers),
+                    row_height=ATTRIBUTE_ROW_HEIGHT,
+                    height=ATTRIBUTES_HEIGHT,
+                )
 
     def _build_line_dot(self, line_width, height):
         with ui.HStack():
@@ -123,23 +404,34 @@ class PropertyWindowExample(ui.Window):
                     ui.Spacer(height=17)
                     ui.Line(name="group_line", alignment=ui.Alignment.RIGHT, width=0)
                     ui.Spacer(height=80)
-            with ui.CollapsableFrame("          SHAPING", name="group", build_header_fn=build_collapsable_header):
-                with ui.VStack(height=0, spacing=SPACING):
-                    self.angle_button_data = self._build_gradient_float_slider("Cone Angle")
-                    self.softness_button_data = self._build_gradient_float_slider("Cone Softness")
-                    self.focus_button_data = self._build_gradient_float_slider("Focus")
-                    self.focus_color_data, self.focus_tint_data, self.focus_grey_data  = self._build_color_widget("Focus Tint")
+            shaping_frame = ui.CollapsableFrame("          SHAPING", name="group", build_header_fn=build_collapsable_header)
+            self.__sections["SHAPING"] = LazyFrameBody(
+                shaping_frame, self._section_build_fn("SHAPING", self._build_shaping_body), lazy=self.lazy_sections)
+
+    def _build_shaping_body(self):
+        with ui.VStack(height=0, spacing=SPACING):
+            self.angle_button_data = self._build_gradient_float_slider("Cone Angle")
+            self.softness_button_data = self._build_gradient_float_slider("Cone Softness")
+            self.focus_button_data = self._build_gradient_float_slider("Focus")
+            self.focus_color_data, self.focus_tint_data, self.focus_grey_data  = self._build_color_widget("Focus Tint")
 
     def _build_vector_widget(self, widget_name, space):
-        with ui.HStack():
+        row = ui.HStack()
+        self._register_search_row(widget_name, row)
+        with row:
             ui.Label(widget_name, name="attribute_name", width=0)
             ui.Spacer(width=space)
             # The custom compound widget
-            ColorWidget(1.0, 1.0, 1.0, draw_colorpicker=False)
+            color_widget = ColorWidget(
+                1.0, 1.0, 1.0, draw_colorpicker=False, model=self._attribute(widget_name, [1.0, 1.0, 1.0]))
+            self.__color_widgets.append(color_widget)
+            self._register_model(widget_name, color_widget.model, VECTOR)
             ui.Spacer(width=10)        
 
     def _build_color_temperature(self):
-        with ui.ZStack():
+        row = ui.ZStack()
+        self._register_search_row("Enable Color Temperature", row)
+        with row:
             with ui.HStack():
                 ui.Spacer(width=10)
                 with ui.VStack():
@@ -161,7 +453,9 @@ class PropertyWindowExample(ui.Window):
                     ui.Line(name="group_line", alignment=ui.Alignment.TOP)
 
     def _build_color_widget(self, widget_name):
-        with ui.ZStack():
+        row = ui.ZStack()
+        self._register_search_row(widget_name, row)
+        with row:
             with ui.HStack():
                 ui.Spacer(width=10)
                 with ui.VStack():
@@ -172,7 +466,9 @@ class PropertyWindowExample(ui.Window):
                     self._build_line_dot(40, 9)
                     ui.Label(widget_name, name="attribute_name", width=0)
                     # The custom compound widget
-                    ColorWidget(0.25, 0.5, 0.75)
+                    color_widget = ColorWidget(0.25, 0.5, 0.75, model=self._attribute(widget_name, [0.25, 0.5, 0.75]))
+                    self.__color_widgets.append(color_widget)
+                    self._register_model(widget_name, color_widget.model, VECTOR)
                     ui.Spacer(width=10)
                 color_data = self._build_slider_handle(cls_color_gradient)
                 tint_data = self._build_slider_handle(cls_tint_gradient)
@@ -183,17 +479,22 @@ class PropertyWindowExample(ui.Window):
         return color_data, tint_data, grey_data
 
     def _build_slider_handle(self, colors):
-        handle_Style = {"background_color": colors[0], "border_width": 2, "border_color": cl_combobox_background}
+        lut = get_gradient_lut(colors)
+        last_index = 0
+
         def set_color(placer, handle, offset):
+            nonlocal last_index
             # first clamp the value
             max = placer.computed_width - handle.computed_width
             if offset < 0:
                 placer.offset_x = 0
             elif offset > max:
                 placer.offset_x = max
-            color = get_gradient_color(placer.offset_x.value, max, colors)
-            handle_Style.update({"background_color": color})
-            handle.style = handle_Style
+            # the styles are prebuilt, only restyle when the color is different
+            index = lut.index(placer.offset_x.value, max)
+            if index != last_index:
+                last_index = index
+                handle.style = lut.styles[index]
 
         with ui.HStack():
             ui.Spacer(width=18)
@@ -201,10 +502,11 @@ class PropertyWindowExample(ui.Window):
                 with ui.VStack():
                     ui.Spacer(height=3)
                     byte_provider = build_gradient_image(colors, 8, "gradient_slider")
+                    self.__gradient_providers.append(byte_provider)
                 with ui.HStack():
                     handle_placer = ui.Placer(draggable=True, drag_axis=ui.Axis.X, offset_x=0)
                     with handle_placer:
-                        handle = ui.Circle(width=15, height=15, style=handle_Style)
+                        handle = ui.Circle(width=15, height=15, style=lut.styles[0])
                     handle_placer.set_offset_x_changed_fn(lambda offset: set_color(handle_placer, handle, offset.value))
             ui.Spacer(width=22)
         return byte_provider
@@ -214,13 +516,34 @@ class PropertyWindowExample(ui.Window):
         The method that is called to build all the UI once the window is
         visible.
         """
-        with ui.ScrollingFrame(name="main_frame"):
-            with ui.VStack(height=0, spacing=SPACING):
-                self._build_head()
-                self._build_transform()
-                self._build_path()
-                self._build_light_properties()
-                ui.Spacer(height=30)
+        # The previous widgets are destroyed by the rebuild. Their gradients
+        # are released after the new widgets acquire them, so the providers of
+        # the same gradients are reused.
+        previous_providers, previous_color_widgets = self.__gradient_providers, self.__color_widgets
+        self.__gradient_providers = []
+        self.__color_widgets = []
+        # The rows are recreated, and the search field is reset
+        self.__search_index.clear()
+        self.__search_rows = {}
+        self.__search_text = ""
+        self.__labels = []
+        self.__sections = {}
+        # The widgets are recreated with their models
+        self.__models.clear()
+        self._register_attributes()
+
+        with self.__profiler.build(self.frame):
+            with ui.ScrollingFrame(name="main_frame"):
+                stack = ui.VStack(height=0, spacing=SPACING)
+                with stack:
+                    self.__profiler.call(self._build_head, stack)
+                    self.__profiler.call(self._build_transform, stack)
+                    self.__profiler.call(self._build_path, stack)
+                    self.__profiler.call(self._build_light_properties, stack)
+                    self.__profiler.call(self._build_attributes, stack)
+                    ui.Spacer(height=30)
+
+        self._release_gradients(previous_providers, previous_color_widgets)
 
     def _build_head(self):
         with ui.ZStack():
@@ -259,42 +582,61 @@ class PropertyWindowExample(ui.Window):
         with ui.HStack(height=20):
             ui.Spacer(width=3)
             ui.Label("Stage Path", name="header_attribute_name", width=70)
-            ui.StringField(name="path").model.set_value("/World/environment/tree")
+            path_field = ui.StringField(name="path")
+            path_field.model.set_value("/World/environment/tree")
+            self._register_model("Stage Path", path_field.model, STRING)
 
     def _build_search_field(self):
         with ui.HStack():
             ui.Spacer(width=2)
-            # would add name="search" style, but there is a bug to use glyph together with style
-            # make sure the test passes for now
-            ui.StringField(height=23).model.set_value(f"{_get_search_glyph()} Search")
+            with ui.ZStack(height=23):
+                # would add name="search" style, but there is a bug to use glyph together with style
+                # make sure the test passes for now
+                search_field = ui.StringField()
+                # The model stays empty, the placeholder is drawn over the field while there is no text
+                with ui.HStack():
+                    ui.Spacer(width=4)
+                    placeholder = ui.Label(f"{_get_search_glyph()} Search", name="search")
 
-    def _build_checkbox(self, label_name, default_value=True):
-        def _restore_default(rect_changed, rect_default):
-            image.name = "checked" if default_value else "unchecked"
+        def on_search_changed(model):
+            text = model.as_string
+            placeholder.visible = not text
+            # filter the rows as the user types
+            self._filter_rows(text.strip())
+
+        search_field.model.add_value_changed_fn(on_search_changed)
 
-            rect_changed.visible = False
-            rect_default.visible = True
-        
-        def _on_value_changed(image, rect_changed, rect_default):
-            image.name = "unchecked" if image.name == "checked" else "checked"
+    def _build_checkbox(self, label_name, default_value=True):
+        def _on_value_changed(model, image, rect_changed, rect_default):
+            value = model.get_value_as_bool()
+            image.name = "checked" if value else "unchecked"
 
-            if (default_value and image.name == "unchecked") or (not default_value and image.name == "checked"):
+            if value != default_value:
                 rect_changed.visible = True
                 rect_default.visible = False
             else:
                 rect_changed.visible = False
                 rect_default.visible = True
 
-        with ui.HStack():
-            ui.Label(label_name, name=f"attribute_bool", width=self.label_width, height=20)
+        row = ui.HStack()
+        self._register_search_row(label_name, row)
+        with row:
+            self.__labels.append(ui.Label(label_name, name=f"attribute_bool", width=self.label_width, height=20))
             name = "checked" if default_value else "unchecked"
             image =ui.Image(name=name, fill_policy=ui.FillPolicy.PRESERVE_ASPECT_FIT, height=18, width=18)
             ui.Spacer()
             rect_changed, rect_default = self.__build_value_changed_widget()
-            image.set_mouse_pressed_fn(lambda x, y, b, m: _on_value_changed(image, rect_changed, rect_default))  
+            # the image shows the value of the model
+            model = self._attribute(label_name, default_value, attribute_store.BOOL)
+            if model.as_bool != default_value:
+                _on_value_changed(model, image, rect_changed, rect_default)
+            model.add_value_changed_fn(
+                self.__models.gate.wrap(lambda m: _on_value_changed(m, image, rect_changed, rect_default)))
+            self._register_model(label_name, model, BOOL)
+            image.set_mouse_pressed_fn(lambda x, y, b, m: model.set_value(not model.get_value_as_bool()))
 
             # add call back to click the rect_changed to restore the default value
-            rect_changed.set_mouse_pressed_fn(lambda x, y, b, m: _restore_default(rect_changed, rect_default))
+            rect_changed.set_mouse_pressed_fn(lambda x, y, b, m: model.set_value(default_value))
 
     def __build_value_changed_widget(self):
         with ui.VStack(width=20):
@@ -318,20 +660,27 @@ class PropertyWindowExample(ui.Window):
         def _restore_default(slider):
             slider.model.set_value(default_value)
 
-        with ui.HStack():
-            ui.Label(label_name, name=f"attribute_name", width=self.label_width)
+        row = ui.HStack()
+        self._register_search_row(label_name, row)
+        with row:
+            self.__labels.append(ui.Label(label_name, name=f"attribute_name", width=self.label_width))
             with ui.ZStack():
                 button_background_gradient = build_gradient_image(cls_button_gradient, 22, "button_background_gradient")
+                self.__gradient_providers.append(button_background_gradient)
                 with ui.VStack():
                     ui.Spacer(height=1.5)
                     with ui.HStack():
-                        slider = ui.FloatSlider(name="float_slider", height=0, min=min, max=max)
-                        slider.model.set_value(default_value)
+                        slider = ui.FloatSlider(
+                            self._attribute(label_name, default_value), name="float_slider", height=0, min=min, max=max)
                         ui.Spacer(width=1.5)
             ui.Spacer(width=4)
             rect_changed, rect_default = self.__build_value_changed_widget()
+            # the value is kept in the store, so it can be changed already
+            _on_value_changed(slider.model, rect_changed, rect_default)
             # switch the visibility of the rect_changed and rect_default to indicate value changes
-            slider.model.add_value_changed_fn(lambda model: _on_value_changed(model, rect_changed, rect_default))
+            slider.model.add_value_changed_fn(
+                self.__models.gate.wrap(lambda model: _on_value_changed(model, rect_changed, rect_default)))
+            self._register_model(label_name, slider.model, FLOAT)
             # add call back to click the rect_changed to restore the default value
             rect_changed.set_mouse_pressed_fn(lambda x, y, b, m: _restore_default(slider))
         return button_background_gradient
@@ -347,20 +696,26 @@ class PropertyWindowExample(ui.Window):
                 rect_defaul.visible = False
         def _restore_default(combo_box):
             combo_box.model.get_item_value_model().set_value(0)
-        with ui.HStack():
-            ui.Label(label_name, name=f"attribute_name", width=self.label_width)
+        row = ui.HStack()
+        self._register_search_row(label_name, row)
+        with row:
+            self.__labels.append(ui.Label(label_name, name=f"attribute_name", width=self.label_width))
             with ui.ZStack():
                 ui.Image(name="combobox", fill_policy=ui.FillPolicy.STRETCH, height=35)
                 with ui.HStack():
                     ui.Spacer(width=10)
                     with ui.VStack():
                         ui.Spacer(height=10)
-                        option_list = list(options)
-                        combo_box = ui.ComboBox(0, *option_list, name="dropdown_menu")
+                        model = self._attribute(label_name, 0, attribute_store.INT, options)
+                        combo_box = ui.ComboBox(model, name="dropdown_menu")
             with ui.VStack(width=0):
                 ui.Spacer(height=10)
                 rect_changed, rect_default = self.__build_value_changed_widget()
+            # the value is kept in the store, so it can be changed already
+            _on_value_changed(combo_box.model, rect_changed, rect_default)
             # switch the visibility of the rect_changed and rect_default to indicate value changes
-            combo_box.model.add_item_changed_fn(lambda m, i: _on_value_changed(m, rect_changed, rect_default))
+            combo_box.model.add_item_changed_fn(
+                self.__models.gate.wrap(lambda m, i: _on_value_changed(m, rect_changed, rect_default)))
+            self._register_model(label_name, combo_box.model, COMBO)
             # add call back to click the rect_changed to restore the default value
             rect_changed.set_mouse_pressed_fn(lambda x, y, b, m: _restore_default(combo_box))
@@ -23,6 +23,8 @@ class CustomBaseWidget:
         self.existing_model: Optional[ui.AbstractItemModel] = kwargs.pop("model", None)
         self.revert_img = None
         self.__attr_label: Optional[str] = kwargs.pop("label", "")
+        self.__label_width = kwargs.pop("label_width", ATTR_LABEL_WIDTH)
+        self.__label: Optional[ui.Label] = None
         self.__frame = ui.Frame()
         with self.__frame:
             self._build_fn()
@@ -31,6 +33,7 @@ class CustomBaseWidget:
         self.existing_model = None
         self.revert_img = None
         self.__attr_label = None
+        self.__label = None
         self.__frame = None
 
     def __getattr__(self, attr):
@@ -39,12 +42,33 @@ class CustomBaseWidget:
         """
         return getattr(self.__frame, attr)
 
+    @property
+    def label(self) -> str:
+        """The text of the attribute label"""
+        return self.__attr_label
+
+    @property
+    def label_width(self):
+        """The width of the attribute label"""
+        return self.__label_width
+
+    @label_width.setter
+    def label_width(self, value):
+        """The width of the attribute label. It's changed without rebuilding."""
+        self.__label_width = value
+        if self.__label:
+            self.__label.width = ui.Pixel(value)
+
+    def register_models(self, registry, prefix: str):
+        """Add the model of the widget to the ModelRegistry with the "prefix/label" key"""
+        registry.register(f"{prefix}/{self.label}", self.model)
+
     def _build_head(self):
         """Build the left-most piece of the widget line (label in this case)"""
-        ui.Label(
+        self.__label = ui.Label(
             self.__attr_label,
             name="attribute_name",
-            width=ATTR_LABEL_WIDTH
+            width=self.__label_width
         )
 
     def _build_body(self):
@@ -74,9 +98,17 @@ class CustomBaseWidget:
         self.revert_img.set_mouse_pressed_fn(
             lambda x, y, b, m: self._restore_default())
 
+    def _on_value_changed(self, *args):
+        """Set revert_img to correct state."""
+        pass
+
     def _build_fn(self):
         """Puts the 3 pieces together."""
         with ui.HStack():
             self._build_head()
             self._build_body()
             self._build_tail()
+
+        if self.existing_model:
+            # The shared model can hold the value that is not the default
+            self._on_value_changed()
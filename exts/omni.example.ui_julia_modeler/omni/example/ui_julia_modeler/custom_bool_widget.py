@@ -8,6 +8,8 @@
 #
 __all__ = ["CustomBoolWidget"]
 
+from typing import Optional
+
 import omni.ui as ui
 
 from .custom_base_widget import CustomBaseWidget
@@ -22,6 +24,9 @@ class CustomBoolWidget(CustomBaseWidget):
                  **kwargs):
         self.__default_val = default_value
         self.__bool_image = None
+        self.__bool_model: Optional[ui.AbstractValueModel] = None
+        # The subscription to the model, it's replaced with the model
+        self.__bool_sub = None
 
         # Call at the end, rather than start, so build_fn runs after all the init stuff
         CustomBaseWidget.__init__(self, model=model, **kwargs)
@@ -29,40 +34,56 @@ class CustomBoolWidget(CustomBaseWidget):
     def destroy(self):
         CustomBaseWidget.destroy()
         self.__bool_image = None
+        self.__bool_sub = None
+        self.__bool_model = None
+
+    @property
+    def model(self) -> Optional[ui.AbstractValueModel]:
+        """The widget's model"""
+        return self.__bool_model
+
+    @model.setter
+    def model(self, value: ui.AbstractValueModel):
+        """The widget's model. The widget stops listening to the previous one."""
+        self.__bool_sub = None
+        self.__bool_model = value
+        self.__bool_sub = self.__bool_model.subscribe_value_changed_fn(self._on_value_changed)
+        self._on_value_changed()
 
     def _restore_default(self):
         """Restore the default value."""
         if self.revert_img.enabled:
-            self.__bool_image.checked = self.__default_val
-            self.__bool_image.name = (
-                "checked" if self.__bool_image.checked else "unchecked"
-            )
-            self.revert_img.enabled = False
+            self.__bool_model.set_value(self.__default_val)
 
-    def _on_value_changed(self):
-        """Swap checkbox images and set revert_img to correct state."""
-        self.__bool_image.checked = not self.__bool_image.checked
+    def _on_value_changed(self, *args):
+        """Show the checkbox image of the model value and set revert_img to
+        correct state.
+        """
+        self.__bool_image.checked = self.__bool_model.as_bool
         self.__bool_image.name = (
             "checked" if self.__bool_image.checked else "unchecked"
         )
-        self.revert_img.enabled = self.__default_val != self.__bool_image.checked
+        if self.revert_img:
+            self.revert_img.enabled = self.__default_val != self.__bool_image.checked
 
     def _build_body(self):
         """Main meat of the widget.  Draw the appropriate checkbox image, and
         set up callback.
         """
+        self.__bool_model = self.existing_model or ui.SimpleBoolModel(self.__default_val)
         with ui.HStack():
             with ui.VStack():
                 # Just shift the image down slightly (2 px) so it's aligned the way
                 # all the other rows are.
                 ui.Spacer(height=2)
                 self.__bool_image = ui.Image(
-                    name="checked" if self.__default_val else "unchecked",
+                    name="checked" if self.__bool_model.as_bool else "unchecked",
                     fill_policy=ui.FillPolicy.PRESERVE_ASPECT_FIT,
-                    height=16, width=16, checked=self.__default_val
+                    height=16, width=16, checked=self.__bool_model.as_bool
                 )
             # Let this spacer take up the rest of the Body space.
             ui.Spacer()
 
         self.__bool_image.set_mouse_pressed_fn(
-            lambda x, y, b, m: self._on_value_changed())
+            lambda x, y, b, m: self.__bool_model.set_value(not self.__bool_model.as_bool))
+        self.__bool_sub = self.__bool_model.subscribe_value_changed_fn(self._on_value_changed)
@@ -9,12 +9,13 @@
 __all__ = ["CustomColorWidget"]
 
 from ctypes import Union
-import re
+from functools import lru_cache
 from typing import List, Optional
 
 import omni.ui as ui
 
 from .custom_base_widget import CustomBaseWidget
+from .snapshot import VECTOR
 from .style import BLOCK_HEIGHT
 
 COLOR_PICKER_WIDTH = ui.Percent(35)
@@ -31,6 +32,12 @@ class CustomColorWidget(CustomBaseWidget):
 
     def __init__(self, *args, model=None, **kwargs):
         self.__defaults: List[Union[float, int]] = [a for a in args if a is not None]
+        # The string of the defaults is formatted once, it's compared on every change
+        self.__default_str = ", ".join([self.simplify_str(val) for val in self.__defaults])
+        # The formatted components, only the changed ones are formatted again
+        self.__component_strs: List[str] = []
+        # True while the StringField is set from the color, so it's not parsed back
+        self.__setting_strfield = False
         self.__strfield: Optional[ui.StringField] = None
         self.__colorpicker: Optional[ui.ColorWidget] = None
         self.__color_sub = None
@@ -57,16 +64,28 @@ class CustomColorWidget(CustomBaseWidget):
         """The widget's model"""
         self.__colorpicker.model = value
 
+    def register_models(self, registry, prefix: str):
+        """Add the color model to the ModelRegistry with the "prefix/label" key.
+        The StringField follows it.
+        """
+        registry.register(f"{prefix}/{self.label}", self.model, VECTOR)
+
     @staticmethod
+    @lru_cache(maxsize=1024)
     def simplify_str(val):
-        s = str(round(val, 3))
-        s_clean = re.sub(r'0*$', '', s)  # clean trailing 0's
-        s_clean = re.sub(r'[.]$', '', s_clean)  # clean trailing .
-        s_clean = re.sub(r'^0', '', s_clean)  # clean leading 0
-        return s_clean
+        """Round to 3 digits and drop the trailing zeros and the leading zero,
+        e.g. 0.500 -> ".5" and 1.0 -> "1"
+        """
+        s = str(round(float(val), 3))
+        if "." in s and "e" not in s:
+            s = s.rstrip("0").rstrip(".")
+        if s.startswith("0") and len(s) > 1:
+            s = s[1:]
+        return s
 
     def set_color_stringfield(self, item_model: ui.AbstractItemModel,
-                              children: List[ui.AbstractItem]):
+                              children: List[ui.AbstractItem],
+                              item: Optional[ui.AbstractItem] = None):
         """Take the colorpicker model that has 3 child RGB values,
         convert them to a comma-separated string, and set the StringField value
         to that string.
@@ -74,10 +93,21 @@ class CustomColorWidget(CustomBaseWidget):
         Args:
             item_model: Colorpicker model
             children: child Items of the colorpicker
+            item: The changed child. All of them are formatted when it's None.
         """
-        field_str = ", ".join([self.simplify_str(item_model.get_item_value_model(c).as_float)
-                               for c in children])
-        self.__strfield.model.set_value(field_str)
+        if item is not None and item in children and len(self.__component_strs) == len(children):
+            index = children.index(item)
+            self.__component_strs[index] = self.simplify_str(item_model.get_item_value_model(item).as_float)
+        else:
+            self.__component_strs = [self.simplify_str(item_model.get_item_value_model(c).as_float)
+                                     for c in children]
+        field_str = ", ".join(self.__component_strs)
+        if field_str != self.__strfield.model.as_string:
+            self.__setting_strfield = True
+            try:
+                self.__strfield.model.set_value(field_str)
+            finally:
+                self.__setting_strfield = False
         if self.revert_img:
             self._on_value_changed()
 
@@ -90,6 +120,9 @@ class CustomColorWidget(CustomBaseWidget):
             str_model: SimpleStringModel for the StringField
             children: Child Items of the ui.ColorWidget's model
         """
+        if self.__setting_strfield:
+            # It's the formatted color, there is nothing to parse
+            return
         joined_str = str_model.get_value_as_string()
         for model, comp_str in zip(children, joined_str.split(",")):
             comp_str_clean = comp_str.strip()
@@ -101,15 +134,12 @@ class CustomColorWidget(CustomBaseWidget):
 
     def _on_value_changed(self, *args):
         """Set revert_img to correct state."""
-        default_str = ", ".join([self.simplify_str(val) for val in self.__defaults])
-        cur_str = self.__strfield.model.as_string
-        self.revert_img.enabled = default_str != cur_str
+        self.revert_img.enabled = self.__default_str != self.__strfield.model.as_string
 
     def _restore_default(self):
         """Restore the default values."""
         if self.revert_img.enabled:
-            field_str = ", ".join([self.simplify_str(val) for val in self.__defaults])
-            self.__strfield.model.set_value(field_str)
+            self.__strfield.model.set_value(self.__default_str)
             self.revert_img.enabled = False
 
     def _build_body(self):
@@ -140,8 +170,8 @@ class CustomColorWidget(CustomBaseWidget):
 
             self.__strfield = ui.StringField(width=FIELD_WIDTH, name="attribute_color")
             self.__color_sub = self.__colorpicker.model.subscribe_item_changed_fn(
-                lambda m, _, children=color_model.get_item_children():
-                    self.set_color_stringfield(m, children))
+                lambda m, item, children=color_model.get_item_children():
+                    self.set_color_stringfield(m, children, item))
             self.__strfield_sub = self.__strfield.model.subscribe_value_changed_fn(
                 lambda m, children=color_model.get_item_children():
                     self.set_color_widget(m, children))
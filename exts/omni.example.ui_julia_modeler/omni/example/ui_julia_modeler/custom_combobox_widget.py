@@ -13,6 +13,7 @@ from typing import List, Optional
 import omni.ui as ui
 
 from .custom_base_widget import CustomBaseWidget
+from .snapshot import COMBO
 from .style import BLOCK_HEIGHT
 
 
@@ -47,6 +48,10 @@ class CustomComboboxWidget(CustomBaseWidget):
         """The widget's model"""
         self.__combobox_widget.model = value
 
+    def register_models(self, registry, prefix: str):
+        """Add the model of the widget to the ModelRegistry with the "prefix/label" key"""
+        registry.register(f"{prefix}/{self.label}", self.model, COMBO)
+
     def _on_value_changed(self, *args):
         """Set revert_img to correct state."""
         model = self.__combobox_widget.model
@@ -73,9 +78,10 @@ class CustomComboboxWidget(CustomBaseWidget):
                 ui.Rectangle(name="combobox",
                              height=BLOCK_HEIGHT)
 
-                option_list = list(self.__options)
+                # The model of the shared attribute has its own options
+                option_list = [self.existing_model] if self.existing_model else [0, *self.__options]
                 self.__combobox_widget = ui.ComboBox(
-                    0, *option_list,
+                    *option_list,
                     name="dropdown_menu",
                     # Abnormal height because this "transparent" combobox
                     # has to fit inside the Rectangle behind it
@@ -13,6 +13,7 @@ from typing import List, Optional
 import omni.ui as ui
 
 from .custom_base_widget import CustomBaseWidget
+from .snapshot import FLOAT
 
 
 class CustomMultifieldWidget(CustomBaseWidget):
@@ -47,6 +48,13 @@ class CustomMultifieldWidget(CustomBaseWidget):
         """The widget's model"""
         self.__multifields[index].model = value
 
+    def register_models(self, registry, prefix: str):
+        """Add the model of each field to the ModelRegistry with the
+        "prefix/label/sublabel" key
+        """
+        for sublabel, field in zip(self.__field_labels, self.__multifields):
+            registry.register(f"{prefix}/{self.label}/{sublabel}", field.model, FLOAT)
+
     def _restore_default(self):
         """Restore the default values."""
         if self.revert_img.enabled:
@@ -55,20 +63,26 @@ class CustomMultifieldWidget(CustomBaseWidget):
                 model.as_float = self.__default_vals[i]
             self.revert_img.enabled = False
 
-    def _on_value_changed(self, val_model: ui.SimpleFloatModel, index: int):
+    def _on_value_changed(self, *args):
         """Set revert_img to correct state."""
-        val = val_model.as_float
-        self.revert_img.enabled = self.__default_vals[index] != val
+        self.revert_img.enabled = any(
+            field.model.as_float != default
+            for field, default in zip(self.__multifields, self.__default_vals))
 
     def _build_body(self):
         """Main meat of the widget.  Draw the multiple Fields with their
         respective labels, and set up callbacks to keep them updated.
         """
+        # The item model of the shared attribute has a value model per field
+        items = self.existing_model.get_item_children() if self.existing_model else []
         with ui.HStack():
             for i, (label, val) in enumerate(zip(self.__field_labels, self.__default_vals)):
                 with ui.HStack(spacing=3):
                     ui.Label(label, name="multi_attr_label", width=0)
-                    model = ui.SimpleFloatModel(val)
+                    if items:
+                        model = self.existing_model.get_item_value_model(items[i])
+                    else:
+                        model = ui.SimpleFloatModel(val)
                     # TODO: Hopefully fix height after Field padding bug is merged!
                     self.__multifields.append(
                         ui.FloatField(model=model, name="multi_attr_field"))
@@ -76,5 +90,5 @@ class CustomMultifieldWidget(CustomBaseWidget):
                     # Only put space between fields and not after the last one
                     ui.Spacer(width=15)
 
-        for i, f in enumerate(self.__multifields):
-            f.model.add_value_changed_fn(lambda v: self._on_value_changed(v, i))
+        for f in self.__multifields:
+            f.model.add_value_changed_fn(self._on_value_changed)
@@ -12,6 +12,7 @@ from typing import Callable, Optional
 
 import omni.ui as ui
 
+from .snapshot import STRING
 from .style import ATTR_LABEL_WIDTH, BLOCK_HEIGHT
 
 
@@ -24,8 +25,11 @@ class CustomPathButtonWidget:
                  label: str,
                  path: str,
                  btn_label: str,
-                 btn_callback: Callable):
+                 btn_callback: Callable,
+                 label_width: float = ATTR_LABEL_WIDTH):
         self.__attr_label = label
+        self.__label_width = label_width
+        self.__label: Optional[ui.Label] = None
         self.__pathfield: ui.StringField = None
         self.__path = path
         self.__btn_label = btn_label
@@ -37,6 +41,7 @@ class CustomPathButtonWidget:
             self._build_fn()
 
     def destroy(self):
+        self.__label = None
         self.__pathfield = None
         self.__btn = None
         self.__callback = None
@@ -53,16 +58,32 @@ class CustomPathButtonWidget:
         """The widget's model"""
         self.__pathfield.model = value
 
+    @property
+    def label_width(self):
+        """The width of the attribute label"""
+        return self.__label_width
+
+    @label_width.setter
+    def label_width(self, value):
+        """The width of the attribute label. It's changed without rebuilding."""
+        self.__label_width = value
+        if self.__label:
+            self.__label.width = ui.Pixel(value)
+
+    def register_models(self, registry, prefix: str):
+        """Add the path model to the ModelRegistry with the "prefix/label" key"""
+        registry.register(f"{prefix}/{self.__attr_label}", self.model, STRING)
+
     def get_path(self):
         return self.model.as_string
 
     def _build_fn(self):
         """Draw all of the widget parts and set up callbacks."""
         with ui.HStack():
-            ui.Label(
+            self.__label = ui.Label(
                 self.__attr_label,
                 name="attribute_name",
-                width=ATTR_LABEL_WIDTH
+                width=self.__label_width
             )
             self.__pathfield = ui.StringField(
                 name="path_field",
@@ -77,5 +98,6 @@ class CustomPathButtonWidget:
                 name="tool_button",
                 height=BLOCK_HEIGHT,
                 width=ui.Fraction(1),
-                clicked_fn=lambda path=self.get_path(): self.__callback(path),
+                # The path is read when it's clicked, so the edited path is used
+                clicked_fn=lambda: self.__callback(self.get_path()),
             )
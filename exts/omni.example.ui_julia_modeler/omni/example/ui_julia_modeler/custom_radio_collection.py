@@ -12,6 +12,7 @@ from typing import List, Optional
 
 import omni.ui as ui
 
+from .snapshot import INT
 from .style import ATTR_LABEL_WIDTH
 
 SPACING = 5
@@ -33,13 +34,17 @@ class CustomRadioCollection:
         self.__group_name = group_name
         self.__labels = labels
         self.__default_val = default_value
+        self.__label_width = kwargs.pop("label_width", ATTR_LABEL_WIDTH)
+        # The label widgets that follow label_width
+        self.__label_widgets = []
         self.__images = []
-        self.__selection_model = ui.SimpleIntModel(default_value)
+        self.__selection_model = model or ui.SimpleIntModel(default_value)
         self.__frame = ui.Frame()
         with self.__frame:
             self._build_fn()
 
     def destroy(self):
+        self.__label_widgets = []
         self.__images = []
         self.__selection_model = None
         self.__frame = None
@@ -53,7 +58,23 @@ class CustomRadioCollection:
     @model.setter
     def model(self, value: int):
         """The widget's model"""
-        self.__selection_model.set(value)
+        self.__selection_model.set_value(value)
+
+    @property
+    def label_width(self):
+        """The width of the labels"""
+        return self.__label_width
+
+    @label_width.setter
+    def label_width(self, value):
+        """The width of the labels. It's changed without rebuilding."""
+        self.__label_width = value
+        for label in self.__label_widgets:
+            label.width = ui.Pixel(value)
+
+    def register_models(self, registry, prefix: str):
+        """Add the selection model to the ModelRegistry with the "prefix/group_name" key"""
+        registry.register(f"{prefix}/{self.__group_name}", self.__selection_model, INT)
 
     def __getattr__(self, attr):
         """
@@ -63,8 +84,11 @@ class CustomRadioCollection:
         return getattr(self.__frame, attr)
 
     def _on_value_changed(self, index: int = 0):
-        """Set states of all radio buttons so only one is On."""
+        """Select the radio button."""
         self.__selection_model.set_value(index)
+
+    def _update_images(self, index: int):
+        """Set states of all radio buttons so only one is On."""
         for i, img in enumerate(self.__images):
             img.checked = i == index
             img.name = "radio_on" if img.checked else "radio_off"
@@ -75,22 +99,22 @@ class CustomRadioCollection:
         """
         with ui.VStack(spacing=SPACING):
             ui.Spacer(height=2)
-            ui.Label(self.__group_name.upper(), name="radio_group_name",
-                     width=ATTR_LABEL_WIDTH)
+            self.__label_widgets.append(ui.Label(self.__group_name.upper(), name="radio_group_name",
+                                                 width=self.__label_width))
 
             for i, label in enumerate(self.__labels):
                 with ui.HStack():
-                    ui.Label(label, name="attribute_name",
-                             width=ATTR_LABEL_WIDTH)
+                    self.__label_widgets.append(ui.Label(label, name="attribute_name",
+                                                         width=self.__label_width))
 
                     with ui.HStack():
                         with ui.VStack():
                             ui.Spacer(height=2)
                             self.__images.append(
                                 ui.Image(
-                                    name=("radio_on" if self.__default_val == i else "radio_off"),
+                                    name=("radio_on" if self.__selection_model.as_int == i else "radio_off"),
                                     fill_policy=ui.FillPolicy.PRESERVE_ASPECT_FIT,
-                                    height=16, width=16, checked=self.__default_val
+                                    height=16, width=16, checked=self.__selection_model.as_int == i
                                 )
                             )
                         ui.Spacer()
@@ -100,3 +124,5 @@ class CustomRadioCollection:
         for i in range(len(self.__labels)):
             self.__images[i].set_mouse_pressed_fn(
                 lambda x, y, b, m, i=i: self._on_value_changed(i))
+        # The buttons follow the model, also when it's set from outside
+        self.__selection_model.add_value_changed_fn(lambda m: self._update_images(m.as_int))
@@ -15,6 +15,8 @@ from omni.ui import color as cl
 from omni.ui import constant as fl
 
 from .custom_base_widget import CustomBaseWidget
+from .snapshot import FLOAT, INT
+from .style import get_slider_texture_provider
 
 NUM_FIELD_WIDTH = 50
 SLIDER_WIDTH = ui.Percent(100)
@@ -64,6 +66,10 @@ class CustomSliderWidget(CustomBaseWidget):
         self.__slider.model = value
         self.__numberfield.model = value
 
+    def register_models(self, registry, prefix: str):
+        """Add the model of the widget to the ModelRegistry with the "prefix/label" key"""
+        registry.register(f"{prefix}/{self.label}", self.model, FLOAT if self.__num_type == "float" else INT)
+
     def _on_value_changed(self, *args):
         """Set revert_img to correct state."""
         if self.__num_type == "float":
@@ -109,18 +115,17 @@ class CustomSliderWidget(CustomBaseWidget):
                     # bg be fully transparent, and fg be gray and partially transparent
                     with ui.Frame(width=SLIDER_WIDTH, height=FIELD_HEIGHT,
                                   horizontal_clipping=True):
-                        # Spacing is negative because "tileable" texture wasn't
-                        # perfectly tileable, so that adds some overlap to line up better.
-                        with ui.HStack(spacing=-12):
-                            for i in range(50):  # tiling the texture
-                                ui.Image(name=TEXTURE_NAME,
-                                         fill_policy=ui.FillPolicy.PRESERVE_ASPECT_CROP,
-                                         width=50,)
+                        # The shared texture is wider than any slider, it's cropped
+                        # to the slider width.
+                        ui.ImageWithProvider(get_slider_texture_provider(), name=TEXTURE_NAME,
+                                             fill_policy=ui.IwpFillPolicy.IWP_PRESERVE_ASPECT_CROP)
 
                     slider_cls = (
                         ui.FloatSlider if self.__num_type == "float" else ui.IntSlider
                     )
+                    # Without the model the slider makes its own
                     self.__slider = slider_cls(
+                        self.existing_model,
                         height=FIELD_HEIGHT,
                         min=self.__min, max=self.__max, name="attr_slider"
                     )
@@ -130,7 +135,8 @@ class CustomSliderWidget(CustomBaseWidget):
 
             with ui.VStack(width=ui.Fraction(1)):
                 model = self.__slider.model
-                model.set_value(self.__default_val)
+                if not self.existing_model:
+                    model.set_value(self.__default_val)
                 field_cls = (
                     ui.FloatField if self.__num_type == "float" else ui.IntField
                 )
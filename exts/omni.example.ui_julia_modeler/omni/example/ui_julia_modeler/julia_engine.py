@@ -0,0 +1,203 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["JuliaParameters", "JuliaEngine", "grid_axis"]
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+import numpy as np
+
+# The points are iterated until |q| is bigger than this
+ESCAPE_RADIUS = 4.0
+# The half size of the cube the grids are sampled in
+BOUND = 2.0
+# The grid resolution is this times Precision
+RESOLUTION_PER_PRECISION = 32
+# The points evaluated at once, the arrays of one batch stay in the CPU cache
+DEFAULT_BATCH_SIZE = 1 << 16
+
+
+@dataclass(frozen=True)
+class JuliaParameters:
+    """
+    The values of the "Calculations" and "Parameters" groups of the window.
+    The fractal is q = q^2 + c with the quaternion c = (real, i, j, k). The
+    sample point (x, y, z) is the quaternion (x, y, z cos(theta), z sin(theta)),
+    so theta rotates the 3D slice of the 4D set.
+    """
+
+    precision: int = 6
+    iterations: int = 10
+    real: float = 0.75
+    i: float = 0.65
+    j: float = 0.25
+    k: float = 0.55
+    theta: float = 1.25
+
+    @classmethod
+    def from_store(cls, values) -> "JuliaParameters":
+        """
+        The parameters from the "Group/Label" values, like the AttributeStore
+        of the window or a dict. The missing values are the defaults.
+        """
+
+        def get(name, default):
+            return values.get(name) if name in values else default
+
+        defaults = cls()
+        return cls(
+            precision=int(get("Calculations/Precision", defaults.precision)),
+            iterations=int(get("Calculations/Iterations", defaults.iterations)),
+            # The real part of c is the slider labeled "Iterations"
+            real=float(get("Parameters/Iterations", defaults.real)),
+            i=float(get("Parameters/i", defaults.i)),
+            j=float(get("Parameters/j", defaults.j)),
+            k=float(get("Parameters/k", defaults.k)),
+            theta=float(get("Parameters/Theta", defaults.theta)),
+        )
+
+    @property
+    def c(self) -> Tuple[float, float, float, float]:
+        """The quaternion constant"""
+        return (self.real, self.i, self.j, self.k)
+
+    @property
+    def max_iterations(self) -> int:
+        """The iterations, at least one"""
+        return max(self.iterations, 1)
+
+    @property
+    def grid_resolution(self) -> int:
+        """The number of the grid samples along each axis"""
+        return RESOLUTION_PER_PRECISION * max(self.precision, 1)
+
+
+def grid_axis(resolution: int, bound: float = BOUND) -> np.ndarray:
+    """The coordinates of the grid samples along one axis, the centers of the cells"""
+    step = 2.0 * bound / resolution
+    return -bound + step * (np.arange(resolution) + 0.5)
+
+
+class JuliaEngine:
+    """
+    Evaluates the quaternion Julia set over the arrays of 3D points with
+    NumPy. The points are processed in batches, and the escaped points are
+    dropped from the batch each iteration, so the work shrinks as they escape.
+    It doesn't use omni.ui, so it can run without the window.
+    """
+
+    def __init__(self, parameters: Optional[JuliaParameters] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.__parameters = parameters or JuliaParameters()
+        self.__batch_size = max(int(batch_size), 1)
+
+    @property
+    def parameters(self) -> JuliaParameters:
+        return self.__parameters
+
+    @parameters.setter
+    def parameters(self, value: JuliaParameters):
+        self.__parameters = value
+
+    @property
+    def batch_size(self) -> int:
+        return self.__batch_size
+
+    def evaluate(self, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Evaluate the (N, 3) points. Returns the escape iteration of each point,
+        which is `max_iterations` for the points that don't escape, and the
+        distance estimate, which is 0 inside the set.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        count = len(points)
+        escape = np.empty(count, dtype=np.int32)
+        distance = np.empty(count, dtype=np.float64)
+        for start in range(0, count, self.__batch_size):
+            end = min(start + self.__batch_size, count)
+            self.__evaluate_batch(points[start:end], escape[start:end], distance[start:end])
+        return escape, distance
+
+    def escape_iterations(self, points: np.ndarray) -> np.ndarray:
+        """The escape iteration of the (N, 3) points"""
+        return self.evaluate(points)[0]
+
+    def distance(self, points: np.ndarray) -> np.ndarray:
+        """The distance estimate of the (N, 3) points"""
+        return self.evaluate(points)[1]
+
+    def distance_field(self, resolution: Optional[int] = None, bound: float = BOUND) -> np.ndarray:
+        """
+        The distance estimate sampled on the (resolution, resolution, resolution)
+        grid in the cube [-bound, bound], indexed [z, y, x]. The resolution is
+        `grid_resolution` of the parameters when it's not given. The points are
+        generated slab by slab, so the full grid of points is never allocated.
+        """
+        resolution = resolution or self.__parameters.grid_resolution
+        axis = grid_axis(resolution, bound)
+        field = np.empty((resolution, resolution, resolution), dtype=np.float32)
+
+        # The slab of z layers that fits in one batch
+        layers = max(self.__batch_size // (resolution * resolution), 1)
+        y, x = np.meshgrid(axis, axis, indexing="ij")
+        for start in range(0, resolution, layers):
+            end = min(start + layers, resolution)
+            z = np.repeat(axis[start:end], resolution * resolution)
+            points = np.column_stack((np.tile(x.ravel(), end - start), np.tile(y.ravel(), end - start), z))
+            field[start:end] = self.distance(points).reshape(end - start, resolution, resolution)
+        return field
+
+    def __evaluate_batch(self, points: np.ndarray, escape_out: np.ndarray, distance_out: np.ndarray):
+        """Iterate one batch and write the results to the output slices"""
+        parameters = self.__parameters
+        c0, c1, c2, c3 = parameters.c
+        cos_theta = np.cos(parameters.theta)
+        sin_theta = np.sin(parameters.theta)
+        escape_squared = ESCAPE_RADIUS * ESCAPE_RADIUS
+
+        # The components of q, its derivative, and the index of the points in the batch
+        a = points[:, 0].copy()
+        b = points[:, 1].copy()
+        c = points[:, 2] * cos_theta
+        d = points[:, 2] * sin_theta
+        derivative = np.ones(len(points))
+        index = np.arange(len(points))
+        radius_squared = a * a + b * b + c * c + d * d
+
+        for iteration in range(1, parameters.max_iterations + 1):
+            # |q'| = 2 |q| |q'|, q = q^2 + c
+            derivative *= 2.0 * np.sqrt(radius_squared)
+            two_a = 2.0 * a
+            a, b, c, d = a * a - b * b - c * c - d * d + c0, two_a * b + c1, two_a * c + c2, two_a * d + c3
+
+            radius_squared = a * a + b * b + c * c + d * d
+            escaped = radius_squared > escape_squared
+            if escaped.any():
+                done = index[escaped]
+                escape_out[done] = iteration
+                distance_out[done] = self.__estimate(radius_squared[escaped], derivative[escaped])
+                # Only the points that are still inside are iterated further
+                inside = ~escaped
+                a, b, c, d = a[inside], b[inside], c[inside], d[inside]
+                radius_squared = radius_squared[inside]
+                derivative = derivative[inside]
+                index = index[inside]
+                if not len(index):
+                    return
+
+        # The points that don't escape are in the set. The estimate of |q| > 1
+        # would be positive, but it isn't the distance to the set.
+        escape_out[index] = parameters.max_iterations
+        distance_out[index] = 0.0
+
+    @staticmethod
+    def __estimate(radius_squared: np.ndarray, derivative: np.ndarray) -> np.ndarray:
+        """The distance estimate 0.5 |q| log|q| / |q'| of the escaped points"""
+        radius = np.sqrt(radius_squared)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            estimate = 0.5 * radius * np.log(radius) / derivative
+        return np.nan_to_num(np.maximum(estimate, 0.0), nan=0.0, posinf=0.0)
@@ -0,0 +1,272 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = [
+    "GEOMETRY", "CAMERA", "SURFACE", "AMBIENT_SAMPLES", "AMBIENT_OCCLUSION", "LIGHTING", "COMPOSITING",
+    "STAGE_PARAMETERS", "TracedSurface", "AmbientSampler", "AmbientOcclusion", "Lighting", "Compositing",
+    "create_julia_pipeline", "ambient_distances", "sample_occlusion", "ambient_visibility",
+]
+
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Tuple
+import numpy as np
+
+from .julia_engine import BOUND, JuliaEngine, JuliaParameters
+from .pipeline import Pipeline
+from .result_cache import ResultCache
+from .sphere_tracer import Camera, SphereTracer, TraceResult, rotation_matrix
+
+GEOMETRY = "geometry"
+CAMERA = "camera"
+SURFACE = "surface"
+AMBIENT_SAMPLES = "ambient_samples"
+AMBIENT_OCCLUSION = "ambient_occlusion"
+LIGHTING = "lighting"
+COMPOSITING = "compositing"
+
+# The parameters each stage depends on, with the defaults of the window
+STAGE_PARAMETERS = {
+    GEOMETRY: {
+        "Calculations/Precision": 6,
+        "Calculations/Iterations": 10,
+        "Parameters/Iterations": 0.75,
+        "Parameters/i": 0.65,
+        "Parameters/j": 0.25,
+        "Parameters/k": 0.55,
+        "Parameters/Theta": 1.25,
+    },
+    CAMERA: {
+        "Scene/Field of View": 60,
+        "Scene/Orientation": (0.0, 0.0, 0.0),
+        "Scene/Camera Distance": 0.1,
+    },
+    SURFACE: {},
+    AMBIENT_SAMPLES: {
+        "Scene/Ambient Distance": (0.0, 200.0),
+    },
+    AMBIENT_OCCLUSION: {
+        "Scene/Ambient Occlusion": True,
+        "Scene/Ambient Falloff": 0,
+    },
+    LIGHTING: {
+        "Light 1/Orientation": (0.0, 0.0, 0.0),
+        "Light 1/Intensity": 1.75,
+        "Light 1/Color": (1.0, 0.875, 0.5),
+        "Light 1/Shadow": True,
+        "Light 1/Shadow Softness": 0.1,
+    },
+    COMPOSITING: {
+        "Scene/Background Color": (0.6, 0.62, 0.9),
+    },
+}
+
+# The Ambient Distance values are in thousandths of the scene unit
+AMBIENT_DISTANCE_SCALE = 0.001
+AMBIENT_SAMPLE_COUNT = 5
+# The weights of the samples for each "Scene/Ambient Falloff": Linear, Quadratic, Cubic. The near samples occlude more.
+AMBIENT_WEIGHTS = (1.0 - np.arange(AMBIENT_SAMPLE_COUNT) / AMBIENT_SAMPLE_COUNT) ** np.arange(1, 4)[:, None]
+AMBIENT_WEIGHTS /= AMBIENT_WEIGHTS.sum(axis=1, keepdims=True)
+# The points whose samples are evaluated at once
+AMBIENT_BATCH_SIZE = 1 << 16
+# The ambient light that is scaled by the occlusion
+AMBIENT_LIGHT = 0.25
+
+Color = Tuple[float, float, float]
+
+
+def ambient_distances(ambient_distance: Sequence[float], step: float) -> np.ndarray:
+    """The AMBIENT_SAMPLE_COUNT distances of the "Scene/Ambient Distance" range, at least the step apart from 0"""
+    near, far = np.asarray(ambient_distance, dtype=np.float64) * AMBIENT_DISTANCE_SCALE
+    far = max(far, near, step)
+    return np.linspace(max(near, step), far, AMBIENT_SAMPLE_COUNT)
+
+
+def sample_occlusion(
+    distance_fn: Callable[[np.ndarray], np.ndarray],
+    points: np.ndarray,
+    normals: np.ndarray,
+    distances: np.ndarray,
+    batch_size: int = AMBIENT_BATCH_SIZE,
+) -> np.ndarray:
+    """
+    The (len(distances), N) occlusion of the (N, 3) points, 0..1, by the
+    distance estimate at each distance along their normals. All the samples
+    of the batch of points are evaluated with one call of distance_fn.
+    """
+    occlusion = np.empty((len(distances), len(points)), dtype=np.float32)
+    for start in range(0, len(points), batch_size):
+        end = min(start + batch_size, len(points))
+        samples = points[None, start:end] + distances[:, None, None] * normals[None, start:end]
+        sampled = distance_fn(samples.reshape(-1, 3)).reshape(len(distances), end - start)
+        occlusion[:, start:end] = np.clip((distances[:, None] - sampled) / distances[:, None], 0.0, 1.0)
+    return occlusion
+
+
+def ambient_visibility(occlusion: np.ndarray, falloff: int) -> np.ndarray:
+    """The ambient visibility of the occlusion samples with the weights of the falloff, 1 is not occluded"""
+    weights = AMBIENT_WEIGHTS[int(np.clip(falloff, 0, len(AMBIENT_WEIGHTS) - 1))]
+    return (1.0 - weights @ occlusion).astype(np.float32)
+
+
+@dataclass(frozen=True)
+class TracedSurface:
+    """The value of the SURFACE stage, the fractal seen from the camera. The renderers trace their pixels with it."""
+
+    parameters: JuliaParameters
+    camera: Camera
+
+    def trace(self, u: np.ndarray, v: np.ndarray) -> TraceResult:
+        """Trace the pixels of the image coordinates, -1..1 along the height"""
+        eye, directions = self.camera.rays(u, v)
+        # The pixels are evenly spaced, the coarse passes stop the rays earlier
+        spacing = max(np.ptp(u) / max(u.shape[1] - 1, 1), np.ptp(v) / max(u.shape[0] - 1, 1))
+        return SphereTracer(self.parameters).trace(eye, directions, spacing * self.camera.tan_half_fov)
+
+    def trace_image(self, width: int, height: int) -> TraceResult:
+        """Trace all the pixels of the image at once"""
+        return SphereTracer(self.parameters).trace_image(self.camera, width, height)
+
+
+@dataclass(frozen=True)
+class AmbientSampler:
+    """The value of the AMBIENT_SAMPLES stage, samples the occlusion of the traced hits"""
+
+    parameters: JuliaParameters
+    # The Min and Max in thousandths of the scene unit
+    ambient_distance: Tuple[float, float]
+
+    def sample(self, trace: TraceResult) -> np.ndarray:
+        """The (AMBIENT_SAMPLE_COUNT, hits) occlusion samples of the hits of the trace"""
+        hits = np.flatnonzero(trace.hit)
+        # The distances start at the voxel of the exported grid
+        step = 2.0 * BOUND / self.parameters.grid_resolution
+        return sample_occlusion(
+            JuliaEngine(self.parameters).distance,
+            trace.points[hits].astype(np.float64),
+            trace.normals[hits].astype(np.float64),
+            ambient_distances(self.ambient_distance, step),
+        )
+
+
+@dataclass(frozen=True)
+class AmbientOcclusion:
+    """The value of the AMBIENT_OCCLUSION stage, weights the occlusion samples"""
+
+    enabled: bool
+    # Linear, Quadratic or Cubic
+    falloff: int
+
+    def visibility(self, occlusion: np.ndarray) -> np.ndarray:
+        """The (hits,) ambient visibility of the occlusion samples, 1 is not occluded"""
+        if not self.enabled:
+            return np.ones(occlusion.shape[1], dtype=np.float32)
+        return ambient_visibility(occlusion, self.falloff)
+
+
+@dataclass(frozen=True)
+class Lighting:
+    """The value of the LIGHTING stage, Light 1"""
+
+    orientation: Tuple[float, float, float]
+    intensity: float
+    color: Color
+    shadow: bool
+    shadow_softness: float
+
+    @property
+    def to_light(self) -> np.ndarray:
+        """The unit direction to the light, it comes from the front when Orientation is 0"""
+        return rotation_matrix(self.orientation) @ np.array([0.0, 0.0, 1.0])
+
+    @property
+    def radiance(self) -> np.ndarray:
+        """The RGB light of the intensity"""
+        return self.intensity * np.asarray(self.color, dtype=np.float64)
+
+
+@dataclass(frozen=True)
+class Compositing:
+    """The value of the COMPOSITING stage, shades the traced pixels with the light and the ambient light"""
+
+    background_color: Color
+    ambient: AmbientOcclusion
+    lighting: Lighting
+
+    def shade(self, trace: TraceResult, occlusion: np.ndarray) -> np.ndarray:
+        """The (N, 3) RGB of the pixels of the trace, with its occlusion samples, the background where it misses"""
+        rgb = np.empty((len(trace.hit), 3))
+        rgb[:] = self.background_color
+        hits = np.flatnonzero(trace.hit)
+        if len(hits):
+            diffuse = np.clip(trace.normals[hits] @ self.lighting.to_light, 0.0, None)
+            ambient = self.ambient.visibility(occlusion)
+            rgb[hits] = diffuse[:, None] * self.lighting.radiance + AMBIENT_LIGHT * ambient[:, None]
+        return rgb
+
+
+def _vector(value) -> tuple:
+    return tuple(float(component) for component in value)
+
+
+def _geometry(parameters) -> JuliaParameters:
+    return JuliaParameters.from_store(parameters)
+
+
+def _camera(parameters) -> Camera:
+    return Camera.from_store(parameters)
+
+
+def _surface(parameters, geometry: JuliaParameters, camera: Camera) -> TracedSurface:
+    return TracedSurface(geometry, camera)
+
+
+def _ambient_samples(parameters, surface: TracedSurface) -> AmbientSampler:
+    return AmbientSampler(surface.parameters, _vector(parameters["Scene/Ambient Distance"]))
+
+
+def _ambient_occlusion(parameters) -> AmbientOcclusion:
+    return AmbientOcclusion(bool(parameters["Scene/Ambient Occlusion"]), int(parameters["Scene/Ambient Falloff"]))
+
+
+def _lighting(parameters) -> Lighting:
+    return Lighting(
+        orientation=_vector(parameters["Light 1/Orientation"]),
+        intensity=float(parameters["Light 1/Intensity"]),
+        color=_vector(parameters["Light 1/Color"]),
+        shadow=bool(parameters["Light 1/Shadow"]),
+        shadow_softness=float(parameters["Light 1/Shadow Softness"]),
+    )
+
+
+def _compositing(parameters, ambient: AmbientOcclusion, lighting: Lighting) -> Compositing:
+    return Compositing(_vector(parameters["Scene/Background Color"]), ambient, lighting)
+
+
+def create_julia_pipeline(values=None, cache: Optional[ResultCache] = None) -> Pipeline:
+    """
+    The stages of the modeler: the fractal geometry and the camera, the
+    surface traced from the camera, the occlusion samples of the surface
+    within Ambient Distance, the weights of the ambient occlusion, the light,
+    and the compositing of them. The values of the stages are small, the
+    renderers trace and sample their pixels with them and keep the results
+    by the content key of the stage. So changing the light or the colors
+    only composites the pixels again, changing the ambient falloff doesn't
+    sample the occlusion again, and changing the camera doesn't evaluate
+    the fractal geometry.
+    """
+    pipeline = Pipeline(values, cache)
+    pipeline.add_stage(GEOMETRY, _geometry, parameters=STAGE_PARAMETERS[GEOMETRY])
+    pipeline.add_stage(CAMERA, _camera, parameters=STAGE_PARAMETERS[CAMERA])
+    pipeline.add_stage(SURFACE, _surface, [GEOMETRY, CAMERA], STAGE_PARAMETERS[SURFACE])
+    pipeline.add_stage(AMBIENT_SAMPLES, _ambient_samples, [SURFACE], STAGE_PARAMETERS[AMBIENT_SAMPLES])
+    pipeline.add_stage(AMBIENT_OCCLUSION, _ambient_occlusion, parameters=STAGE_PARAMETERS[AMBIENT_OCCLUSION])
+    pipeline.add_stage(LIGHTING, _lighting, parameters=STAGE_PARAMETERS[LIGHTING])
+    pipeline.add_stage(
+        COMPOSITING, _compositing, [AMBIENT_OCCLUSION, LIGHTING], STAGE_PARAMETERS[COMPOSITING]
+    )
+    return pipeline
@@ -0,0 +1,475 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["ExportResult", "export_mesh", "extract_chunk", "FORMATS"]
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+from .julia_engine import BOUND, JuliaEngine, JuliaParameters
+from .sparse_field import SparseDistanceField
+
+# The cells along each axis of one chunk
+CHUNK_SIZE = 32
+# The surface is where the distance estimate is this part of the cell size
+ISO_LEVEL = 0.5
+# Seconds to wait for the first child process to start and import this module
+PROCESS_START_TIMEOUT = 30.0
+# The formats by the extension of the path. The .usd files are written as text.
+FORMATS = {".obj": "obj", ".ply": "ply", ".usd": "usda", ".usda": "usda"}
+
+# The cyclic axes (a, b, c) of the edges along a, in the (z, y, x) order of the arrays
+_EDGE_AXES = ((2, 1, 0), (1, 0, 2), (0, 2, 1))
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    path: str
+    vertices: int
+    faces: int
+    # True if the chunks were extracted in the process pool, False for the threads
+    processes: bool
+
+
+def extract_chunk(
+    parameters: JuliaParameters,
+    resolution: int,
+    bound: float,
+    origin: Tuple[int, int, int],
+    shape: Tuple[int, int, int],
+    samples: Optional[np.ndarray] = None,
+):
+    """
+    Extract the surface nets of the chunk of cells. It's the task of the pool,
+    so it's a plain function of picklable arguments.
+
+    Args:
+        parameters: The fractal
+        resolution: The samples along each axis of the whole grid
+        bound: The half size of the cube
+        origin: The (z, y, x) of the first cell of the chunk
+        shape: The (z, y, x) number of the cells of the chunk
+        samples: The distance at the corners of the cells, the upper corners
+            included. It's evaluated when it's not given.
+
+    Returns:
+        The sorted global ids of the cells of the chunk that have a vertex,
+        the (N, 3) xyz positions of those vertices, and the (M, 4) global cell
+        ids of the quads of the edges that start in the chunk.
+    """
+    cells = resolution - 1
+    step = 2.0 * bound / cells
+
+    # The samples of the corners of the cells, the upper corners included
+    axes = [origin[i] + np.arange(shape[i] + 1) for i in range(3)]
+    if samples is None:
+        z, y, x = np.meshgrid(*[-bound + step * axis for axis in axes], indexing="ij")
+        points = np.column_stack((x.ravel(), y.ravel(), z.ravel()))
+        samples = JuliaEngine(parameters).distance(points).reshape(z.shape)
+    field = samples - ISO_LEVEL * step
+    inside = field < 0.0
+
+    nz, ny, nx = shape
+    position_sum = np.zeros((nz, ny, nx, 3))
+    crossings = np.zeros((nz, ny, nx), dtype=np.int32)
+    quads = []
+
+    for axis, (a, b, c) in enumerate(_EDGE_AXES):
+        # The edges along the axis, from each sample to the next one
+        lower = [slice(None)] * 3
+        upper = [slice(None)] * 3
+        lower[a] = slice(0, -1)
+        upper[a] = slice(1, None)
+        f0 = field[tuple(lower)]
+        f1 = field[tuple(upper)]
+        crossing = inside[tuple(lower)] != inside[tuple(upper)]
+
+        # The position of the crossing in the global sample coordinates (z, y, x)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where(crossing, f0 / (f0 - f1), 0.0)
+        edge_position = np.zeros(crossing.shape + (3,))
+        grid = np.meshgrid(*[axes[i][: crossing.shape[i]] for i in range(3)], indexing="ij")
+        for i in range(3):
+            edge_position[..., i] = grid[i] + (t if i == a else 0.0)
+        edge_position[~crossing] = 0.0
+
+        # Each edge is shared by the 4 cells around it
+        for db in (0, 1):
+            for dc in (0, 1):
+                window = [slice(None)] * 3
+                window[a] = slice(0, shape[a])
+                window[b] = slice(db, db + shape[b])
+                window[c] = slice(dc, dc + shape[c])
+                position_sum += edge_position[tuple(window)]
+                crossings += crossing[tuple(window)]
+
+        # The quads of the edges that start in the chunk and are not on the border of the grid
+        owned = [slice(0, shape[i]) for i in range(3)]
+        starts = np.nonzero(crossing[tuple(owned)])
+        start = [starts[i] + origin[i] for i in range(3)]
+        keep = (start[b] > 0) & (start[c] > 0)
+        start = [coordinate[keep] for coordinate in start]
+        flip = ~inside[tuple(owned)][tuple(s[keep] for s in starts)]
+
+        corners = []
+        for db, dc in ((1, 1), (0, 1), (0, 0), (1, 0)):
+            cell = list(start)
+            cell[b] = cell[b] - db
+            cell[c] = cell[c] - dc
+            corners.append((cell[0] * cells + cell[1]) * cells + cell[2])
+        quad = np.column_stack(corners)
+        # The normal points from inside to outside
+        quad[flip] = quad[flip][:, ::-1]
+        quads.append(quad)
+
+    has_vertex = crossings > 0
+    local = np.nonzero(has_vertex)
+    ids = ((local[0] + origin[0]) * cells + local[1] + origin[1]) * cells + local[2] + origin[2]
+    zyx = position_sum[has_vertex] / crossings[has_vertex][:, None]
+    vertices = (-bound + step * zyx[:, ::-1]).astype(np.float32)
+    return ids, vertices, np.concatenate(quads).astype(np.int64)
+
+
+class _ObjWriter:
+    """The vertices and the faces of each chunk are written right away"""
+
+    def __init__(self, path: str):
+        self.__file = open(path, "w")
+        self.__file.write("# Julia quaternion\n")
+
+    def write(self, vertices: np.ndarray, faces: np.ndarray):
+        np.savetxt(self.__file, vertices, fmt="v %.6f %.6f %.6f")
+        np.savetxt(self.__file, faces + 1, fmt="f %d %d %d %d")
+
+    def close(self, vertex_count: int, face_count: int):
+        self.__file.close()
+
+
+class _PlyWriter:
+    """The binary PLY. The counts are in the header, so the data is spooled to the temporary files."""
+
+    _FACE = np.dtype([("count", "u1"), ("indices", "<i4", (4,))])
+
+    def __init__(self, path: str):
+        self.__path = path
+        self.__vertices = tempfile.TemporaryFile()
+        self.__faces = tempfile.TemporaryFile()
+
+    def write(self, vertices: np.ndarray, faces: np.ndarray):
+        self.__vertices.write(vertices.astype("<f4").tobytes())
+        records = np.empty(len(faces), dtype=self._FACE)
+        records["count"] = 4
+        records["indices"] = faces
+        self.__faces.write(records.tobytes())
+
+    def close(self, vertex_count: int, face_count: int):
+        with open(self.__path, "wb") as f:
+            f.write(
+                (
+                    "ply\nformat binary_little_endian 1.0\ncomment Julia quaternion\n"
+                    f"element vertex {vertex_count}\nproperty float x\nproperty float y\nproperty float z\n"
+                    f"element face {face_count}\nproperty list uchar int vertex_indices\nend_header\n"
+                ).encode("ascii")
+            )
+            for spool in (self.__vertices, self.__faces):
+                spool.seek(0)
+                shutil.copyfileobj(spool, f)
+                spool.close()
+
+
+class _UsdaWriter:
+    """The USD text layer with one Mesh. The arrays are spooled to the temporary files."""
+
+    # The separator after each line of the spooled arrays, the last one is cut
+    _NEWLINE = ",\n"
+
+    def __init__(self, path: str):
+        self.__path = path
+        self.__points = tempfile.TemporaryFile("w+")
+        self.__indices = tempfile.TemporaryFile("w+")
+
+    def write(self, vertices: np.ndarray, faces: np.ndarray):
+        np.savetxt(self.__points, vertices, fmt="(%.6g, %.6g, %.6g)", newline=self._NEWLINE)
+        np.savetxt(self.__indices, faces, fmt="%d, %d, %d, %d", newline=self._NEWLINE)
+
+    def close(self, vertex_count: int, face_count: int):
+        with open(self.__path, "w") as f:
+            f.write('#usda 1.0\n(\n    defaultPrim = "Julia"\n    upAxis = "Y"\n)\n\ndef Mesh "Julia"\n{\n')
+            f.write("    int[] faceVertexCounts = [")
+            for start in range(0, face_count, CHUNK_SIZE**2):
+                count = min(CHUNK_SIZE**2, face_count - start)
+                f.write(("" if start == 0 else ", ") + ", ".join(["4"] * count))
+            f.write("]\n    int[] faceVertexIndices = [")
+            self.__copy(self.__indices, f)
+            f.write("]\n    point3f[] points = [")
+            self.__copy(self.__points, f)
+            f.write("]\n}\n")
+
+    def __copy(self, spool, f):
+        """Copy the spooled array without the last separator"""
+        length = spool.tell() - len(self._NEWLINE)
+        spool.seek(0)
+        while length > 0:
+            text = spool.read(min(length, 1 << 20))
+            f.write(text)
+            length -= len(text)
+        spool.close()
+
+
+_WRITERS = {"obj": _ObjWriter, "ply": _PlyWriter, "usda": _UsdaWriter}
+
+
+def _get_python_executable() -> Optional[str]:
+    """
+    The Python interpreter for the child processes. When Python is embedded,
+    like in Kit, sys.executable is the application, and the interpreter is the
+    one bundled in sys.prefix. None if it's not found.
+    """
+    if os.path.basename(sys.executable).lower().startswith("python"):
+        return sys.executable
+    if sys.platform == "win32":
+        candidates = [os.path.join(sys.prefix, "python.exe")]
+    else:
+        candidates = [os.path.join(sys.prefix, "bin", name) for name in ("python3", "python")]
+    for candidate in candidates:
+        if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            return candidate
+    return None
+
+
+def _can_use_processes() -> bool:
+    """True if the interpreter for the child processes is found"""
+    return _get_python_executable() is not None
+
+
+def _ping() -> bool:
+    """The first task of the process pool, it fails if the children can't import this module"""
+    return True
+
+
+def _create_process_pool(max_workers: int) -> Optional[ProcessPoolExecutor]:
+    """The pool of the spawned Python processes, or None if they can't start"""
+    executable = _get_python_executable()
+    if not executable:
+        return None
+    executor = None
+    try:
+        context = multiprocessing.get_context("spawn")
+        if executable != sys.executable:
+            # It's the executable of all the spawned processes, and
+            # sys.executable of the embedded Python can't spawn anything anyway
+            context.set_executable(executable)
+        executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        executor.submit(_ping).result(timeout=PROCESS_START_TIMEOUT)
+        return executor
+    except (OSError, ValueError, ImportError, BrokenProcessPool, TimeoutError):
+        if executor:
+            executor.shutdown(wait=False)
+        return None
+
+
+def _create_executor(max_workers: int, use_processes: bool):
+    if use_processes:
+        executor = _create_process_pool(max_workers)
+        if executor:
+            return executor
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="JuliaExport")
+
+
+def _shutdown(executor, in_flight):
+    """Stop the pool without waiting for the chunks that are not needed anymore"""
+    for future in in_flight:
+        future.cancel()
+    executor.shutdown(wait=False)
+
+
+def _empty_chunk() -> Future:
+    """The finished result of the chunk without the surface"""
+    future = Future()
+    future.set_result(
+        (np.zeros(0, dtype=np.int64), np.zeros((0, 3), dtype=np.float32), np.zeros((0, 4), dtype=np.int64))
+    )
+    return future
+
+
+def _get_chunks(cells: int, chunk_size: int):
+    """The (origin, shape) of the chunks, in the order the quads only refer to the chunks before them"""
+    starts = range(0, cells, chunk_size)
+    for z in starts:
+        for y in starts:
+            for x in starts:
+                origin = (z, y, x)
+                yield origin, tuple(min(chunk_size, cells - o) for o in origin)
+
+
+def export_mesh(
+    path: str,
+    parameters: JuliaParameters,
+    resolution: Optional[int] = None,
+    bound: float = BOUND,
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+    use_processes: Optional[bool] = None,
+    progress_fn: Optional[Callable[[int, int], None]] = None,
+    cancel_event: Optional[threading.Event] = None,
+    field: Optional[SparseDistanceField] = None,
+) -> Optional[ExportResult]:
+    """
+    Export the surface of the fractal to the OBJ, PLY or USDA file.
+
+    The distance at the corners of the cells is the sparse field, only the
+    bricks near the surface are evaluated. By default it's built in the
+    temporary folder and memory-mapped, so the high Precision grid is never
+    in memory. The grid is split into chunks that are read from the field and
+    extracted in parallel, the chunks without the surface bricks are skipped.
+    The chunks are written in order as they arrive and are dropped after
+    that. Only the vertices on the chunk borders are kept, for the next
+    chunks to connect to, until those chunks are written. It blocks, so call it from a thread. Returns None if
+    it's cancelled.
+
+    Args:
+        path: The file, the format is from the extension
+        parameters: The fractal
+        resolution: The samples along each axis, `grid_resolution` of the parameters by default
+        bound: The half size of the cube
+        chunk_size: The cells along each axis of one chunk
+        max_workers: The size of the pool
+        use_processes: Extract in the process pool, by default when it's possible
+        progress_fn: Called with the number of the written chunks and the total
+        cancel_event: Stops the export when it's set
+        field: The field of the corners of the cells, `SparseDistanceField.build` with `corners`
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unknown format '{extension}', the supported ones are {', '.join(FORMATS)}")
+    if use_processes is None:
+        use_processes = _can_use_processes()
+    resolution = resolution or (field.resolution if field else parameters.grid_resolution)
+    if field and (field.resolution != resolution or not np.isclose(field.origin, -bound)):
+        raise ValueError(f"The field is not the {resolution} corners of the cube of the half size {bound}")
+
+    folder = tempfile.mkdtemp(prefix="JuliaExport")
+    try:
+        if field is None:
+            field = SparseDistanceField.build(
+                parameters, resolution, bound, corners=True, path=folder, cancel_event=cancel_event
+            )
+            if field is None:
+                return None
+
+        arguments = (path, parameters, field, bound, chunk_size, max_workers)
+        if use_processes:
+            try:
+                return _export(*arguments, True, progress_fn, cancel_event)
+            except BrokenProcessPool:
+                # The children can't import the module, the file is written again with the threads
+                pass
+        return _export(*arguments, False, progress_fn, cancel_event)
+    finally:
+        # The memory map is closed before its folder is removed
+        field = arguments = None
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def _export(path, parameters, field, bound, chunk_size, max_workers, use_processes, progress_fn, cancel_event):
+    resolution = field.resolution
+    cells = resolution - 1
+    chunks = list(_get_chunks(cells, chunk_size))
+    max_workers = max_workers or os.cpu_count() or 1
+
+    writer = _WRITERS[FORMATS[os.path.splitext(path)[1].lower()]](path)
+    # The file index of the vertices on the upper borders of the written chunks
+    border: Dict[int, int] = {}
+    # The index of the chunk after which the border of a chunk is not referenced -> the cells of that border
+    expiring: Dict[int, List[List[int]]] = {}
+    chunks_per_axis = len(range(0, cells, chunk_size))
+    vertex_count = 0
+    face_count = 0
+    cancelled = False
+
+    executor = _create_executor(max_workers, use_processes)
+    use_processes = isinstance(executor, ProcessPoolExecutor)
+    in_flight = deque()
+    try:
+        submitted = 0
+        for written in range(len(chunks)):
+            # Keep the pool busy, but only a few chunks in memory
+            while submitted < len(chunks) and len(in_flight) < 2 * max_workers:
+                origin, shape = chunks[submitted]
+                last = tuple(origin[i] + shape[i] for i in range(3))
+                if field.has_surface(origin, last):
+                    axes = np.meshgrid(*[np.arange(origin[i], last[i] + 1) for i in range(3)], indexing="ij")
+                    samples = field.values(*axes)
+                    in_flight.append(
+                        executor.submit(extract_chunk, parameters, resolution, bound, origin, shape, samples)
+                    )
+                else:
+                    in_flight.append(_empty_chunk())
+                submitted += 1
+
+            ids, vertices, quads = in_flight.popleft().result()
+            if cancel_event and cancel_event.is_set():
+                cancelled = True
+                break
+
+            # The quads refer to the cells of this chunk and to the borders of the previous ones
+            indices = np.searchsorted(ids, quads)
+            indices = np.minimum(indices, max(len(ids) - 1, 0))
+            own = ids[indices] == quads if len(ids) else np.zeros(quads.shape, dtype=bool)
+            faces = np.where(own, indices + vertex_count, 0)
+            foreign = ~own
+            if foreign.any():
+                faces[foreign] = [border[cell] for cell in quads[foreign].tolist()]
+
+            writer.write(vertices, faces)
+
+            origin, shape = chunks[written]
+            local = np.column_stack(
+                (ids // (cells * cells) - origin[0], ids // cells % cells - origin[1], ids % cells - origin[2])
+            )
+            on_border = np.any(local == np.asarray(shape) - 1, axis=1)
+            border_cells = ids[on_border].tolist()
+            border.update(zip(border_cells, (np.nonzero(on_border)[0] + vertex_count).tolist()))
+
+            # The quads refer to the cells one back along two axes at most, so
+            # the border is needed until the next chunk along each axis is written
+            last = [min(origin[i] // chunk_size + 1, chunks_per_axis - 1) for i in range(3)]
+            expiring.setdefault((last[0] * chunks_per_axis + last[1]) * chunks_per_axis + last[2], []).append(
+                border_cells
+            )
+            for expired in expiring.pop(written, []):
+                for cell in expired:
+                    del border[cell]
+
+            vertex_count += len(vertices)
+            face_count += len(faces)
+            if progress_fn:
+                progress_fn(written + 1, len(chunks))
+    except BaseException:
+        _shutdown(executor, in_flight)
+        writer.close(vertex_count, face_count)
+        os.remove(path)
+        raise
+
+    _shutdown(executor, in_flight)
+    writer.close(vertex_count, face_count)
+    if cancelled:
+        os.remove(path)
+        return None
+    return ExportResult(path, vertex_count, face_count, use_processes)
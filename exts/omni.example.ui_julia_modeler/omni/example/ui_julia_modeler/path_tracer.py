@@ -0,0 +1,338 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["PathTracer", "sample_radiance", "tonemap"]
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Sequence, Tuple
+import os
+import threading
+
+import numpy as np
+
+from .julia_pipeline import COMPOSITING, LIGHTING, SURFACE, Lighting, TracedSurface, create_julia_pipeline
+from .pipeline import Pipeline
+from .preview_renderer import PREVIEW_HEIGHT, PREVIEW_WIDTH
+from .result_cache import ResultCache, stable_hash
+from .scheduler import PREVIEW, REFINEMENT
+from .sphere_tracer import SphereTracer, TraceResult
+
+# The samples per pixel, the image is final after them
+MAX_SAMPLES = 128
+# The batches that are queued at once, each batch is one sample of all the pixels
+BATCHES_IN_FLIGHT = 2
+MAX_WORKERS = 4
+# The diffuse reflectance of the surface
+ALBEDO = 0.8
+# The diffuse bounces of each path after the primary hit
+BOUNCES = 1
+# The secondary rays stop this close to the surface, they start this many times further out
+SECONDARY_EPSILON = 2e-3
+SURFACE_OFFSET = 4.0
+# The angular radius of the light in radians per unit of Shadow Softness
+SOFTNESS_ANGLE = 0.5
+EXPOSURE = 1.0
+
+
+def _orthonormal_basis(axis: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Two unit vectors perpendicular to the unit axis and to each other"""
+    helper = np.array([1.0, 0.0, 0.0]) if abs(axis[0]) < 0.9 else np.array([0.0, 1.0, 0.0])
+    tangent = np.cross(axis, helper)
+    tangent /= np.linalg.norm(tangent)
+    return tangent, np.cross(axis, tangent)
+
+
+def _sample_cone(axis: np.ndarray, angle: float, count: int, rng: np.random.Generator) -> np.ndarray:
+    """The (count, 3) uniform directions within the angle around the unit axis"""
+    cos_theta = 1.0 - rng.random(count) * (1.0 - np.cos(angle))
+    sin_theta = np.sqrt(np.maximum(1.0 - cos_theta * cos_theta, 0.0))
+    phi = 2.0 * np.pi * rng.random(count)
+    tangent, bitangent = _orthonormal_basis(axis)
+    return (
+        (sin_theta * np.cos(phi))[:, None] * tangent
+        + (sin_theta * np.sin(phi))[:, None] * bitangent
+        + cos_theta[:, None] * axis
+    )
+
+
+def _sample_cosine(normals: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """The cosine weighted directions around the (N, 3) normals"""
+    sphere = rng.standard_normal(normals.shape)
+    sphere /= np.maximum(np.linalg.norm(sphere, axis=1, keepdims=True), 1e-12)
+    directions = normals + sphere
+    length = np.linalg.norm(directions, axis=1, keepdims=True)
+    # The opposite of the normal is possible, it's replaced with the normal
+    return np.where(length > 1e-6, directions / np.maximum(length, 1e-6), normals)
+
+
+def sample_radiance(
+    lighting: Lighting,
+    background_color: Sequence[float],
+    primary: TraceResult,
+    tracer: SphereTracer,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    One Monte Carlo sample of the (N, 3) radiance of the pixels of the primary
+    trace, 0 where it misses. Each bounce adds the light of Light 1, which is
+    the disk of the Shadow Softness size, with the shadow ray to the sampled
+    point of it. Then the path continues in the cosine weighted direction,
+    the paths that leave the set see the background color.
+    """
+    radiance = np.zeros((len(primary.hit), 3))
+    index = np.flatnonzero(primary.hit)
+    points = primary.points[index].astype(np.float64)
+    normals = primary.normals[index].astype(np.float64)
+    throughput = np.full(len(index), ALBEDO)
+
+    to_light = lighting.to_light
+    light = lighting.radiance
+    background = np.asarray(background_color, dtype=np.float64)
+    cone = min(max(lighting.shadow_softness, 0.0) * SOFTNESS_ANGLE, 0.5 * np.pi)
+
+    for _ in range(BOUNCES + 1):
+        if not len(index):
+            break
+        origins = points + SURFACE_OFFSET * SECONDARY_EPSILON * normals
+
+        # The direct light
+        directions = _sample_cone(to_light, cone, len(index), rng) if lighting.shadow else to_light[None, :]
+        cosine = np.einsum("nd,nd->n", normals, np.broadcast_to(directions, normals.shape))
+        lit = np.flatnonzero(cosine > 0.0)
+        if lighting.shadow and len(lit):
+            blocked = tracer.trace(origins[lit], directions[lit], epsilon=SECONDARY_EPSILON, normals=False).hit
+            lit = lit[~blocked]
+        radiance[index[lit]] += (throughput[lit] * cosine[lit])[:, None] * light
+
+        # The bounce, the paths that don't hit the set again see the background
+        directions = _sample_cosine(normals, rng)
+        bounce = tracer.trace(origins, directions, epsilon=SECONDARY_EPSILON)
+        escaped = ~bounce.hit
+        radiance[index[escaped]] += throughput[escaped, None] * background
+
+        index = index[bounce.hit]
+        points = bounce.points[bounce.hit].astype(np.float64)
+        normals = bounce.normals[bounce.hit].astype(np.float64)
+        throughput = throughput[bounce.hit] * ALBEDO
+    return radiance.astype(np.float32)
+
+
+def tonemap(
+    background_color: Sequence[float], radiance: np.ndarray, hit: np.ndarray, shape: Tuple[int, int]
+) -> np.ndarray:
+    """The (height, width, 4) uint8 image of the mean radiance, the background where the rays miss"""
+    rgb = np.empty((len(hit), 3), dtype=np.float32)
+    rgb[:] = background_color
+    rgb[hit] = 1.0 - np.exp(-EXPOSURE * radiance[hit])
+    pixels = np.empty((len(hit), 4), dtype=np.uint8)
+    pixels[:, :3] = np.clip(rgb * 255.0 + 0.5, 0, 255)
+    pixels[:, 3] = 255
+    return pixels.reshape(shape + (4,))
+
+
+class PathTracer:
+    """
+    Renders the preview progressively with the Monte Carlo path tracing. The
+    pixels are traced from the camera once, then each batch adds one sample
+    of all of them to the float32 accumulation buffer on the worker thread
+    and publishes the tonemapped image of the mean. The UI thread calls
+    `take_tiles`, like with PreviewRenderer, to copy the published image and
+    to queue the next batches, so the image converges while the window is
+    responsive.
+
+    The request renders the current values of the SURFACE and LIGHTING
+    stages of the pipeline and the background color of COMPOSITING. The
+    request of the same values keeps accumulating. Any change of them
+    restarts it, only the primary trace is kept while the key of the surface
+    is the same. The ambient occlusion stages are not used, the bounces are
+    the occlusion, so their values don't restart it.
+    """
+
+    def __init__(
+        self,
+        width: int = PREVIEW_WIDTH,
+        height: int = PREVIEW_HEIGHT,
+        pipeline: Optional[Pipeline] = None,
+        samples: int = MAX_SAMPLES,
+        batches_in_flight: int = BATCHES_IN_FLIGHT,
+        max_workers: Optional[int] = None,
+        cache: Optional[ResultCache] = None,
+        submit_fn: Optional[Callable] = None,
+    ):
+        """
+        Args:
+            pipeline: The stages of `create_julia_pipeline`, the window shares
+                its pipeline. By default it's the pipeline of the default values.
+        """
+        self.__width = width
+        self.__pipeline = pipeline if pipeline is not None else create_julia_pipeline(cache=cache)
+        self.__height = height
+        self.__samples = samples
+        self.__batches_in_flight = max(batches_in_flight, 1)
+        self.__cache = cache
+        # Called as submit_fn(fn, *args, priority=...), returns the future-like job
+        self.__submit_fn = submit_fn
+        self.__executor = None
+        if submit_fn is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=max_workers or min(MAX_WORKERS, os.cpu_count() or 1),
+                thread_name_prefix="JuliaPathTracer",
+            )
+        self.__pixels = np.zeros((height, width, 4), dtype=np.uint8)
+        # Guards everything the workers change
+        self.__lock = threading.Lock()
+        self.__primary_lock = threading.Lock()
+        self.__generation = 0
+        # The (surface key, surface, lighting, background color) of the accumulated samples
+        self.__scene = None
+        self.__futures = []
+        self.__submitted = 0
+        self.__in_flight = 0
+        self.__accumulation = None
+        self.__accumulated = 0
+        # The tonemapped image that is not taken yet
+        self.__published = None
+        # The primary trace of the pixels by the key of the surface
+        self.__primary = None
+        self.__primary_key = None
+
+    def destroy(self):
+        self.cancel()
+        if self.__executor:
+            self.__executor.shutdown(wait=False)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """The width and the height of the image"""
+        return (self.__width, self.__height)
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """The RGBA image, (height, width, 4) uint8"""
+        return self.__pixels
+
+    @property
+    def pipeline(self) -> Pipeline:
+        """The stages the preview is rendered from"""
+        return self.__pipeline
+
+    @property
+    def generation(self) -> int:
+        """The number of the current request"""
+        return self.__generation
+
+    @property
+    def sample_count(self) -> int:
+        """The samples in the accumulation buffer"""
+        return self.__accumulated
+
+    @property
+    def done(self) -> bool:
+        """True when all the samples are accumulated and the image is taken"""
+        return self.__submitted >= self.__samples and not self.__in_flight and self.__published is None
+
+    def request(self):
+        """Start accumulating the current values of the pipeline. The same values keep their samples."""
+        surface = self.__pipeline.get(SURFACE)
+        scene = (
+            self.__pipeline.get_key(SURFACE),
+            surface,
+            self.__pipeline.get(LIGHTING),
+            self.__pipeline.get(COMPOSITING).background_color,
+        )
+        if scene == self.__scene:
+            return
+        self.cancel()
+        with self.__lock:
+            self.__scene = scene
+            self.__accumulation = np.zeros((self.__width * self.__height, 3), dtype=np.float32)
+            self.__accumulated = 0
+            self.__submitted = 0
+        self.__submit_batches()
+
+    def cancel(self):
+        """Drop the queued batches and discard the running ones"""
+        with self.__lock:
+            self.__generation += 1
+            self.__scene = None
+            self.__published = None
+            self.__submitted = self.__samples
+            # The running batches of the previous generation don't count
+            self.__in_flight = 0
+        for future in self.__futures:
+            future.cancel()
+        self.__futures = []
+
+    def take_tiles(self) -> bool:
+        """Copy the published image to `pixels` and queue the next batches. Returns True if the image is changed."""
+        with self.__lock:
+            published, self.__published = self.__published, None
+        if published is not None:
+            self.__pixels[:] = published
+        self.__submit_batches()
+        return published is not None
+
+    def __submit_batches(self):
+        """Keep the batches in flight until all the samples are submitted"""
+        self.__futures = [future for future in self.__futures if not future.done()]
+        while self.__submitted < self.__samples and self.__in_flight < self.__batches_in_flight:
+            with self.__lock:
+                sample = self.__submitted
+                self.__submitted += 1
+                self.__in_flight += 1
+            # The first one shows the image, the others refine it
+            priority = PREVIEW if sample == 0 else REFINEMENT
+            self.__futures.append(
+                self.__submit(self.__render_batch, priority, self.__generation, self.__scene, sample)
+            )
+
+    def __submit(self, fn: Callable, priority: int, *args):
+        if self.__submit_fn:
+            return self.__submit_fn(fn, *args, priority=priority)
+        return self.__executor.submit(fn, *args)
+
+    def __get_primary(self, surface_key: str, surface: TracedSurface) -> TraceResult:
+        """The trace of the pixels from the camera, it's the value of the surface stage for the whole image"""
+        with self.__primary_lock:
+            if surface_key == self.__primary_key:
+                return self.__primary
+
+            cache_key = stable_hash("path", surface_key, self.__width, self.__height)
+            primary = self.__cache.get(cache_key) if self.__cache is not None else None
+            if primary is None:
+                primary = surface.trace_image(self.__width, self.__height)
+                if self.__cache is not None:
+                    self.__cache.put(cache_key, primary)
+            self.__primary, self.__primary_key = primary, surface_key
+            return primary
+
+    def __render_batch(self, generation: int, scene: tuple, sample: int):
+        """Add one sample of all the pixels on the worker thread"""
+        try:
+            if generation != self.__generation:
+                return
+            surface_key, surface, lighting, background_color = scene
+            primary = self.__get_primary(surface_key, surface)
+            if generation != self.__generation:
+                return
+            # The seed of the sample, so the same values converge to the same image
+            radiance = sample_radiance(
+                lighting, background_color, primary, SphereTracer(surface.parameters), np.random.default_rng(sample)
+            )
+
+            with self.__lock:
+                if generation != self.__generation:
+                    return
+                self.__accumulation += radiance
+                self.__accumulated += 1
+                mean = self.__accumulation / self.__accumulated
+                self.__published = tonemap(background_color, mean, primary.hit, (self.__height, self.__width))
+        finally:
+            with self.__lock:
+                if generation == self.__generation:
+                    self.__in_flight -= 1
@@ -0,0 +1,194 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["Pipeline"]
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+import threading
+
+from .result_cache import ResultCache, stable_hash
+
+
+class _Stage:
+    __slots__ = (
+        "name", "fn", "inputs", "parameters", "version", "dependents", "value", "key", "dirty", "revision", "computes"
+    )
+
+    def __init__(self, name, fn, inputs, parameters, version):
+        self.name = name
+        self.fn = fn
+        self.inputs = inputs
+        self.parameters = parameters
+        self.version = version
+        # The stages that have this one in their inputs
+        self.dependents = []
+        self.value = None
+        # The content key of the value, from the parameters and the keys of the inputs
+        self.key = None
+        self.dirty = True
+        # Incremented each time the value is changed
+        self.revision = 0
+        self.computes = 0
+
+
+class Pipeline:
+    """
+    The dataflow graph of the stages. Each stage declares the stages it
+    reads and the "Group/Label" parameters it depends on. Changing a
+    parameter dirties only the stages that declare it and the stages after
+    them. The dirty stages are computed again when their value is requested.
+
+    The stage function is called with the dict of its declared parameters and
+    the values of its input stages. It doesn't see the other parameters, so
+    the declarations can't miss a dependency.
+
+    With the ResultCache, the values are also kept by their content key, the
+    hash of the parameters and the keys of the inputs. Returning to the
+    parameters that are already computed takes the value from the cache.
+    """
+
+    def __init__(self, values: Optional[Any] = None, cache: Optional[ResultCache] = None):
+        """
+        Args:
+            values: The current parameters, anything with `get` and `in` like
+                the AttributeStore or a dict. The missing ones are the defaults
+                of the declarations.
+            cache: The cache of the values of all the stages
+        """
+        self.__values = values if values is not None else {}
+        self.__cache = cache
+        self.__stages: Dict[str, _Stage] = {}
+        # The stages that declare each parameter
+        self.__by_parameter: Dict[str, List[_Stage]] = {}
+        self.__lock = threading.RLock()
+
+    def destroy(self):
+        self.__values = {}
+        self.__cache = None
+        self.__stages = {}
+        self.__by_parameter = {}
+
+    @property
+    def stages(self) -> List[str]:
+        """The names of the stages in the order they are added, the inputs first"""
+        return list(self.__stages.keys())
+
+    def add_stage(
+        self,
+        name: str,
+        fn: Callable,
+        inputs: Sequence[str] = (),
+        parameters: Optional[Mapping[str, Any]] = None,
+        version: int = 1,
+    ):
+        """
+        Add the stage.
+
+        Args:
+            name: The name of the stage
+            fn: Called as fn(parameters, *input_values) to compute the value
+            inputs: The stages it reads, they must be added before
+            parameters: The "Group/Label" parameters it depends on and their defaults
+            version: Change it when the function is changed, so the cached values are not used
+        """
+        if name in self.__stages:
+            raise ValueError(f"The stage '{name}' already exists")
+        missing = [input_name for input_name in inputs if input_name not in self.__stages]
+        if missing:
+            raise ValueError(f"The inputs {missing} of '{name}' are not added")
+
+        stage = _Stage(name, fn, tuple(inputs), dict(parameters or {}), version)
+        self.__stages[name] = stage
+        for input_name in inputs:
+            self.__stages[input_name].dependents.append(stage)
+        for parameter in stage.parameters:
+            self.__by_parameter.setdefault(parameter, []).append(stage)
+
+    def get_parameters(self, stage: str) -> List[str]:
+        """The parameters the stage declares"""
+        return list(self.__stages[stage].parameters.keys())
+
+    def get_stages(self, parameter: str) -> List[str]:
+        """The stages that declare the parameter"""
+        return [stage.name for stage in self.__by_parameter.get(parameter, [])]
+
+    def is_dirty(self, stage: str) -> bool:
+        return self.__stages[stage].dirty
+
+    def get_revision(self, stage: str) -> int:
+        """The number of times the value of the stage is changed, computed or taken from the cache"""
+        return self.__stages[stage].revision
+
+    def get_compute_count(self, stage: str) -> int:
+        """The number of times the function of the stage is called, the cached values are not counted"""
+        return self.__stages[stage].computes
+
+    def get_key(self, stage: str) -> Optional[str]:
+        """The content key of the current value of the stage, None if it's not computed"""
+        return self.__stages[stage].key
+
+    def invalidate(self, parameters: Iterable[str]) -> List[str]:
+        """
+        Dirty the stages of the changed parameters and the stages after them.
+        Returns the stages that became dirty, in the pipeline order.
+        """
+        with self.__lock:
+            dirtied = set()
+            for parameter in parameters:
+                for stage in self.__by_parameter.get(parameter, []):
+                    self.__dirty(stage, dirtied)
+            return [name for name in self.__stages if name in dirtied]
+
+    def invalidate_stage(self, stage: str) -> List[str]:
+        """Dirty the stage and the stages after it, e.g. when its function is changed"""
+        with self.__lock:
+            dirtied = set()
+            self.__dirty(self.__stages[stage], dirtied)
+            return [name for name in self.__stages if name in dirtied]
+
+    def get(self, stage: str) -> Any:
+        """The value of the stage. It and its dirty inputs are computed if needed."""
+        with self.__lock:
+            return self.__compute(self.__stages[stage])
+
+    def __dirty(self, stage: _Stage, dirtied: set):
+        if stage.name in dirtied:
+            return
+        dirtied.add(stage.name)
+        stage.dirty = True
+        for dependent in stage.dependents:
+            self.__dirty(dependent, dirtied)
+
+    def __compute(self, stage: _Stage) -> Any:
+        if not stage.dirty:
+            return stage.value
+
+        inputs = [self.__compute(self.__stages[name]) for name in stage.inputs]
+        values = self.__values
+        parameters = {
+            name: values.get(name) if name in values else default for name, default in stage.parameters.items()
+        }
+        key = stable_hash(
+            stage.name, stage.version, parameters, [self.__stages[name].key for name in stage.inputs]
+        )
+        if key == stage.key:
+            # The parameters are changed and changed back
+            stage.dirty = False
+            return stage.value
+
+        value = self.__cache.get(key) if self.__cache is not None else None
+        if value is None:
+            value = stage.fn(parameters, *inputs)
+            stage.computes += 1
+            if self.__cache is not None:
+                self.__cache.put(key, value)
+        stage.dirty = False
+        stage.value = value
+        stage.key = key
+        stage.revision += 1
+        return stage.value
@@ -0,0 +1,242 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["PreviewRenderer", "RENDER_STAGES", "RENDER_METHOD", "PATH_TRACED", "VOLUMETRIC"]
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import os
+
+import numpy as np
+
+from .julia_pipeline import AMBIENT_SAMPLES, COMPOSITING, SURFACE, create_julia_pipeline
+from .pipeline import Pipeline
+from .result_cache import ResultCache, stable_hash
+from .scheduler import PREVIEW, REFINEMENT
+
+PREVIEW_WIDTH = 256
+PREVIEW_HEIGHT = 256
+TILE_SIZE = 64
+# The pixel step of each pass, the coarse pass is shown first
+PASSES = (8, 2, 1)
+MAX_WORKERS = 4
+
+# The value that chooses the renderer of the preview, and its options
+RENDER_METHOD = "Scene/Render Method"
+PATH_TRACED = 0
+VOLUMETRIC = 1
+
+# The stages of the pipeline the preview is rendered from
+RENDER_STAGES = (SURFACE, AMBIENT_SAMPLES, COMPOSITING)
+
+
+def _to_pixels(rgb: np.ndarray, shape: Tuple[int, ...]) -> np.ndarray:
+    pixels = np.empty((len(rgb), 4), dtype=np.uint8)
+    pixels[:, :3] = np.clip(rgb * 255.0 + 0.5, 0, 255)
+    pixels[:, 3] = 255
+    return pixels.reshape(shape + (4,))
+
+
+class PreviewRenderer:
+    """
+    Renders the preview image in tiles on the thread pool. Each request
+    renders the coarse pass of all the tiles first, then the refinement passes.
+    The new request cancels the work of the previous one: the queued tiles are
+    dropped and the running ones are discarded when they finish.
+
+    The UI thread calls `take_tiles` to copy the finished tiles to `pixels`,
+    it's the only place that touches the image.
+
+    With `submit_fn`, like `ComputeScheduler.submit`, the tiles are submitted
+    with the PREVIEW priority for the coarse pass and REFINEMENT for the
+    others, instead of the own thread pool.
+
+    The request renders the current values of the SURFACE, AMBIENT_SAMPLES
+    and COMPOSITING stages of the pipeline. Each tile keeps its trace and its
+    occlusion samples by the content key of their stage, so only the stages
+    the changed values dirtied are evaluated again: the light and the colors
+    composite the kept samples, the falloff too, and Ambient Distance samples
+    the kept trace. With the ResultCache, the tiles of the previous keys are
+    also kept, so going back to them doesn't evaluate the fractal either.
+    """
+
+    def __init__(
+        self,
+        width: int = PREVIEW_WIDTH,
+        height: int = PREVIEW_HEIGHT,
+        pipeline: Optional[Pipeline] = None,
+        tile_size: int = TILE_SIZE,
+        passes: Sequence[int] = PASSES,
+        max_workers: Optional[int] = None,
+        cache: Optional[ResultCache] = None,
+        submit_fn: Optional[Callable] = None,
+    ):
+        """
+        Args:
+            pipeline: The stages of `create_julia_pipeline`, the window shares
+                its pipeline. By default it's the pipeline of the default values.
+        """
+        self.__width = width
+        self.__height = height
+        self.__pipeline = pipeline if pipeline is not None else create_julia_pipeline(cache=cache)
+        self.__cache = cache
+        self.__tile_size = tile_size
+        self.__passes = tuple(passes)
+        self.__pixels = np.zeros((height, width, 4), dtype=np.uint8)
+        # Called as submit_fn(fn, *args, priority=...), returns the future-like job
+        self.__submit_fn = submit_fn
+        self.__executor = None
+        if submit_fn is None:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=max_workers or min(MAX_WORKERS, os.cpu_count() or 1),
+                thread_name_prefix="JuliaPreview",
+            )
+        # The request the tiles belong to. Only the UI thread changes it, the
+        # workers compare it to drop the work of the cancelled requests.
+        self.__generation = 0
+        self.__futures = []
+        # The finished (generation, pass, x, y, pixels), appended by the workers
+        self.__finished = deque()
+        # The finest pass that is copied to each tile
+        self.__tile_passes = {}
+        # (stage, x, y, step): (stage key, value), the trace and the samples of the tiles
+        self.__tiles: Dict[Tuple[str, int, int, int], Tuple[str, Any]] = {}
+
+    def destroy(self):
+        self.cancel()
+        if self.__executor:
+            self.__executor.shutdown(wait=False)
+        self.__tiles = {}
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """The width and the height of the image"""
+        return (self.__width, self.__height)
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """The RGBA image, (height, width, 4) uint8"""
+        return self.__pixels
+
+    @property
+    def pipeline(self) -> Pipeline:
+        """The stages the preview is rendered from"""
+        return self.__pipeline
+
+    @property
+    def generation(self) -> int:
+        """The number of the current request"""
+        return self.__generation
+
+    @property
+    def done(self) -> bool:
+        """True when all the tiles of the current request are copied"""
+        return not self.__finished and all(future.done() for future in self.__futures)
+
+    def request(self):
+        """Cancel the current work and start rendering the current values of the pipeline"""
+        self.cancel()
+        generation = self.__generation
+        self.__tile_passes = {}
+        # The stages are computed on the UI thread, their values are immutable, so the workers share them
+        stages = {}
+        for name in RENDER_STAGES:
+            value = self.__pipeline.get(name)
+            stages[name] = (self.__pipeline.get_key(name), value)
+        tiles = self.__get_tiles()
+        self.__futures = [
+            self.__submit(
+                self.__render_tile, PREVIEW if index == 0 else REFINEMENT, generation, index, step, stages, x, y
+            )
+            for index, step in enumerate(self.__passes)
+            for x, y in tiles
+        ]
+
+    def cancel(self):
+        """Drop the queued tiles and discard the running ones"""
+        self.__generation += 1
+        for future in self.__futures:
+            future.cancel()
+        self.__futures = []
+        self.__finished.clear()
+
+    def take_tiles(self) -> bool:
+        """Copy the finished tiles to `pixels`. Returns True if the image is changed."""
+        changed = False
+        while self.__finished:
+            generation, index, x, y, pixels = self.__finished.popleft()
+            if generation != self.__generation:
+                continue
+            # The refined tile can finish before the coarse one on another worker
+            if self.__tile_passes.get((x, y), -1) >= index:
+                continue
+            self.__tile_passes[(x, y)] = index
+            height, width = pixels.shape[:2]
+            self.__pixels[y : y + height, x : x + width] = pixels
+            changed = True
+        return changed
+
+    def __submit(self, fn: Callable, priority: int, *args):
+        if self.__submit_fn:
+            return self.__submit_fn(fn, *args, priority=priority)
+        return self.__executor.submit(fn, *args)
+
+    def __get_tiles(self) -> List[Tuple[int, int]]:
+        """The origins of the tiles, the ones in the center of the image first"""
+        size = self.__tile_size
+        tiles = [(x, y) for y in range(0, self.__height, size) for x in range(0, self.__width, size)]
+        center_x = (self.__width - size) / 2
+        center_y = (self.__height - size) / 2
+        return sorted(tiles, key=lambda tile: (tile[0] - center_x) ** 2 + (tile[1] - center_y) ** 2)
+
+    def __get_tile_value(self, stage: str, key: str, x: int, y: int, step: int, compute_fn: Callable[[], Any]):
+        """The value of the stage for the tile, kept by the key of the stage, or taken from the ResultCache"""
+        entry = self.__tiles.get((stage, x, y, step), None)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        cache_key = stable_hash("preview", stage, key, self.__width, self.__height, x, y, step)
+        value = self.__cache.get(cache_key) if self.__cache is not None else None
+        if value is None:
+            value = compute_fn()
+            if self.__cache is not None:
+                self.__cache.put(cache_key, value)
+        return value
+
+    def __render_tile(self, generation: int, index: int, step: int, stages: dict, x: int, y: int):
+        """Render one tile on the worker thread"""
+        if generation != self.__generation:
+            return
+        width = min(self.__tile_size, self.__width - x)
+        height = min(self.__tile_size, self.__height - y)
+
+        # The coarse passes render every step-th pixel and repeat it
+        columns = x + step * np.arange(-(-width // step)) + 0.5 * step
+        rows = y + step * np.arange(-(-height // step)) + 0.5 * step
+        scale = 2.0 / self.__height
+        u = (columns - 0.5 * self.__width) * scale
+        v = (0.5 * self.__height - rows) * scale
+        u, v = np.meshgrid(u, v)
+
+        surface_key, surface = stages[SURFACE]
+        samples_key, sampler = stages[AMBIENT_SAMPLES]
+        trace = self.__get_tile_value(SURFACE, surface_key, x, y, step, lambda: surface.trace(u, v))
+        occlusion = self.__get_tile_value(AMBIENT_SAMPLES, samples_key, x, y, step, lambda: sampler.sample(trace))
+        # The trace and the samples take most of the time, the values can change meanwhile
+        if generation != self.__generation:
+            return
+        self.__tiles[(SURFACE, x, y, step)] = (surface_key, trace)
+        self.__tiles[(AMBIENT_SAMPLES, x, y, step)] = (samples_key, occlusion)
+
+        pixels = _to_pixels(stages[COMPOSITING][1].shade(trace, occlusion), u.shape)
+        if step > 1:
+            pixels = np.repeat(np.repeat(pixels, step, axis=0), step, axis=1)[:height, :width]
+
+        if generation == self.__generation:
+            self.__finished.append((generation, index, x, y, pixels))
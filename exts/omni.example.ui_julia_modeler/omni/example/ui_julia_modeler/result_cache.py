@@ -0,0 +1,351 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["ResultCache", "stable_hash"]
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import dataclasses
+import hashlib
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+# Changing it makes the results on the disk unreachable
+CACHE_VERSION = 1
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+DEFAULT_DISK_BUDGET = 1024 * 1024 * 1024
+_SUFFIX = ".npz"
+# The array of the npz file with the JSON layout of the value
+_LAYOUT = "layout"
+
+
+def _to_json(value):
+    """The JSON form of the values that json doesn't know"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if dataclasses.is_dataclass(value):
+        return [type(value).__name__, dataclasses.asdict(value)]
+    raise TypeError(f"{type(value).__name__} can't be hashed")
+
+
+def stable_hash(*parts) -> str:
+    """
+    The hash of the values that is the same in all the sessions, unlike
+    hash(). The tuples and the lists are the same, so (1.0, 2.0) from the
+    store and [1.0, 2.0] from the defaults have the same hash.
+    """
+    text = json.dumps([CACHE_VERSION, parts], sort_keys=True, separators=(",", ":"), default=_to_json)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _get_size(value) -> int:
+    """The bytes of the value, mostly its arrays"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if dataclasses.is_dataclass(value):
+        return sum(_get_size(getattr(value, field.name)) for field in dataclasses.fields(value))
+    if isinstance(value, (tuple, list)):
+        return sum(_get_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    """Make the arrays read-only, the cached value is shared by everyone who gets it"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif dataclasses.is_dataclass(value):
+        for field in dataclasses.fields(value):
+            _freeze(getattr(value, field.name))
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _freeze(item)
+
+
+def _encode(value, arrays: Dict[str, np.ndarray]):
+    """The JSON layout of the value, its arrays are added to `arrays` and referred to by name"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (np.ndarray, np.generic)):
+        if np.asarray(value).dtype.hasobject:
+            raise TypeError("The arrays of the objects can't be saved without pickle")
+        name = f"a{len(arrays)}"
+        arrays[name] = np.asarray(value)
+        return {"array": name, "scalar": isinstance(value, np.generic)}
+    if isinstance(value, (tuple, list)):
+        return {type(value).__name__: [_encode(item, arrays) for item in value]}
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {"dict": {key: _encode(item, arrays) for key, item in value.items()}}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        cls = type(value)
+        return {
+            "dataclass": f"{cls.__module__}:{cls.__qualname__}",
+            "fields": {field.name: _encode(getattr(value, field.name), arrays) for field in dataclasses.fields(value)},
+        }
+    raise TypeError(f"{type(value).__name__} can't be saved")
+
+
+def _get_dataclass(name: str) -> type:
+    """The dataclass of the layout. Only the ones of the loaded modules of this package, nothing is imported."""
+    module_name, _, qualname = name.partition(":")
+    in_package = module_name == __package__ or module_name.startswith(__package__ + ".")
+    module = sys.modules.get(module_name) if in_package else None
+    cls = module
+    for part in qualname.split("."):
+        cls = getattr(cls, part, None)
+    if not isinstance(cls, type) or not dataclasses.is_dataclass(cls):
+        raise ValueError(f"{name} is not a dataclass")
+    return cls
+
+
+def _decode(layout, arrays) -> Any:
+    """The value of the layout of `_encode`"""
+    if not isinstance(layout, dict):
+        return layout
+    if "array" in layout:
+        array = arrays[layout["array"]]
+        return array[()] if layout["scalar"] else array
+    if "tuple" in layout:
+        return tuple(_decode(item, arrays) for item in layout["tuple"])
+    if "list" in layout:
+        return [_decode(item, arrays) for item in layout["list"]]
+    if "dict" in layout:
+        return {key: _decode(item, arrays) for key, item in layout["dict"].items()}
+    cls = _get_dataclass(layout["dataclass"])
+    return cls(**{name: _decode(item, arrays) for name, item in layout["fields"].items()})
+
+
+class ResultCache:
+    """
+    The results by the content key, like the `stable_hash` of everything they
+    are computed from. The recent results are in memory, up to the byte
+    budget. The least recently used ones are spilled to the disk, which is
+    also limited by size and keeps the results between the sessions.
+
+    The disk tier is the npz files of the arrays with the JSON layout of the
+    value, they are loaded without pickle, so the files can't run code. The
+    values are the arrays, the scalars, the tuples, the lists, the dicts and
+    the dataclasses of this package. The other values stay in memory only.
+
+    It's used from the worker threads, so all the methods are locked. The
+    files are written and read outside the lock, the other threads don't
+    wait for the disk.
+    """
+
+    def __init__(
+        self,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        disk_path: Optional[str] = None,
+        disk_budget: int = DEFAULT_DISK_BUDGET,
+    ):
+        """
+        Args:
+            memory_budget: The bytes of the results in memory
+            disk_path: The folder of the disk tier, None is memory only
+            disk_budget: The bytes of the results on the disk
+        """
+        self.__memory_budget = memory_budget
+        self.__disk_budget = disk_budget
+        self.__disk_path = disk_path
+        # key: (value, size), the most recent last
+        self.__memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self.__memory_bytes = 0
+        # key: size of the file, the most recent last
+        self.__disk: "OrderedDict[str, int]" = OrderedDict()
+        self.__disk_bytes = 0
+        # key: value, the spilled results that are being written to the disk
+        self.__spilling: Dict[str, Any] = {}
+        self.__lock = threading.RLock()
+        self.__stats = {"hits": 0, "disk_hits": 0, "misses": 0}
+
+        if disk_path:
+            self.__scan_disk()
+
+    def destroy(self):
+        """Forget the results in memory, the ones on the disk stay for the next session"""
+        with self.__lock:
+            self.__memory.clear()
+            self.__memory_bytes = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.__memory_bytes
+
+    @property
+    def disk_bytes(self) -> int:
+        return self.__disk_bytes
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """The number of the memory hits, the disk hits and the misses"""
+        return dict(self.__stats)
+
+    def __contains__(self, key: str) -> bool:
+        with self.__lock:
+            return key in self.__memory or key in self.__spilling or key in self.__disk
+
+    def __len__(self) -> int:
+        with self.__lock:
+            stored = self.__spilling.keys() | self.__disk.keys()
+            return len(self.__memory) + len([key for key in stored if key not in self.__memory])
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """The result, from the disk it's moved to memory. The default if there is no result."""
+        with self.__lock:
+            entry = self.__memory.get(key, None)
+            if entry is not None:
+                self.__memory.move_to_end(key)
+                self.__stats["hits"] += 1
+                return entry[0]
+
+            if key in self.__spilling:
+                value = self.__spilling[key]
+                self.__stats["hits"] += 1
+                spilled = self.__add_to_memory(key, value)
+            elif key in self.__disk:
+                self.__disk.move_to_end(key)
+                value = None
+                spilled = []
+            else:
+                self.__stats["misses"] += 1
+                return default
+
+        if value is None:
+            value = self.__read(key)
+            with self.__lock:
+                if value is None:
+                    self.__stats["misses"] += 1
+                    return default
+                self.__stats["disk_hits"] += 1
+                spilled = self.__add_to_memory(key, value)
+        self.__write(spilled)
+        return value
+
+    def put(self, key: str, value: Any):
+        """Keep the result. The values bigger than the memory budget go to the disk only."""
+        _freeze(value)
+        with self.__lock:
+            spilled = self.__add_to_memory(key, value)
+        self.__write(spilled)
+
+    def clear(self):
+        """Remove the results from memory and from the disk"""
+        with self.__lock:
+            self.__memory.clear()
+            self.__memory_bytes = 0
+            # The results that are being written are removed when they are written
+            self.__spilling.clear()
+            for key in list(self.__disk):
+                self.__remove_file(key)
+
+    def __add_to_memory(self, key: str, value: Any) -> List[Tuple[str, Any]]:
+        """Add the value in the lock, returns the spilled results that should be written to the disk"""
+        size = _get_size(value)
+        previous = self.__memory.pop(key, None)
+        if previous is not None:
+            self.__memory_bytes -= previous[1]
+        self.__memory[key] = (value, size)
+        self.__memory_bytes += size
+
+        # Spill the least recently used ones, the new one too if it doesn't fit
+        spilled = []
+        while self.__memory_bytes > self.__memory_budget and self.__memory:
+            spilled_key, (spilled_value, spilled_size) = self.__memory.popitem(last=False)
+            self.__memory_bytes -= spilled_size
+            if not self.__disk_path or spilled_key in self.__spilling:
+                continue
+            if spilled_key in self.__disk:
+                # The results don't change, the one on the disk is the same
+                self.__disk.move_to_end(spilled_key)
+                continue
+            self.__spilling[spilled_key] = spilled_value
+            spilled.append((spilled_key, spilled_value))
+        return spilled
+
+    def __file(self, key: str) -> str:
+        return os.path.join(self.__disk_path, key + _SUFFIX)
+
+    def __scan_disk(self):
+        """Find the results of the previous sessions, the oldest first"""
+        try:
+            os.makedirs(self.__disk_path, exist_ok=True)
+            entries = [entry for entry in os.scandir(self.__disk_path) if entry.name.endswith(_SUFFIX)]
+        except OSError:
+            self.__disk_path = None
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries:
+            size = entry.stat().st_size
+            self.__disk[entry.name[: -len(_SUFFIX)]] = size
+            self.__disk_bytes += size
+        self.__evict_disk()
+
+    def __write(self, spilled: List[Tuple[str, Any]]):
+        """Write the spilled results outside the lock"""
+        for key, value in spilled:
+            path = self.__file(key)
+            # The threads of this session and the other sessions never see the partial file
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                arrays = {}
+                layout = _encode(value, arrays)
+                with open(temp_path, "wb") as f:
+                    np.savez(f, **{_LAYOUT: np.array(json.dumps(layout))}, **arrays)
+                os.replace(temp_path, path)
+                size = os.path.getsize(path)
+            except (OSError, TypeError, ValueError):
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                size = None
+
+            with self.__lock:
+                if self.__spilling.pop(key, None) is None:
+                    # It's cleared while it was written
+                    if size is not None:
+                        self.__remove_file(key)
+                    continue
+                if size is None:
+                    continue
+                self.__disk_bytes += size - self.__disk.pop(key, 0)
+                self.__disk[key] = size
+                self.__evict_disk()
+
+    def __read(self, key: str) -> Any:
+        """Read the result outside the lock, None if it's removed or broken"""
+        path = self.__file(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            value = _decode(json.loads(str(arrays.pop(_LAYOUT))), arrays)
+        except Exception:
+            with self.__lock:
+                self.__remove_file(key)
+            return None
+        _freeze(value)
+        try:
+            # The access time is the order of the eviction in the next session
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def __evict_disk(self):
+        while self.__disk_bytes > self.__disk_budget and self.__disk:
+            self.__remove_file(next(iter(self.__disk)))
+
+    def __remove_file(self, key: str):
+        self.__disk_bytes -= self.__disk.pop(key, 0)
+        try:
+            os.remove(self.__file(key))
+        except OSError:
+            pass
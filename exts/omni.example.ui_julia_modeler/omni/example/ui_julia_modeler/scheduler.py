@@ -0,0 +1,315 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["PREVIEW", "REFINEMENT", "EXPORT", "ComputeJob", "ComputeScheduler"]
+
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import asyncio
+import itertools
+import os
+import queue
+import threading
+import time
+import traceback
+
+import carb
+import omni.kit.app
+
+# The priorities of the jobs, the lower one runs first
+PREVIEW = 0
+REFINEMENT = 1
+EXPORT = 2
+_PRIORITY_NAMES = {PREVIEW: "preview", REFINEMENT: "refinement", EXPORT: "export"}
+
+MAX_WORKERS = 4
+# The weight of the last job in the mean latency
+LATENCY_SMOOTHING = 0.1
+# Guards starting and cancelling the jobs, so the cancelled job never starts
+_STATE_LOCK = threading.Lock()
+
+
+def _call(fn: Callable, *args):
+    """Call the callback of the UI thread, its error doesn't stop the delivery of the others"""
+    try:
+        fn(*args)
+    except Exception:
+        carb.log_error(f"The callback of the compute scheduler failed: {traceback.format_exc()}")
+
+
+class ComputeJob:
+    """The job of the scheduler. It looks like concurrent.futures.Future for the code that polls it."""
+
+    def __init__(self, fn: Callable, args, priority: int, key: Optional[Any], done_fn: Optional[Callable]):
+        self.fn = fn
+        self.args = args
+        self.priority = priority
+        self.key = key
+        self.done_fn = done_fn
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+        self.value = None
+        self.error = None
+        self.__cancelled = False
+
+    def cancel(self) -> bool:
+        """Cancel the job if it's not started. Returns True if it's cancelled."""
+        with _STATE_LOCK:
+            if self.started is not None:
+                return False
+            self.__cancelled = True
+            return True
+
+    def cancelled(self) -> bool:
+        return self.__cancelled
+
+    def done(self) -> bool:
+        return self.__cancelled or self.finished is not None
+
+    def _start(self) -> bool:
+        """Called by the worker, False if the job is cancelled"""
+        with _STATE_LOCK:
+            if self.__cancelled:
+                return False
+            self.started = time.perf_counter()
+            return True
+
+    def result(self):
+        """The value of the finished job, or its exception is raised"""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+class _Latency:
+    """The last, mean and max of the times of one priority, in milliseconds"""
+
+    __slots__ = ("count", "last", "mean", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.last = 0.0
+        self.mean = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        milliseconds = seconds * 1000.0
+        self.mean = milliseconds if not self.count else self.mean + LATENCY_SMOOTHING * (milliseconds - self.mean)
+        self.count += 1
+        self.last = milliseconds
+        self.max = max(self.max, milliseconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "last_ms": self.last, "mean_ms": self.mean, "max_ms": self.max}
+
+
+class ComputeScheduler:
+    """
+    Collects the changed parameters and the compute jobs of the window.
+
+    The changes are coalesced: however many times the sliders call `notify`
+    in one frame, the changed functions are called once with all the names.
+    The jobs run on the worker threads in the order of their priority, the
+    preview before the refinement before the export. The results are
+    delivered on the UI thread from the loop that awaits `next_update_async`,
+    so the UI thread never waits for the workers.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, next_update_async: Optional[Callable] = None):
+        """
+        Args:
+            max_workers: The number of the worker threads
+            next_update_async: Awaited between the frames, Kit's next update by default
+        """
+        self.__next_update_async = next_update_async or omni.kit.app.get_app().next_update_async
+        self.__queue = queue.PriorityQueue()
+        self.__order = itertools.count()
+        # The jobs by key, the queued job with the same key is superseded
+        self.__keyed: Dict[Any, ComputeJob] = {}
+        # The finished jobs, appended by the workers
+        self.__finished = deque()
+        self.__outstanding = 0
+        self.__outstanding_lock = threading.Lock()
+        self.__changed_fns: List[Callable[[List[str]], None]] = []
+        self.__frame_fns: List[Callable[[], None]] = []
+        self.__changes: Dict[str, None] = {}
+        self.__task = None
+        self.__running = True
+        self.__reset_counters()
+
+        self.__workers = [
+            threading.Thread(target=self.__work, name=f"JuliaCompute{i}", daemon=True)
+            for i in range(max_workers or min(MAX_WORKERS, os.cpu_count() or 1))
+        ]
+        for worker in self.__workers:
+            worker.start()
+
+    def destroy(self):
+        """Stop the workers, the queued jobs are dropped"""
+        self.__running = False
+        for _ in self.__workers:
+            # The sentinels are after all the jobs
+            self.__queue.put((float("inf"), next(self.__order), None))
+        self.__workers = []
+        if self.__task:
+            self.__task.cancel()
+            self.__task = None
+        self.__changed_fns = []
+        self.__frame_fns = []
+        self.__keyed = {}
+
+    def add_changed_fn(self, fn: Callable[[List[str]], None]):
+        """Call fn once per frame with the names that are changed in this frame"""
+        self.__changed_fns.append(fn)
+
+    def add_frame_fn(self, fn: Callable[[], None]):
+        """Call fn each frame while there are jobs, after the results of the frame are delivered"""
+        self.__frame_fns.append(fn)
+
+    def notify(self, names: Iterable[str]):
+        """Collect the changed names, e.g. from `AttributeStore.add_changed_fn`"""
+        if self.__outstanding:
+            # The new input comes while the compute of the previous one is not done
+            self.__counters["stale_changes"] += 1
+        for name in names:
+            self.__changes[name] = None
+        self.__counters["notified"] += 1
+        self.__ensure_running()
+
+    def submit(
+        self, fn: Callable, *args, priority: int = PREVIEW, key: Optional[Any] = None, done_fn: Optional[Callable] = None
+    ) -> ComputeJob:
+        """
+        Run fn(*args) on the worker thread.
+
+        Args:
+            priority: PREVIEW, REFINEMENT or EXPORT
+            key: The queued job with the same key is cancelled, it's superseded by this one
+            done_fn: Called with the job on the UI thread when it's finished
+        """
+        job = ComputeJob(fn, args, priority, key, done_fn)
+        if key is not None:
+            previous = self.__keyed.get(key, None)
+            if previous and previous.cancel():
+                self.__counters["superseded"] += 1
+            self.__keyed[key] = job
+
+        with self.__outstanding_lock:
+            self.__outstanding += 1
+        self.__queue.put((priority, next(self.__order), job))
+        self.__counters["submitted"] += 1
+        depth = self.__queue.qsize()
+        self.__counters["max_queue_depth"] = max(self.__counters["max_queue_depth"], depth)
+        self.__ensure_running()
+        return job
+
+    @property
+    def queue_depth(self) -> int:
+        """The number of the jobs that are waiting for a worker, the cancelled ones too"""
+        return self.__queue.qsize()
+
+    @property
+    def busy(self) -> bool:
+        """True if there are the jobs or the changes that are not delivered"""
+        return bool(self.__outstanding or self.__changes or self.__finished)
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """
+        The counters. If the queue depth, the stale changes or the latency grow
+        while dragging, the compute is behind the input.
+        """
+        stats = dict(self.__counters)
+        stats["queue_depth"] = self.queue_depth
+        stats["outstanding"] = self.__outstanding
+        stats["wait"] = {_PRIORITY_NAMES[p]: latency.as_dict() for p, latency in self.__wait.items()}
+        stats["latency"] = {_PRIORITY_NAMES[p]: latency.as_dict() for p, latency in self.__latency.items()}
+        return stats
+
+    def reset_stats(self):
+        self.__reset_counters()
+
+    def __reset_counters(self):
+        self.__counters = {
+            "notified": 0,
+            "frames": 0,
+            "coalesced": 0,
+            "stale_changes": 0,
+            "submitted": 0,
+            "completed": 0,
+            "superseded": 0,
+            "failed": 0,
+            "max_queue_depth": 0,
+        }
+        # From submitting to starting, and from submitting to delivering
+        self.__wait = {priority: _Latency() for priority in _PRIORITY_NAMES}
+        self.__latency = {priority: _Latency() for priority in _PRIORITY_NAMES}
+
+    def __work(self):
+        """The loop of the worker thread"""
+        while True:
+            _, _, job = self.__queue.get()
+            if job is None:
+                return
+            if not self.__running or not job._start():
+                self.__release()
+                continue
+
+            try:
+                job.value = job.fn(*job.args)
+            except Exception as e:
+                job.error = e
+            job.finished = time.perf_counter()
+            self.__finished.append(job)
+
+    def __release(self):
+        with self.__outstanding_lock:
+            self.__outstanding -= 1
+
+    def __ensure_running(self):
+        if self.__running and (self.__task is None or self.__task.done()):
+            self.__task = asyncio.ensure_future(self.__run_async())
+
+    async def __run_async(self):
+        """Deliver the changes and the results each frame while there are any"""
+        while self.__running:
+            await self.__next_update_async()
+            if not self.__running:
+                return
+            self.__counters["frames"] += 1
+
+            if self.__changes:
+                names = list(self.__changes)
+                self.__changes = {}
+                self.__counters["coalesced"] += 1
+                for fn in list(self.__changed_fns):
+                    _call(fn, names)
+
+            while self.__finished:
+                self.__deliver(self.__finished.popleft())
+
+            for fn in list(self.__frame_fns):
+                _call(fn)
+
+            if not self.busy:
+                return
+
+    def __deliver(self, job: ComputeJob):
+        """Called on the UI thread for each finished job"""
+        self.__release()
+        if job.key is not None and self.__keyed.get(job.key, None) is job:
+            del self.__keyed[job.key]
+        self.__wait[job.priority].add(job.started - job.submitted)
+        self.__latency[job.priority].add(time.perf_counter() - job.submitted)
+        if job.error is not None:
+            self.__counters["failed"] += 1
+        else:
+            self.__counters["completed"] += 1
+        if job.done_fn:
+            _call(job.done_fn, job)
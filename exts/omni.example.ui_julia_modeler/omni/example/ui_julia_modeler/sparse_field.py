@@ -0,0 +1,309 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["SparseDistanceField", "EMPTY", "SOLID"]
+
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+import json
+import math
+import os
+import threading
+
+import numpy as np
+
+from .julia_engine import BOUND, JuliaEngine, JuliaParameters
+
+# The samples along each axis of one brick
+BRICK_SIZE = 8
+# The bricks with all the samples further than this many steps from the set are empty
+BAND = 2.0
+# The bricks are classified by the distance at the centers of their 2x2x2
+# blocks of samples. It's only an estimate, so it counts as this part of it.
+DISTANCE_SAFETY = 0.75
+DEFAULT_DTYPE = np.float32
+# The bricks evaluated at once
+BRICKS_PER_BATCH = 64
+# The index of the bricks that are not stored
+EMPTY = -1
+SOLID = -2
+
+_HEADER = "field.json"
+_INDEX = "index.npy"
+_CONSTANTS = "constants.npy"
+_BRICKS = "bricks.bin"
+_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class SparseDistanceField:
+    """
+    The distance estimate on the (resolution, resolution, resolution) grid,
+    indexed [z, y, x], stored as the bricks of BRICK_SIZE samples. Only the
+    bricks near the surface keep their samples. The bricks that are far
+    outside keep one value, the estimate of the lower bound of their samples,
+    and the bricks inside the set keep nothing, their samples are 0.
+
+    At high Precision the surface is a small part of the grid, so the field
+    is a fraction of the dense one, and only the bricks near the surface are
+    evaluated. It can be saved to the folder and opened memory-mapped, so the
+    passes over it read only the bricks they touch.
+    """
+
+    resolution: int
+    # The position of the sample 0 and the distance between the samples, the same along each axis
+    origin: float
+    step: float
+    brick_size: int
+    # (n, n, n) int32: the slot in `bricks`, EMPTY or SOLID
+    index: np.ndarray
+    # (n, n, n) float32: the value of the empty bricks
+    constants: np.ndarray
+    # (count, brick_size, brick_size, brick_size) samples of the stored bricks
+    bricks: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        parameters: JuliaParameters,
+        resolution: Optional[int] = None,
+        bound: float = BOUND,
+        corners: bool = False,
+        brick_size: int = BRICK_SIZE,
+        dtype=DEFAULT_DTYPE,
+        path: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> Optional["SparseDistanceField"]:
+        """
+        Evaluate the field of the fractal.
+
+        Args:
+            resolution: The samples along each axis, `grid_resolution` of the parameters by default
+            bound: The half size of the cube
+            corners: The samples are on the corners of the cells, from -bound
+                to bound, like the mesh export. By default they are the
+                centers of the cells, like `JuliaEngine.distance_field`.
+            dtype: The type of the stored samples, float16 or float32
+            path: The folder the bricks are streamed to, they are never all in memory
+            cancel_event: Stops the evaluation when it's set, then it returns None
+        """
+        if brick_size % 2:
+            raise ValueError(f"The brick size {brick_size} is not even")
+        resolution = resolution or parameters.grid_resolution
+        if corners:
+            step = 2.0 * bound / (resolution - 1)
+            origin = -bound
+        else:
+            step = 2.0 * bound / resolution
+            origin = -bound + 0.5 * step
+        count = -(-resolution // brick_size)
+        engine = JuliaEngine(parameters)
+        band = BAND * step
+
+        index = np.full((count, count, count), EMPTY, dtype=np.int32)
+        constants = np.zeros((count, count, count), dtype=np.float32)
+        stored = []
+        spool = None
+        if path:
+            os.makedirs(path, exist_ok=True)
+            spool = open(os.path.join(path, _BRICKS), "wb")
+
+        # The offsets of the samples of one brick and of the centers of its blocks, [z, y, x]
+        local = np.arange(brick_size)
+        offsets = np.stack(np.meshgrid(local, local, local, indexing="ij"), axis=-1).reshape(-1, 3)
+        coarse = offsets[(offsets % 2 == 0).all(axis=1)] + 0.5
+        brick_corners = offsets[np.isin(offsets, (0, brick_size - 1)).all(axis=1)]
+        # From the center of the block to its samples
+        block_radius = 0.5 * math.sqrt(3.0) * step
+        # The estimate divides by the derivative, it's 0 at the critical point q = 0, so around the point
+        # (0, 0, 0) the estimate is far too large. The bricks of the samples next to it are always evaluated.
+        center = -origin / step
+        critical = np.unique([min(int(index), resolution - 1) // brick_size for index in (center, math.ceil(center))])
+        brick_y, brick_x = np.meshgrid(np.arange(count), np.arange(count), indexing="ij")
+        brick_y, brick_x = brick_y.ravel(), brick_x.ravel()
+        slots = 0
+        try:
+            for brick_z in range(count):
+                if cancel_event and cancel_event.is_set():
+                    return None
+                first = brick_size * np.column_stack((np.full(len(brick_x), brick_z), brick_y, brick_x))
+                points = origin + step * (first[:, None, :] + coarse[None, :, :])[..., ::-1].reshape(-1, 3)
+                distance = engine.distance(points).reshape(len(first), -1).min(axis=1)
+                distance = DISTANCE_SAFETY * distance - block_radius
+                # The estimate misses the thin parts of the set, like the single samples inside it, so the
+                # corners of the bricks it marks empty are evaluated too
+                far = np.flatnonzero(distance > band)
+                points = origin + step * (first[far][:, None, :] + brick_corners[None, :, :])[..., ::-1].reshape(-1, 3)
+                distance[far] = np.minimum(distance[far], engine.distance(points).reshape(len(far), -1).min(axis=1))
+                far = distance > band
+                if brick_z in critical:
+                    far &= ~(np.isin(brick_y, critical) & np.isin(brick_x, critical))
+                constants[brick_z, brick_y[far], brick_x[far]] = distance[far]
+
+                near = np.flatnonzero(~far)
+                for start in range(0, len(near), BRICKS_PER_BATCH):
+                    batch = near[start:start + BRICKS_PER_BATCH]
+                    zyx = first[batch][:, None, :] + offsets[None, :, :]
+                    points = origin + step * zyx[..., ::-1].reshape(-1, 3)
+                    samples = engine.distance(points).reshape(len(batch), brick_size, brick_size, brick_size)
+
+                    lowest = samples.min(axis=(1, 2, 3))
+                    solid = samples.max(axis=(1, 2, 3)) <= 0.0
+                    empty = ~solid & (lowest > band)
+                    keep = ~solid & ~empty
+                    index[brick_z, brick_y[batch[solid]], brick_x[batch[solid]]] = SOLID
+                    constants[brick_z, brick_y[batch[empty]], brick_x[batch[empty]]] = lowest[empty]
+
+                    kept = samples[keep].astype(dtype)
+                    index[brick_z, brick_y[batch[keep]], brick_x[batch[keep]]] = slots + np.arange(len(kept))
+                    slots += len(kept)
+                    if spool:
+                        spool.write(kept.tobytes())
+                    else:
+                        stored.append(kept)
+        finally:
+            if spool:
+                spool.close()
+
+        if path:
+            field = cls(resolution, origin, step, brick_size, index, constants, np.empty((0,), dtype=dtype))
+            field.__write_header(path, slots)
+            return cls.open(path)
+        bricks = np.concatenate(stored) if stored else np.zeros((0, brick_size, brick_size, brick_size), dtype)
+        return cls(resolution, origin, step, brick_size, index, constants, bricks)
+
+    @classmethod
+    def open(cls, path: str) -> "SparseDistanceField":
+        """Open the saved field, the bricks are memory-mapped"""
+        with open(os.path.join(path, _HEADER), "r") as f:
+            header = json.load(f)
+        if header.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"The field in {path} has the unknown version {header.get('version')}")
+        size = header["brick_size"]
+        dtype = np.dtype(header["dtype"])
+        shape = (header["count"], size, size, size)
+        if header["count"]:
+            bricks = np.memmap(os.path.join(path, _BRICKS), dtype=dtype, mode="r", shape=shape)
+        else:
+            bricks = np.zeros(shape, dtype=dtype)
+        return cls(
+            header["resolution"],
+            header["origin"],
+            header["step"],
+            size,
+            np.load(os.path.join(path, _INDEX)),
+            np.load(os.path.join(path, _CONSTANTS)),
+            bricks,
+        )
+
+    def save(self, path: str):
+        """Save to the folder, `open` maps it back"""
+        os.makedirs(path, exist_ok=True)
+        np.ascontiguousarray(self.bricks).tofile(os.path.join(path, _BRICKS))
+        self.__write_header(path, len(self.bricks))
+
+    def __write_header(self, path: str, count: int):
+        np.save(os.path.join(path, _INDEX), self.index)
+        np.save(os.path.join(path, _CONSTANTS), self.constants)
+        header = {
+            "version": _FORMAT_VERSION,
+            "resolution": self.resolution,
+            "origin": self.origin,
+            "step": self.step,
+            "brick_size": self.brick_size,
+            "dtype": np.dtype(self.bricks.dtype).name,
+            "count": int(count),
+        }
+        with open(os.path.join(path, _HEADER), "w") as f:
+            json.dump(header, f)
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return (self.resolution,) * 3
+
+    @property
+    def nbytes(self) -> int:
+        """The bytes of the stored bricks and the index"""
+        return self.index.nbytes + self.constants.nbytes + self.bricks.nbytes
+
+    @property
+    def dense_nbytes(self) -> int:
+        """The bytes of the same field as the dense float32 grid"""
+        return 4 * self.resolution ** 3
+
+    def values(self, z: np.ndarray, y: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """The float32 samples of the [z, y, x] indices, they must be in the grid"""
+        size = self.brick_size
+        brick = (z // size, y // size, x // size)
+        slot = self.index[brick]
+        result = np.zeros(slot.shape, dtype=np.float32)
+        stored = slot >= 0
+        result[stored] = self.bricks[slot[stored], z[stored] % size, y[stored] % size, x[stored] % size]
+        empty = slot == EMPTY
+        result[empty] = self.constants[brick][empty]
+        return result
+
+    def gradient(self, z: np.ndarray, y: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """The (N, 3) xyz gradient at the [z, y, x] indices per sample, like `np.gradient` of the dense grid"""
+        index = (z, y, x)
+        gradient = np.empty((len(z), 3), dtype=np.float32)
+        for axis in range(3):
+            lower = list(index)
+            upper = list(index)
+            lower[axis] = np.maximum(index[axis] - 1, 0)
+            upper[axis] = np.minimum(index[axis] + 1, self.resolution - 1)
+            # Central in the grid, one-sided on its border
+            span = np.maximum(upper[axis] - lower[axis], 1)
+            gradient[:, 2 - axis] = (self.values(*upper) - self.values(*lower)) / span
+        return gradient
+
+    def sample(self, points: np.ndarray) -> np.ndarray:
+        """The distance at the (N, 3) xyz points, from the nearest sample, outside the grid it's the distance to it"""
+        voxel = np.floor((points - self.origin) / self.step + 0.5).astype(np.int64)
+        clamped = np.clip(voxel, 0, self.resolution - 1)
+        distance = self.values(clamped[:, 2], clamped[:, 1], clamped[:, 0])
+        outside = np.abs(voxel - clamped).max(axis=1) * self.step
+        return np.maximum(distance, outside)
+
+    def boundary_bricks(self) -> np.ndarray:
+        """
+        The (K, 3) [z, y, x] bricks the surface can be in: the stored ones,
+        and the solid ones next to the bricks that are not solid or to the
+        border of the grid.
+        """
+        solid = self.index == SOLID
+        padded = np.pad(solid, 1, constant_values=False)
+        enclosed = solid.copy()
+        for axis in range(3):
+            for shift in (-1, 1):
+                enclosed &= np.roll(padded, shift, axis=axis)[1:-1, 1:-1, 1:-1]
+        return np.argwhere((self.index >= 0) | (solid & ~enclosed))
+
+    def iter_voxels(self, bricks: np.ndarray, batch: int = BRICKS_PER_BATCH) -> Iterator[Tuple[np.ndarray, ...]]:
+        """The z, y, x indices of the samples of the (K, 3) bricks inside the grid, in the batches of bricks"""
+        local = np.arange(self.brick_size)
+        offsets = np.stack(np.meshgrid(local, local, local, indexing="ij"), axis=-1).reshape(-1, 3)
+        for start in range(0, len(bricks), batch):
+            zyx = (bricks[start:start + batch, None, :] * self.brick_size + offsets[None, :, :]).reshape(-1, 3)
+            zyx = zyx[(zyx < self.resolution).all(axis=1)]
+            yield zyx[:, 0], zyx[:, 1], zyx[:, 2]
+
+    def has_surface(self, first: Tuple[int, int, int], last: Tuple[int, int, int]) -> bool:
+        """
+        False if the samples from the first to the last [z, y, x] inclusive
+        are all outside or all inside, in the bricks that are empty or solid.
+        """
+        size = self.brick_size
+        region = self.index[tuple(slice(first[i] // size, last[i] // size + 1) for i in range(3))]
+        return not (np.all(region == EMPTY) or np.all(region == SOLID))
+
+    def to_dense(self) -> np.ndarray:
+        """The float32 dense grid, for the small resolutions"""
+        axis = np.arange(self.resolution)
+        z, y, x = np.meshgrid(axis, axis, axis, indexing="ij")
+        return self.values(z.ravel(), y.ravel(), x.ravel()).reshape(self.shape)
@@ -0,0 +1,199 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["Camera", "TraceResult", "SphereTracer", "rotation_matrix", "EYE_DISTANCE"]
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+import numpy as np
+
+from .julia_engine import BOUND, JuliaEngine, JuliaParameters
+
+# The eye is this far from the center when Camera Distance is 0
+EYE_DISTANCE = 3.5
+MAX_STEPS = 128
+# The ray stops when the distance is smaller than this part of the pixel cone
+HIT_THRESHOLD = 0.5
+# The closest stop, so the rays near the eye don't march forever
+MIN_EPSILON = 1e-4
+# The normals are sampled this many epsilons back along the ray. The distance
+# is 0 inside, so the samples behind the surface would bend the gradient.
+NORMAL_OFFSET = 4.0
+
+
+def rotation_matrix(degrees: Sequence[float]) -> np.ndarray:
+    """The rotation of the XYZ Euler angles in degrees"""
+    x, y, z = np.radians(np.asarray(degrees, dtype=np.float64))
+    rx = np.array([[1, 0, 0], [0, np.cos(x), -np.sin(x)], [0, np.sin(x), np.cos(x)]])
+    ry = np.array([[np.cos(y), 0, np.sin(y)], [0, 1, 0], [-np.sin(y), 0, np.cos(y)]])
+    rz = np.array([[np.cos(z), -np.sin(z), 0], [np.sin(z), np.cos(z), 0], [0, 0, 1]])
+    return rz @ ry @ rx
+
+
+@dataclass(frozen=True)
+class Camera:
+    """
+    The camera of the "Scene" group. It looks at the center along -z of its
+    orientation from EYE_DISTANCE plus the camera distance.
+    """
+
+    field_of_view: float = 60.0
+    orientation: Tuple[float, float, float] = (0.0, 0.0, 0.0)
+    distance: float = 0.1
+
+    @classmethod
+    def from_store(cls, values) -> "Camera":
+        """The camera from the "Group/Label" values, the missing values are the defaults"""
+
+        def get(name, default):
+            return values.get(name) if name in values else default
+
+        defaults = cls()
+        return cls(
+            field_of_view=float(get("Scene/Field of View", defaults.field_of_view)),
+            orientation=tuple(float(angle) for angle in get("Scene/Orientation", defaults.orientation)),
+            distance=float(get("Scene/Camera Distance", defaults.distance)),
+        )
+
+    @property
+    def tan_half_fov(self) -> float:
+        return float(np.tan(0.5 * np.radians(np.clip(self.field_of_view, 1.0, 179.0))))
+
+    def rays(self, u: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The eye and the (N, 3) unit directions of the rays of the image
+        coordinates, -1..1 along the height.
+        """
+        rotation = rotation_matrix(self.orientation)
+        eye = rotation @ np.array([0.0, 0.0, EYE_DISTANCE + self.distance])
+        tangent = self.tan_half_fov
+        view = np.column_stack((u.ravel() * tangent, v.ravel() * tangent, -np.ones(u.size)))
+        view /= np.linalg.norm(view, axis=1, keepdims=True)
+        return eye, view @ rotation.T
+
+
+@dataclass(frozen=True)
+class TraceResult:
+    """The rays traced to the surface. The arrays are float32 to keep the cached tiles small."""
+
+    # (N,) True where the ray hits the surface
+    hit: np.ndarray
+    # (N,) The distance along the ray, (N, 3) the hit points and the normals
+    depth: np.ndarray
+    points: np.ndarray
+    normals: np.ndarray
+    # (N,) The number of the steps, the rays that pass close to the surface take more
+    steps: np.ndarray
+
+
+class SphereTracer:
+    """
+    Marches all the rays at once with the distance estimate of JuliaEngine.
+    Each step moves the rays by their distance to the set, which never passes
+    the surface. The rays that hit the surface or leave the bounding sphere
+    are dropped from the arrays, so the steps get cheaper as they converge.
+    """
+
+    def __init__(self, parameters: Optional[JuliaParameters] = None, max_steps: int = MAX_STEPS):
+        self.__engine = JuliaEngine(parameters)
+        self.__max_steps = max_steps
+
+    @property
+    def parameters(self) -> JuliaParameters:
+        return self.__engine.parameters
+
+    @property
+    def max_steps(self) -> int:
+        return self.__max_steps
+
+    def trace(
+        self,
+        eye: np.ndarray,
+        directions: np.ndarray,
+        pixel_angle: float = 0.0,
+        epsilon: float = MIN_EPSILON,
+        normals: bool = True,
+    ) -> TraceResult:
+        """
+        Trace the rays from the eye along the (N, 3) unit directions.
+
+        Args:
+            eye: The origin of all the rays, or the (N, 3) origins of each ray
+            pixel_angle: The angle of one pixel. The ray stops when the
+                distance is within the part of its pixel, so the far rays stop
+                earlier and there is no detail smaller than a pixel.
+            epsilon: The ray stops when the distance is smaller than this
+            normals: False skips the normals, e.g. for the shadow rays
+        """
+        count = len(directions)
+        hit = np.zeros(count, dtype=bool)
+        depth = np.zeros(count)
+        steps = np.zeros(count, dtype=np.int16)
+        origins = np.broadcast_to(eye, directions.shape)
+
+        # Only the part of the ray inside the bounding sphere is marched
+        along = np.einsum("nd,nd->n", directions, origins)
+        discriminant = along * along - (np.einsum("nd,nd->n", origins, origins) - BOUND * BOUND)
+        index = np.flatnonzero(discriminant > 0.0)
+        root = np.sqrt(discriminant[index])
+        t = np.maximum(-along[index] - root, 0.0)
+        far = -along[index] + root
+        active = far > 0.0
+        index, t, far = index[active], t[active], far[active]
+
+        for step in range(1, self.__max_steps + 1):
+            if not len(index):
+                break
+            distance = self.__engine.distance(origins[index] + t[:, None] * directions[index])
+            converged = distance < np.maximum(HIT_THRESHOLD * pixel_angle * t, epsilon)
+            t = t + distance
+            left = t >= far
+
+            done = converged | left
+            if done.any():
+                finished = index[done]
+                hit[finished] = converged[done]
+                depth[finished] = t[done]
+                steps[finished] = step
+                keep = ~done
+                index, t, far = index[keep], t[keep], far[keep]
+        else:
+            # Out of the steps near the surface, the grazing rays count as the hits
+            hit[index] = True
+            depth[index] = t
+            steps[index] = self.__max_steps
+
+        points = origins + depth[:, None] * directions
+        gradient = np.zeros((count, 3))
+        hits = np.flatnonzero(hit)
+        if normals and len(hits):
+            offset = np.maximum(pixel_angle * depth[hits], epsilon)
+            outside = points[hits] - (NORMAL_OFFSET * offset)[:, None] * directions[hits]
+            gradient[hits] = self.__normals(outside, offset)
+        return TraceResult(
+            hit, depth.astype(np.float32), points.astype(np.float32), gradient.astype(np.float32), steps
+        )
+
+    def trace_image(self, camera: Camera, width: int, height: int) -> TraceResult:
+        """Trace all the pixels of the image at once. The arrays are in the order of the rows from the top."""
+        scale = 2.0 / height
+        columns = (np.arange(width) + 0.5 - 0.5 * width) * scale
+        rows = (0.5 * height - np.arange(height) - 0.5) * scale
+        eye, directions = camera.rays(*np.meshgrid(columns, rows))
+        return self.trace(eye, directions, scale * camera.tan_half_fov)
+
+    def __normals(self, points: np.ndarray, epsilon: np.ndarray) -> np.ndarray:
+        """The gradient of the distance from the 4 samples of the tetrahedron around each point"""
+        corners = np.array([[1.0, -1.0, -1.0], [-1.0, -1.0, 1.0], [-1.0, 1.0, -1.0], [1.0, 1.0, 1.0]])
+        samples = points[None, :, :] + corners[:, None, :] * epsilon[None, :, None]
+        distance = self.__engine.distance(samples.reshape(-1, 3)).reshape(4, -1)
+        gradient = np.einsum("kn,kd->nd", distance, corners)
+        length = np.linalg.norm(gradient, axis=1, keepdims=True)
+        # Deep inside the distance is 0, the normal points from the center
+        fallback = points / np.maximum(np.linalg.norm(points, axis=1, keepdims=True), 1e-9)
+        return np.where(length > 1e-12, gradient / np.maximum(length, 1e-12), fallback)
@@ -6,11 +6,14 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 #
-__all__ = ["julia_modeler_style"]
+__all__ = ["julia_modeler_style", "get_slider_texture_provider", "release_slider_texture_provider"]
+
+from typing import Optional
 
 from omni.ui import color as cl
 from omni.ui import constant as fl
 from omni.ui import url
+import numpy as np
 import omni.kit.app
 import omni.ui as ui
 import pathlib
@@ -25,6 +28,15 @@ TAIL_WIDTH = 35
 WIN_WIDTH = 400
 WIN_HEIGHT = 930
 
+# The procedural diagonal lines behind the sliders. It's wide enough to be
+# cropped for any slider, so all the sliders share one texture.
+SLIDER_TEXTURE_WIDTH = 2048
+SLIDER_TEXTURE_HEIGHT = 22
+SLIDER_TEXTURE_PERIOD = 27
+SLIDER_TEXTURE_LINE_WIDTH = 8
+SLIDER_TEXTURE_BACKGROUND = 48
+SLIDER_TEXTURE_LINE = 110
+
 # Pre-defined constants. It's possible to change them at runtime.
 cl.window_bg_color = cl(0.2, 0.2, 0.2, 1.0)
 cl.window_title_text = cl(.9, .9, .9, .9)
@@ -64,7 +76,38 @@ url.checkbox_on_icon = f"{EXTENSION_FOLDER_PATH}/icons/checkbox_on.svg"
 url.checkbox_off_icon = f"{EXTENSION_FOLDER_PATH}/icons/checkbox_off.svg"
 url.radio_btn_on_icon = f"{EXTENSION_FOLDER_PATH}/icons/radio_btn_on.svg"
 url.radio_btn_off_icon = f"{EXTENSION_FOLDER_PATH}/icons/radio_btn_off.svg"
-url.diag_bg_lines_texture = f"{EXTENSION_FOLDER_PATH}/icons/diagonal_texture_screenshot.png"
+
+_slider_texture_provider: Optional[ui.ByteImageProvider] = None
+
+
+def generate_slider_texture(width=SLIDER_TEXTURE_WIDTH, height=SLIDER_TEXTURE_HEIGHT) -> np.ndarray:
+    """The RGBA bytes of the diagonal lines, the shape is (height, width, 4)"""
+    phase = (np.arange(width)[np.newaxis, :] + np.arange(height)[:, np.newaxis]) % SLIDER_TEXTURE_PERIOD
+    # One pixel of the antialiasing on both edges of the line
+    coverage = np.clip(np.minimum(phase + 1.0, SLIDER_TEXTURE_LINE_WIDTH - phase), 0.0, 1.0)
+    grey = SLIDER_TEXTURE_BACKGROUND + (SLIDER_TEXTURE_LINE - SLIDER_TEXTURE_BACKGROUND) * coverage
+
+    pixels = np.empty((height, width, 4), dtype=np.uint8)
+    pixels[..., :3] = np.round(grey)[..., np.newaxis]
+    pixels[..., 3] = 255
+    return pixels
+
+
+def get_slider_texture_provider() -> ui.ByteImageProvider:
+    """The texture behind the sliders. It's generated once and shared by all the sliders."""
+    global _slider_texture_provider
+    if _slider_texture_provider is None:
+        pixels = generate_slider_texture()
+        _slider_texture_provider = ui.ByteImageProvider()
+        _slider_texture_provider.set_data_array(pixels, [pixels.shape[1], pixels.shape[0]])
+    return _slider_texture_provider
+
+
+def release_slider_texture_provider():
+    """Drop the shared texture, it's generated again when it's needed"""
+    global _slider_texture_provider
+    _slider_texture_provider = None
+
 
 # The main style dict
 julia_modeler_style = {
@@ -132,8 +175,7 @@ julia_modeler_style = {
     "Image::revert_arrow:disabled": {"color": cl.revert_arrow_disabled},
     "Image::checked": {"image_url": url.checkbox_on_icon},
     "Image::unchecked": {"image_url": url.checkbox_off_icon},
-    "Image::slider_bg_texture": {
-        "image_url": url.diag_bg_lines_texture,
+    "ImageWithProvider::slider_bg_texture": {
         "border_radius": fl.border_radius,
         "corner_flag": ui.CornerFlag.LEFT,
     },
@@ -0,0 +1,19 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+from .test_attribute_store import TestAttributeStore
+from .test_benchmark import TestBenchmark
+from .test_julia_engine import TestJuliaEngine
+from .test_mesh_export import TestMeshExport
+from .test_pipeline import TestPipeline
+from .test_preview_renderer import TestPreviewRenderer
+from .test_result_cache import TestResultCache
+from .test_scheduler import TestScheduler
+from .test_sphere_tracer import TestSphereTracer
+from .test_path_tracer import TestPathTracer
+from .test_sparse_field import TestSparseField
@@ -0,0 +1,145 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+# The same module is in the tests of all the example windows, keep them identical.
+#
+__all__ = ["measure_window", "find_regressions", "run_benchmark"]
+
+from pathlib import Path
+from typing import Callable, Dict
+import carb.settings
+import json
+import statistics
+import time
+import tracemalloc
+import omni.kit.app
+import omni.kit.test
+
+from ..profiler import count_widgets
+
+# The module is omni.example.<name>.tests.benchmark, the extension has the name of the package
+EXTENSION_NAME = __name__.rsplit(".tests", 1)[0]
+EXTENSION_FOLDER_PATH = Path(omni.kit.app.get_app().get_extension_manager().get_extension_path_by_module(__name__))
+BASELINE_PATH = EXTENSION_FOLDER_PATH.joinpath("data/tests/benchmark_baseline.json")
+
+# The settings can be changed from the command line, e.g.
+# --/exts/omni.example.ui_window/benchmark/threshold=0.5
+SETTINGS_PATH = f"/exts/{EXTENSION_NAME}/benchmark"
+DEFAULT_ITERATIONS = 5
+# The allowed regression relative to the baseline
+DEFAULT_THRESHOLD = 0.25
+# The frames to wait for the window to be built
+MAX_BUILD_FRAMES = 10
+
+
+def _get_setting(name, default):
+    value = carb.settings.get_settings().get(f"{SETTINGS_PATH}/{name}")
+    return default if value is None else value
+
+
+async def _wait_for_build(window, builds: int):
+    """Wait until the window is built the given number of times"""
+    for _ in range(MAX_BUILD_FRAMES):
+        await omni.kit.app.get_app().next_update_async()
+        if len(window.profiler.builds) >= builds:
+            return
+    raise TimeoutError(f"The window is not built in {MAX_BUILD_FRAMES} frames")
+
+
+def _create_window(create_fn):
+    """The window that records the time of its builds, without tracemalloc"""
+    return create_fn(profile=True, profile_memory=False)
+
+
+async def _measure_peak_memory(create_fn) -> int:
+    """The peak of Python memory when the window is built and rebuilt"""
+    tracemalloc.start()
+    try:
+        window = _create_window(create_fn)
+        await _wait_for_build(window, 1)
+        window.frame.rebuild()
+        await _wait_for_build(window, 2)
+        peak = tracemalloc.get_traced_memory()[1]
+        window.destroy()
+        await omni.kit.app.get_app().next_update_async()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+async def measure_window(create_fn: Callable, iterations: int) -> dict:
+    """
+    Build, rebuild and destroy the window several times and return the median
+    of the construction, rebuild and destroy time, the peak of Python memory,
+    and the number of widgets. create_fn is called with the profile keywords
+    of the window.
+    """
+    samples = {"construct_ms": [], "rebuild_ms": [], "destroy_ms": [], "peak_memory_bytes": [], "widgets": []}
+    for _ in range(iterations):
+        start = time.perf_counter()
+        window = _create_window(create_fn)
+        created = time.perf_counter() - start
+        await _wait_for_build(window, 1)
+        samples["construct_ms"].append((created + window.profiler.builds[0].wall_time) * 1000.0)
+        samples["widgets"].append(count_widgets(window.frame))
+
+        window.frame.rebuild()
+        await _wait_for_build(window, 2)
+        samples["rebuild_ms"].append(window.profiler.builds[1].wall_time * 1000.0)
+
+        start = time.perf_counter()
+        window.destroy()
+        samples["destroy_ms"].append((time.perf_counter() - start) * 1000.0)
+        await omni.kit.app.get_app().next_update_async()
+
+    # tracemalloc slows down every allocation, so the memory has its own pass
+    # and the time is measured without it
+    for _ in range(iterations):
+        samples["peak_memory_bytes"].append(await _measure_peak_memory(create_fn))
+
+    return {metric: statistics.median(values) for metric, values in samples.items()}
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list:
+    """The descriptions of the metrics that are worse than the baseline by more than threshold"""
+    regressions = []
+    for window_name, metrics in results.items():
+        for metric, value in metrics.items():
+            expected = baseline.get(window_name, {}).get(metric)
+            if expected and value > expected * (1.0 + threshold):
+                regressions.append(f"{window_name}.{metric}: {value:.2f} > {expected:.2f} (+{threshold:.0%})")
+    return regressions
+
+
+async def run_benchmark(test: omni.kit.test.AsyncTestCase, windows: Dict[str, Callable]):
+    """
+    Measure the windows by name, write the results to the test output and
+    compare them with the baseline of the extension. The test is skipped
+    when there is no baseline.
+    """
+    iterations = _get_setting("iterations", DEFAULT_ITERATIONS)
+    threshold = _get_setting("threshold", DEFAULT_THRESHOLD)
+    results = {name: await measure_window(create_fn, iterations) for name, create_fn in windows.items()}
+
+    output_path = Path(_get_setting("output", omni.kit.test.get_test_output_path()))
+    output_path.mkdir(parents=True, exist_ok=True)
+    with open(output_path.joinpath(f"{EXTENSION_NAME}.benchmark.json"), "w") as f:
+        json.dump(results, f, indent=4)
+
+    if _get_setting("update_baseline", False):
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=4)
+        return
+    if not BASELINE_PATH.exists():
+        # The baseline depends on the machine, it's recorded on the machine that runs the benchmark
+        test.skipTest(f"No baseline at {BASELINE_PATH}, record it with --{SETTINGS_PATH}/update_baseline=true")
+
+    with open(BASELINE_PATH) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, threshold)
+    test.assertFalse(regressions, "Performance regressions:\n" + "\n".join(regressions))
@@ -0,0 +1,63 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestAttributeStore"]
+
+from omni.example.ui_julia_modeler.attribute_store import BOOL, INT, AttributeStore
+import omni.kit.test
+
+
+class TestAttributeStore(omni.kit.test.AsyncTestCase):
+    async def test_models(self):
+        """Testing the model adapters read and write the store"""
+        store = AttributeStore()
+        store.add("Scene/Field of View", 60, INT)
+        store.add("Scene/Orientation", [0.0, 0.0, 0.0])
+        store.add("Scene/Antialias", False, BOOL)
+        store.add("Scene/Ambient Falloff", 0, INT, ["Linear", "Quadratic", "Cubic"])
+
+        fov = store.get_model("Scene/Field of View")
+        notified = []
+        fov.add_value_changed_fn(lambda m: notified.append(m.as_int))
+        fov.set_value(90)
+        self.assertEqual(store.get("Scene/Field of View"), 90)
+        self.assertEqual(notified, [90])
+
+        orientation = store.get_model("Scene/Orientation")
+        y = orientation.get_item_children()[1]
+        orientation.get_item_value_model(y).set_value(45.0)
+        self.assertEqual(store.get("Scene/Orientation"), (0.0, 45.0, 0.0))
+
+        falloff = store.get_model("Scene/Ambient Falloff")
+        self.assertEqual(len(falloff.get_item_children()), 3)
+        store.set("Scene/Ambient Falloff", 2)
+        self.assertEqual(falloff.get_item_value_model().as_int, 2)
+
+        store.destroy()
+
+    async def test_bulk(self):
+        """Testing the bulk writes notify only the changed attributes"""
+        store = AttributeStore()
+        for i in range(100):
+            store.add(f"value {i}", float(i))
+        store.add("flag", True, BOOL)
+
+        changed = []
+        store.add_changed_fn(changed.append)
+        preset = store.export()
+
+        store.update({"value 3": 3.0, "value 7": -1.0, "flag": False})
+        self.assertEqual(changed, [["value 7", "flag"]])
+        self.assertEqual(store.changed(), ["value 7", "flag"])
+
+        store.load(preset)
+        self.assertEqual(store.changed(), [])
+        self.assertEqual(changed[-1], ["value 7", "flag"])
+        self.assertEqual(store.get_array()[7], 7.0)
+
+        store.destroy()
@@ -0,0 +1,24 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestBenchmark"]
+
+from omni.example.ui_julia_modeler.style import WIN_WIDTH, WIN_HEIGHT
+from omni.example.ui_julia_modeler.window import JuliaModelerWindow
+from functools import partial
+import omni.kit.test
+
+from .benchmark import run_benchmark
+
+
+class TestBenchmark(omni.kit.test.AsyncTestCase):
+    async def test_benchmark(self):
+        """Measuring the cost of the window and comparing it with the stored baseline"""
+        await run_benchmark(
+            self, {"JuliaModelerWindow": partial(JuliaModelerWindow, "Benchmark", width=WIN_WIDTH, height=WIN_HEIGHT)}
+        )
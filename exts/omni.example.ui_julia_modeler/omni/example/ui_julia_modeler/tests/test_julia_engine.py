@@ -0,0 +1,49 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestJuliaEngine"]
+
+from omni.example.ui_julia_modeler.julia_engine import JuliaEngine, JuliaParameters
+import numpy as np
+import omni.kit.test
+
+
+class TestJuliaEngine(omni.kit.test.AsyncTestCase):
+    async def test_parameters(self):
+        """Testing the parameters are read from the window values"""
+        parameters = JuliaParameters.from_store({"Calculations/Precision": 2, "Parameters/Iterations": -0.5})
+        self.assertEqual(parameters.grid_resolution, 64)
+        self.assertEqual(parameters.c, (-0.5, 0.65, 0.25, 0.55))
+        self.assertEqual(parameters.iterations, JuliaParameters().iterations)
+
+    async def test_evaluate(self):
+        """Testing the escape iterations and the distance estimate"""
+        # With c = 0 the set is the unit ball
+        engine = JuliaEngine(JuliaParameters(iterations=20, real=0.0, i=0.0, j=0.0, k=0.0), batch_size=7)
+        escape, distance = engine.evaluate([[0.0, 0.0, 0.0], [0.5, 0.0, 0.0], [3.0, 0.0, 0.0], [1.5, 0.0, 0.0]])
+        self.assertEqual(escape.tolist(), [20, 20, 1, 2])
+        self.assertEqual(distance[:2].tolist(), [0.0, 0.0])
+        # The estimate is within a factor of 2 of the real distance to the ball
+        self.assertTrue(1.0 < distance[2] < 4.0)
+        self.assertTrue(0.25 < distance[3] < 1.0)
+        # The point that doesn't escape is in the set even if |q| > 1 at the last iteration
+        escape, distance = engine.evaluate([[1.0000001, 0.0, 0.0]])
+        self.assertEqual((escape[0], distance[0]), (20, 0.0))
+
+        # The batches don't change the results
+        points = np.random.default_rng(0).uniform(-2.0, 2.0, (1000, 3))
+        batched = engine.distance(points)
+        self.assertTrue(np.array_equal(batched, JuliaEngine(engine.parameters).distance(points)))
+
+    async def test_distance_field(self):
+        """Testing the grid is sampled like the points"""
+        engine = JuliaEngine(batch_size=100)
+        field = engine.distance_field(8)
+        self.assertEqual(field.shape, (8, 8, 8))
+        # The corner cell [z=7, y=0, x=0]
+        self.assertAlmostEqual(float(field[7, 0, 0]), engine.distance([[-1.75, -1.75, 1.75]])[0], places=5)
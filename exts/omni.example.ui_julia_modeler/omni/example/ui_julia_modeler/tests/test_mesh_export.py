@@ -0,0 +1,100 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestMeshExport"]
+
+from collections import Counter
+from omni.example.ui_julia_modeler.julia_engine import BOUND, JuliaParameters
+from omni.example.ui_julia_modeler.mesh_export import (
+    _can_use_processes, _get_python_executable, export_mesh, extract_chunk
+)
+from unittest import mock
+import os
+import sys
+import tempfile
+import omni.kit.test
+
+
+def _read_obj(path):
+    vertices = []
+    faces = []
+    with open(path) as f:
+        for line in f:
+            if line.startswith("v "):
+                vertices.append(tuple(float(v) for v in line.split()[1:]))
+            elif line.startswith("f "):
+                faces.append(tuple(int(i) - 1 for i in line.split()[1:]))
+    return vertices, faces
+
+
+class TestMeshExport(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+
+    async def tearDown(self):
+        self._temp_dir.cleanup()
+
+    async def test_stitching(self):
+        """Testing the chunks are stitched to the same closed mesh"""
+        parameters = JuliaParameters(precision=1)
+        meshes = []
+        for chunk_size in (7, 100):
+            path = os.path.join(self._temp_dir.name, f"mesh{chunk_size}.obj")
+            result = export_mesh(path, parameters, chunk_size=chunk_size, use_processes=False)
+            vertices, faces = _read_obj(path)
+            self.assertEqual((result.vertices, result.faces), (len(vertices), len(faces)))
+            meshes.append((sorted(vertices), len(faces)))
+
+            # Each edge of the closed mesh is also the edge of the face on the other side
+            edges = Counter((face[i], face[(i + 1) % 4]) for face in faces for i in range(4))
+            self.assertTrue(all((b, a) in edges for a, b in edges))
+
+        self.assertEqual(meshes[0], meshes[1])
+
+    async def test_sparse(self):
+        """Testing the sparse field exports the same mesh as the dense grid"""
+        parameters = JuliaParameters()
+        # The sample in the center of the grid is in the set, the estimate around it doesn't show it
+        resolution = 57
+        result = export_mesh(
+            os.path.join(self._temp_dir.name, "mesh.obj"), parameters, resolution, use_processes=False
+        )
+        ids, vertices, quads = extract_chunk(parameters, resolution, BOUND, (0, 0, 0), (resolution - 1,) * 3)
+        self.assertEqual((result.vertices, result.faces), (len(vertices), len(quads)))
+
+    async def test_formats(self):
+        """Testing the PLY and USDA files and the unknown extension"""
+        parameters = JuliaParameters(precision=1)
+        result = export_mesh(os.path.join(self._temp_dir.name, "mesh.ply"), parameters, use_processes=False)
+        with open(result.path, "rb") as f:
+            self.assertIn(f"element face {result.faces}".encode(), f.read(512))
+
+        result = export_mesh(os.path.join(self._temp_dir.name, "mesh.usd"), parameters, use_processes=False)
+        with open(result.path) as f:
+            text = f.read()
+        self.assertTrue(text.startswith("#usda 1.0"))
+        self.assertTrue(text.endswith(")]\n}\n"))
+
+        with self.assertRaises(ValueError):
+            export_mesh(os.path.join(self._temp_dir.name, "mesh.stl"), parameters)
+
+    async def test_python_executable(self):
+        """Testing the child processes use the bundled Python when sys.executable is the application"""
+        folder = self._temp_dir.name
+        python = os.path.join(folder, "python.exe" if sys.platform == "win32" else os.path.join("bin", "python3"))
+        os.makedirs(os.path.dirname(python), exist_ok=True)
+        open(python, "w").close()
+        os.chmod(python, 0o755)
+
+        with mock.patch.object(sys, "executable", os.path.join(folder, "kit")):
+            with mock.patch.object(sys, "prefix", folder):
+                self.assertEqual(_get_python_executable(), python)
+                self.assertTrue(_can_use_processes())
+            with mock.patch.object(sys, "prefix", os.path.join(folder, "missing")):
+                self.assertIsNone(_get_python_executable())
+                self.assertFalse(_can_use_processes())
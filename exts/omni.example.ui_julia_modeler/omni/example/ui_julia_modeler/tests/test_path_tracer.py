@@ -0,0 +1,68 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestPathTracer"]
+
+from omni.example.ui_julia_modeler.julia_pipeline import create_julia_pipeline
+from omni.example.ui_julia_modeler.path_tracer import PathTracer
+import asyncio
+import numpy as np
+import omni.kit.test
+
+MAX_WAIT = 30.0
+# With c = 0 the set is the unit ball
+BALL = {
+    "Calculations/Iterations": 20,
+    "Parameters/Iterations": 0.0,
+    "Parameters/i": 0.0,
+    "Parameters/j": 0.0,
+    "Parameters/k": 0.0,
+    "Scene/Background Color": (0.0, 0.0, 0.0),
+}
+
+
+async def _wait_done(renderer: PathTracer):
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + MAX_WAIT
+    while not renderer.done:
+        renderer.take_tiles()
+        if loop.time() > deadline:
+            raise TimeoutError(f"The samples are not accumulated in {MAX_WAIT} seconds")
+        await asyncio.sleep(0.01)
+    renderer.take_tiles()
+
+
+class TestPathTracer(omni.kit.test.AsyncTestCase):
+    async def test_accumulate(self):
+        """Testing the samples are accumulated and only the values of its stages restart them"""
+        values = dict(BALL)
+        pipeline = create_julia_pipeline(values)
+        renderer = PathTracer(width=32, height=32, pipeline=pipeline, samples=3)
+        renderer.request()
+        await _wait_done(renderer)
+        self.assertEqual(renderer.sample_count, 3)
+        # The ball is lit in the center, the background is black
+        self.assertGreater(int(renderer.pixels[16, 16, :3].max()), 64)
+        self.assertEqual(renderer.pixels[0, 0, :3].tolist(), [0, 0, 0])
+
+        # The ambient occlusion is not its stage
+        values["Scene/Ambient Falloff"] = 2
+        pipeline.invalidate(["Scene/Ambient Falloff"])
+        renderer.request()
+        self.assertTrue(renderer.done)
+        self.assertEqual(renderer.sample_count, 3)
+
+        values["Light 1/Intensity"] = 0.0
+        pipeline.invalidate(["Light 1/Intensity"])
+        renderer.request()
+        self.assertFalse(renderer.done)
+        await _wait_done(renderer)
+        self.assertEqual(renderer.sample_count, 3)
+        # No light and the black background
+        self.assertTrue(np.all(renderer.pixels[..., :3] == 0))
+        renderer.destroy()
@@ -0,0 +1,64 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestPipeline"]
+
+from omni.example.ui_julia_modeler.julia_pipeline import create_julia_pipeline
+from omni.example.ui_julia_modeler.pipeline import Pipeline
+import omni.kit.test
+
+
+class TestPipeline(omni.kit.test.AsyncTestCase):
+    async def test_graph(self):
+        """Testing only the stages of the changed parameters are computed again"""
+        values = {"a": 1}
+        pipeline = Pipeline(values)
+        pipeline.add_stage("first", lambda p: p["a"] * 10, parameters={"a": 0})
+        pipeline.add_stage("second", lambda p, first: first + p["b"], ["first"], {"b": 2})
+        pipeline.add_stage("other", lambda p: p["c"], parameters={"c": 3})
+        with self.assertRaises(ValueError):
+            pipeline.add_stage("broken", lambda p, x: x, ["missing"])
+
+        self.assertEqual(pipeline.get("second"), 12)
+        values["b"] = 5
+        self.assertEqual(pipeline.invalidate(["b", "unknown"]), ["second"])
+        self.assertEqual(pipeline.get("second"), 15)
+        self.assertEqual(pipeline.get_compute_count("first"), 1)
+
+        values["a"] = 2
+        self.assertEqual(pipeline.invalidate(["a"]), ["first", "second"])
+        self.assertEqual(pipeline.get("second"), 25)
+        self.assertEqual(pipeline.get("other"), 3)
+        self.assertEqual(pipeline.get_stages("b"), ["second"])
+
+    async def test_julia(self):
+        """Testing each value dirties only its stages and the stages after them"""
+        values = {"Calculations/Precision": 1}
+        pipeline = create_julia_pipeline(values)
+        for stage in pipeline.stages:
+            pipeline.get(stage)
+
+        changes = {
+            "Light 1/Color": ((1.0, 0.0, 0.0), ["lighting", "compositing"]),
+            "Scene/Background Color": ((0.0, 0.0, 0.0), ["compositing"]),
+            "Scene/Ambient Falloff": (2, ["ambient_occlusion", "compositing"]),
+            "Scene/Ambient Distance": ((0.0, 100.0), ["ambient_samples"]),
+            "Scene/Field of View": (90, ["camera", "surface", "ambient_samples"]),
+            "Parameters/i": (0.5, ["geometry", "surface", "ambient_samples"]),
+        }
+        for name, (value, stages) in changes.items():
+            values[name] = value
+            self.assertEqual(pipeline.invalidate([name]), stages, name)
+            for stage in stages:
+                pipeline.get(stage)
+
+        self.assertEqual(pipeline.get_compute_count("geometry"), 2)
+        self.assertEqual(pipeline.get_compute_count("surface"), 3)
+        self.assertEqual(pipeline.get("surface").camera.field_of_view, 90.0)
+        self.assertEqual(pipeline.get("ambient_samples").ambient_distance, (0.0, 100.0))
+        self.assertEqual(pipeline.get("compositing").lighting.color, (1.0, 0.0, 0.0))
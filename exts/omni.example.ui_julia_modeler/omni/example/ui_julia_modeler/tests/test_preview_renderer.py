@@ -0,0 +1,133 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestPreviewRenderer"]
+
+from omni.example.ui_julia_modeler.julia_pipeline import (
+    AmbientSampler, Compositing, TracedSurface, create_julia_pipeline
+)
+from omni.example.ui_julia_modeler.preview_renderer import PreviewRenderer
+from omni.example.ui_julia_modeler.result_cache import ResultCache
+from unittest import mock
+import asyncio
+import numpy as np
+import threading
+import omni.kit.test
+
+MAX_WAIT = 10.0
+
+
+async def _wait_done(renderer: PreviewRenderer):
+    """Copy the tiles until the renderer is done"""
+    loop = asyncio.get_event_loop()
+    deadline = loop.time() + MAX_WAIT
+    while not renderer.done:
+        renderer.take_tiles()
+        if loop.time() > deadline:
+            raise TimeoutError(f"The preview is not rendered in {MAX_WAIT} seconds")
+        await asyncio.sleep(0.01)
+    renderer.take_tiles()
+
+
+class TestPreviewRenderer(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._values = {"Calculations/Precision": 1}
+        self._pipeline = create_julia_pipeline(self._values)
+
+    def _set(self, name, value):
+        self._values[name] = value
+        self._pipeline.invalidate([name])
+
+    async def test_render(self):
+        """Testing the tiles are rendered and the last request wins"""
+        renderer = PreviewRenderer(width=48, height=32, pipeline=self._pipeline, tile_size=16, passes=(4, 1))
+        self._set("Scene/Background Color", (0.0, 0.0, 0.0))
+        renderer.request()
+        self._set("Scene/Background Color", (1.0, 0.0, 0.0))
+        renderer.request()
+        await _wait_done(renderer)
+
+        self.assertEqual(renderer.pixels.shape, (32, 48, 4))
+        # The corners miss the set and show the background of the last request only
+        for corner in (renderer.pixels[0, 0], renderer.pixels[-1, -1]):
+            self.assertEqual(corner.tolist(), [255, 0, 0, 255])
+        # The center is the lit fractal
+        self.assertNotEqual(renderer.pixels[16, 24, :3].tolist(), [255, 0, 0])
+        renderer.destroy()
+
+    async def test_stale_geometry(self):
+        """Testing the tile is not shaded when the values change while its surface is traced"""
+        started = threading.Event()
+        release = threading.Event()
+        shaded = []
+        trace = TracedSurface.trace
+        shade = Compositing.shade
+
+        def trace_fn(surface, u, v):
+            if surface.parameters.theta != 0.5:
+                started.set()
+                release.wait(MAX_WAIT)
+            return trace(surface, u, v)
+
+        def shade_fn(compositing, *args):
+            shaded.append(compositing.background_color[0])
+            return shade(compositing, *args)
+
+        renderer = PreviewRenderer(width=16, height=16, pipeline=self._pipeline, tile_size=16, passes=(1,),
+                                   max_workers=1)
+        with mock.patch.object(TracedSurface, "trace", autospec=True, side_effect=trace_fn), \
+                mock.patch.object(Compositing, "shade", autospec=True, side_effect=shade_fn):
+            self._set("Scene/Background Color", (0.0, 0.0, 0.0))
+            renderer.request()
+            self.assertTrue(await asyncio.get_event_loop().run_in_executor(None, started.wait, MAX_WAIT))
+            self._set("Scene/Background Color", (1.0, 0.0, 0.0))
+            self._set("Parameters/Theta", 0.5)
+            renderer.request()
+            release.set()
+            await _wait_done(renderer)
+
+        self.assertEqual(shaded, [1.0])
+        renderer.destroy()
+
+    async def test_stages(self):
+        """Testing the tiles trace and sample only the stages the changed values dirty"""
+        renderer = PreviewRenderer(width=32, height=32, pipeline=self._pipeline, tile_size=16, passes=(1,),
+                                   cache=ResultCache())
+        trace_patch = mock.patch.object(TracedSurface, "trace", autospec=True, side_effect=TracedSurface.trace)
+        sample_patch = mock.patch.object(AmbientSampler, "sample", autospec=True, side_effect=AmbientSampler.sample)
+        with trace_patch as traced, sample_patch as sampled:
+
+            async def render(name=None, value=None):
+                if name:
+                    self._set(name, value)
+                renderer.request()
+                await _wait_done(renderer)
+                return renderer.pixels[..., :3].astype(np.int32)
+
+            images = [await render()]
+            for falloff, occlusion in ((2, True), (2, False)):
+                self._set("Scene/Ambient Falloff", falloff)
+                images.append(await render("Scene/Ambient Occlusion", occlusion))
+            background = await render("Scene/Background Color", (0.0, 0.0, 0.0))
+            # 2 by 2 tiles, the light, the colors and the occlusion weights only composite them again
+            self.assertEqual((traced.call_count, sampled.call_count), (4, 4))
+
+            await render("Scene/Ambient Distance", (0.0, 100.0))
+            self.assertEqual((traced.call_count, sampled.call_count), (4, 8))
+            await render("Scene/Field of View", 30)
+            self.assertEqual((traced.call_count, sampled.call_count), (8, 12))
+            # The tiles of the previous camera are in the ResultCache
+            await render("Scene/Field of View", 60)
+            self.assertEqual((traced.call_count, sampled.call_count), (8, 12))
+
+        self.assertEqual(background[0, 0].tolist(), [0, 0, 0])
+        # The occlusion only darkens, the cubic falloff weights the near samples more
+        self.assertTrue(np.all(images[0] <= images[2]))
+        self.assertTrue(np.all(images[1] <= images[2]))
+        self.assertLess(images[0].sum(), images[2].sum())
+        renderer.destroy()
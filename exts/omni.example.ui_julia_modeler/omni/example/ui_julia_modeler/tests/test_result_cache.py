@@ -0,0 +1,115 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestResultCache"]
+
+from omni.example.ui_julia_modeler.julia_engine import JuliaParameters
+from omni.example.ui_julia_modeler.pipeline import Pipeline
+from omni.example.ui_julia_modeler.result_cache import ResultCache, stable_hash
+from omni.example.ui_julia_modeler.sphere_tracer import TraceResult
+from unittest import mock
+import numpy as np
+import os
+import tempfile
+import threading
+import omni.kit.test
+
+
+class TestResultCache(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+
+    async def tearDown(self):
+        self._temp_dir.cleanup()
+
+    async def test_tiers(self):
+        """Testing the least recently used results are spilled to the disk and evicted by size"""
+        cache = ResultCache(memory_budget=2000, disk_path=self._temp_dir.name, disk_budget=1500)
+        for i in range(4):
+            cache.put(stable_hash("field", i), np.full(100, i, dtype=np.float64))
+        self.assertLessEqual(cache.memory_bytes, 2000)
+        self.assertLessEqual(cache.disk_bytes, 1500)
+
+        # The first one is evicted from the disk, the second one is spilled to it
+        self.assertIsNone(cache.get(stable_hash("field", 0)))
+        self.assertEqual(cache.get(stable_hash("field", 1))[0], 1)
+        self.assertEqual(cache.stats["disk_hits"], 1)
+        # The cached arrays are shared, so they are read-only
+        self.assertFalse(cache.get(stable_hash("field", 3)).flags.writeable)
+
+        # The disk tier is found by the next session
+        next_session = ResultCache(memory_budget=2000, disk_path=self._temp_dir.name, disk_budget=1500)
+        self.assertGreater(next_session.disk_bytes, 0)
+        next_session.clear()
+        self.assertEqual(next_session.disk_bytes, 0)
+
+    async def test_disk_format(self):
+        """Testing the results on the disk are loaded without pickle"""
+        cache = ResultCache(memory_budget=0, disk_path=self._temp_dir.name)
+        trace = TraceResult(*(np.arange(4, dtype=np.float32) + i for i in range(5)))
+        cache.put("trace", (trace, JuliaParameters(precision=2), {"count": np.int64(3)}))
+        # The objects can't be loaded without pickle, so they are not spilled
+        cache.put("objects", np.array([object()]))
+
+        self.assertEqual(sorted(os.listdir(self._temp_dir.name)), ["trace.npz"])
+        with np.load(os.path.join(self._temp_dir.name, "trace.npz"), allow_pickle=False) as data:
+            self.assertIn("layout", data.files)
+
+        next_session = ResultCache(memory_budget=1 << 20, disk_path=self._temp_dir.name)
+        loaded_trace, parameters, extra = next_session.get("trace")
+        self.assertIsInstance(loaded_trace, TraceResult)
+        np.testing.assert_array_equal(loaded_trace.normals, trace.normals)
+        self.assertEqual(loaded_trace.depth.dtype, np.float32)
+        self.assertFalse(loaded_trace.hit.flags.writeable)
+        self.assertEqual(parameters, JuliaParameters(precision=2))
+        self.assertEqual(extra, {"count": 3})
+        self.assertIsNone(next_session.get("objects"))
+
+    async def test_spill_unlocked(self):
+        """Testing the cache is used by the other threads while the spilled result is written"""
+        cache = ResultCache(memory_budget=1000, disk_path=self._temp_dir.name)
+        cache.put("cached", np.zeros(10))
+        writing = threading.Event()
+        release = threading.Event()
+        savez = np.savez
+
+        def slow_savez(*args, **kwargs):
+            writing.set()
+            release.wait(5.0)
+            savez(*args, **kwargs)
+
+        with mock.patch.object(np, "savez", slow_savez):
+            spill = threading.Thread(target=cache.put, args=("big", np.zeros(1000)))
+            spill.start()
+            self.assertTrue(writing.wait(5.0))
+            # The lock is free and the result that is being written is still found
+            self.assertEqual(len(cache.get("cached")), 10)
+            self.assertIn("big", cache)
+            self.assertEqual(len(cache.get("big")), 1000)
+            release.set()
+            spill.join()
+        self.assertGreater(cache.disk_bytes, 0)
+
+    async def test_revert(self):
+        """Testing reverting the parameter takes the value from the cache"""
+        self.assertEqual(stable_hash({"a": (1.0, 2.0)}), stable_hash({"a": [1.0, 2.0]}))
+
+        values = {"size": 10}
+        pipeline = Pipeline(values, ResultCache())
+        pipeline.add_stage("field", lambda p: np.zeros(p["size"]), parameters={"size": 1})
+        pipeline.add_stage("sum", lambda p, field: float(field.sum() + p["offset"]), ["field"], {"offset": 0.0})
+
+        pipeline.get("sum")
+        for size in (20, 10, 20):
+            values["size"] = size
+            pipeline.invalidate(["size"])
+            self.assertEqual(len(pipeline.get("field")), size)
+            pipeline.get("sum")
+        self.assertEqual(pipeline.get_compute_count("field"), 2)
+        self.assertEqual(pipeline.get_compute_count("sum"), 2)
+        self.assertEqual(pipeline.get_revision("field"), 4)
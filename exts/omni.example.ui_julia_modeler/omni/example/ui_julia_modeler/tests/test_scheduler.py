@@ -0,0 +1,69 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestScheduler"]
+
+import threading
+
+from omni.example.ui_julia_modeler.scheduler import EXPORT, PREVIEW, REFINEMENT, ComputeScheduler
+import omni.kit.app
+import omni.kit.test
+
+
+class TestScheduler(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        # One worker, so the order of the jobs is the order of the priorities
+        self.scheduler = ComputeScheduler(max_workers=1)
+
+    async def tearDown(self):
+        self.scheduler.destroy()
+
+    async def _wait(self):
+        for _ in range(1000):
+            await omni.kit.app.get_app().next_update_async()
+            if not self.scheduler.busy:
+                return
+        self.fail("The scheduler is still busy")
+
+    async def test_coalesce(self):
+        """Testing the changes of one frame are delivered once"""
+        changes = []
+        self.scheduler.add_changed_fn(changes.append)
+        self.scheduler.notify(["Parameters/i"])
+        self.scheduler.notify(["Parameters/j"])
+        self.scheduler.notify(["Parameters/i"])
+        await self._wait()
+
+        self.assertEqual(changes, [["Parameters/i", "Parameters/j"]])
+        stats = self.scheduler.stats
+        self.assertEqual(stats["notified"], 3)
+        self.assertEqual(stats["coalesced"], 1)
+
+    async def test_priority(self):
+        """Testing the preview runs before the refinement and the export, and the superseded job doesn't run"""
+        gate = threading.Event()
+        order = []
+        delivered = []
+        self.scheduler.submit(gate.wait, priority=PREVIEW)
+        self.scheduler.submit(order.append, "export", priority=EXPORT, done_fn=delivered.append)
+        self.scheduler.submit(order.append, "refinement", priority=REFINEMENT)
+        self.scheduler.submit(order.append, "old", priority=PREVIEW, key="tile")
+        self.scheduler.submit(order.append, "preview", priority=PREVIEW, key="tile")
+        self.assertGreaterEqual(self.scheduler.queue_depth, 4)
+        gate.set()
+        await self._wait()
+
+        self.assertEqual(order, ["preview", "refinement", "export"])
+        self.assertEqual(len(delivered), 1)
+        self.assertTrue(delivered[0].done())
+        stats = self.scheduler.stats
+        self.assertEqual(stats["superseded"], 1)
+        self.assertEqual(stats["completed"], 4)
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["latency"]["export"]["count"], 1)
+        self.assertGreaterEqual(stats["latency"]["export"]["max_ms"], stats["wait"]["export"]["max_ms"])
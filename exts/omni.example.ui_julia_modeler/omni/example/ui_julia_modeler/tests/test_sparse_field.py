@@ -0,0 +1,61 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestSparseField"]
+
+from omni.example.ui_julia_modeler.julia_engine import JuliaEngine, JuliaParameters
+from omni.example.ui_julia_modeler.sparse_field import EMPTY, SparseDistanceField
+import numpy as np
+import os
+import tempfile
+import omni.kit.test
+
+
+class TestSparseField(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.parameters = JuliaParameters(precision=2)
+
+    async def tearDown(self):
+        self._temp_dir.cleanup()
+
+    async def test_dense(self):
+        """Testing the field is the dense one near the surface, and the far bricks are not stored"""
+        field = SparseDistanceField.build(self.parameters)
+        dense = JuliaEngine(self.parameters).distance_field()
+        sparse = field.to_dense()
+        self.assertEqual(sparse.shape, dense.shape)
+
+        near = dense < 2.0 * field.step
+        self.assertTrue(np.allclose(sparse[near], dense[near]))
+        # The empty bricks keep the estimate of the distance, it's far too
+        self.assertTrue(np.all(sparse[~near] > field.step))
+        self.assertTrue(np.any(field.index == EMPTY))
+        self.assertLess(field.nbytes, field.dense_nbytes)
+
+        points = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 10.0]])
+        self.assertEqual(field.sample(points)[0], sparse[32, 32, 32])
+        self.assertGreater(field.sample(points)[1], 8.0)
+
+    async def test_save(self):
+        """Testing the saved and the streamed fields are memory-mapped and the same"""
+        field = SparseDistanceField.build(self.parameters, dtype=np.float16)
+        path = os.path.join(self._temp_dir.name, "saved")
+        field.save(path)
+        saved = SparseDistanceField.open(path)
+        streamed = SparseDistanceField.build(
+            self.parameters, dtype=np.float16, path=os.path.join(self._temp_dir.name, "streamed")
+        )
+
+        for other in (saved, streamed):
+            self.assertIsInstance(other.bricks, np.memmap)
+            self.assertEqual(other.bricks.dtype, np.float16)
+            self.assertTrue(np.array_equal(other.index, field.index))
+            self.assertTrue(np.array_equal(other.to_dense(), field.to_dense()))
+        self.assertEqual(os.path.getsize(os.path.join(path, "bricks.bin")), field.bricks.nbytes)
+        self.assertFalse(np.any(field.index[tuple(field.boundary_bricks().T)] == EMPTY))
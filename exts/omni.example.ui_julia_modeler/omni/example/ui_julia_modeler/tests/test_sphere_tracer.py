@@ -0,0 +1,54 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestSphereTracer"]
+
+from omni.example.ui_julia_modeler.julia_engine import JuliaParameters
+from omni.example.ui_julia_modeler.sphere_tracer import EYE_DISTANCE, Camera, SphereTracer
+import numpy as np
+import omni.kit.test
+
+# With c = 0 the set is the unit ball
+BALL = JuliaParameters(iterations=20, real=0.0, i=0.0, j=0.0, k=0.0)
+
+
+class TestSphereTracer(omni.kit.test.AsyncTestCase):
+    async def test_ball(self):
+        """Testing the rays stop at the unit ball and the normals face the camera"""
+        tracer = SphereTracer(BALL)
+        for orientation in [(0.0, 0.0, 0.0), (30.0, 90.0, 0.0)]:
+            camera = Camera(orientation=orientation, distance=0.5)
+            # The center, the ray that misses the ball, and the ray that misses the bounding sphere
+            u = np.array([[0.0, 0.5, 1.0]])
+            eye, directions = camera.rays(u, np.zeros_like(u))
+            result = tracer.trace(eye, directions, 1e-3)
+
+            self.assertEqual(result.hit.tolist(), [True, False, False])
+            self.assertAlmostEqual(float(result.depth[0]), EYE_DISTANCE + 0.5 - 1.0, delta=0.01)
+            np.testing.assert_allclose(result.normals[0], eye / np.linalg.norm(eye), atol=0.02)
+
+    async def test_field_of_view(self):
+        """Testing the wider field of view makes the ball smaller"""
+        tracer = SphereTracer(BALL)
+        axis = np.linspace(-1.0, 1.0, 33)
+        u, v = np.meshgrid(axis, axis)
+        coverage = []
+        for field_of_view in (30.0, 90.0):
+            eye, directions = Camera(field_of_view=field_of_view).rays(u, v)
+            coverage.append(tracer.trace(eye, directions).hit.mean())
+        self.assertGreater(coverage[0], coverage[1])
+
+    async def test_image(self):
+        """Testing the image is traced with one ray per pixel, the ball in the center"""
+        result = SphereTracer(BALL).trace_image(Camera(), 48, 32)
+        self.assertEqual(result.hit.shape, (48 * 32,))
+        hit = result.hit.reshape(32, 48)
+        self.assertTrue(hit[16, 24])
+        self.assertFalse(hit[0, 0])
+        # The ball is round in the image
+        self.assertEqual(hit[16].sum(), hit[:, 24].sum())
@@ -8,6 +8,10 @@
 #
 __all__ = ["JuliaModelerWindow"]
 
+from contextlib import contextmanager
+from functools import partial
+import threading
+
 import omni.ui as ui
 from omni.kit.window.popup_dialog import MessageDialog
 
@@ -18,6 +22,17 @@ from .custom_multifield_widget import CustomMultifieldWidget
 from .custom_path_button import CustomPathButtonWidget
 from .custom_radio_collection import CustomRadioCollection
 from .custom_slider_widget import CustomSliderWidget
+from .attribute_store import BOOL, FLOAT, INT, AttributeStore
+from .julia_engine import JuliaEngine, JuliaParameters
+from .julia_pipeline import GEOMETRY, create_julia_pipeline
+from .mesh_export import export_mesh
+from .path_tracer import PathTracer
+from .pipeline import Pipeline
+from .result_cache import ResultCache
+from .preview_renderer import PATH_TRACED, RENDER_METHOD, PreviewRenderer
+from .profiler import BuildProfiler
+from .scheduler import EXPORT, ComputeScheduler
+from .snapshot import ModelRegistry
 from .style import julia_modeler_style, ATTR_LABEL_WIDTH
 
 SPACING = 5
@@ -28,6 +43,43 @@ class JuliaModelerWindow(ui.Window):
 
     def __init__(self, title: str, delegate=None, **kwargs):
         self.__label_width = ATTR_LABEL_WIDTH
+        # The custom widgets of the window, their labels follow label_width
+        self.__widgets = []
+        # Opt-in, records the cost of each section builder, only the time with profile_memory=False
+        self.__profiler = BuildProfiler(kwargs.pop("profile", False), kwargs.pop("profile_memory", True))
+        # The computed results by their parameters. It can be shared, so it's
+        # kept when the window is closed.
+        cache = kwargs.pop("cache", None)
+        self.__cache = cache if cache is not None else ResultCache()
+        # The values of the widgets, they are kept when the window is rebuilt
+        self.__store = AttributeStore()
+        # The models of the widgets, saved and restored with snapshots
+        self.__models = ModelRegistry()
+        # The group the widgets are built in, their models are registered under it
+        self.__group = ""
+        # Evaluates the fractal with the values of the window
+        self.__engine = JuliaEngine()
+        # The stages that are computed from the values, only the ones of the changed values are dirty
+        self.__pipeline = create_julia_pipeline(self.__store, self.__cache)
+        # Coalesces the changes of the frame and runs the preview and the export by priority
+        self.__scheduler = ComputeScheduler()
+        self.__scheduler.add_changed_fn(self._on_frame_changes)
+        self.__scheduler.add_frame_fn(self._on_frame)
+        # Renders the preview from the stages on the worker threads, the image shows the finished tiles
+        self.__renderer = PreviewRenderer(
+            pipeline=self.__pipeline, cache=self.__cache, submit_fn=self.__scheduler.submit
+        )
+        # Accumulates the samples of the "Path Traced" render method
+        self.__path_tracer = PathTracer(
+            pipeline=self.__pipeline, cache=self.__cache, submit_fn=self.__scheduler.submit
+        )
+        # The one of them that renders the image now
+        self.__active_renderer = self.__renderer
+        self.__preview_provider = ui.ByteImageProvider()
+        self.__store.add_changed_fn(self._on_values_changed)
+        # The running export and the event that stops it
+        self.__export_job = None
+        self.__export_cancel = None
 
         super().__init__(title, **kwargs)
 
@@ -38,6 +90,17 @@ class JuliaModelerWindow(ui.Window):
         self.frame.set_build_fn(self._build_fn)
 
     def destroy(self):
+        if self.__export_cancel:
+            self.__export_cancel.set()
+        self.__renderer.destroy()
+        self.__path_tracer.destroy()
+        self.__active_renderer = None
+        self.__scheduler.destroy()
+        self.__preview_provider = None
+        self.__profiler.destroy()
+        self.__pipeline.destroy()
+        self.__models.destroy()
+        self.__store.destroy()
         # Destroys all the children
         super().destroy()
 
@@ -50,18 +113,162 @@ class JuliaModelerWindow(ui.Window):
     def label_width(self, value):
         """The width of the attribute label"""
         self.__label_width = value
-        self.frame.rebuild()
+        # Only the width is changed, so the labels are updated in place
+        for widget in self.__widgets:
+            widget.label_width = value
+
+    @property
+    def profiler(self) -> BuildProfiler:
+        """The profiler of the section builders. Set `profiler.enabled` to start recording."""
+        return self.__profiler
+
+    @property
+    def store(self) -> AttributeStore:
+        """The values of the widgets by "Group/Label" name, for the bulk reads and writes"""
+        return self.__store
+
+    @property
+    def parameters(self) -> JuliaParameters:
+        """The fractal parameters of the "Calculations" and "Parameters" groups"""
+        return self.__pipeline.get(GEOMETRY)
+
+    @property
+    def engine(self) -> JuliaEngine:
+        """The evaluator of the fractal with the current values of the window"""
+        parameters = self.parameters
+        if self.__engine.parameters != parameters:
+            self.__engine.parameters = parameters
+        return self.__engine
+
+    @property
+    def pipeline(self) -> Pipeline:
+        """The stages of the modeler the preview is rendered from, e.g. `pipeline.get("geometry")` is the fractal"""
+        return self.__pipeline
+
+    @property
+    def cache(self) -> ResultCache:
+        """The cache of the pipeline and the preview"""
+        return self.__cache
+
+    @property
+    def scheduler(self) -> ComputeScheduler:
+        """The scheduler of the compute, `scheduler.stats` shows if it's behind the input"""
+        return self.__scheduler
+
+    @property
+    def renderer(self) -> PreviewRenderer:
+        """The renderer of the preview image"""
+        return self.__renderer
+
+    @property
+    def path_tracer(self) -> PathTracer:
+        """The renderer of the preview image with the "Path Traced" render method"""
+        return self.__path_tracer
+
+    @property
+    def models(self) -> ModelRegistry:
+        """The models of the widgets by "Group/Label" key"""
+        return self.__models
+
+    def snapshot(self) -> bytes:
+        """Save the values of all the widgets to the compact binary form"""
+        return self.__models.snapshot()
+
+    def restore_snapshot(self, data: bytes) -> int:
+        """Set the values saved with `snapshot`. Returns the number of values set."""
+        return self.__models.restore(data)
 
     def on_export_btn_click(self, path):
-        """Sample callback that is used when the Export button is pressed."""
+        """Export the mesh to the path when the Export button is pressed."""
+        if self.__export_job and not self.__export_job.done():
+            self._show_message("Export", "The previous export is still running")
+            return
+        # It runs after the preview, so the window is responsive while the chunks are extracted
+        self.__export_cancel = threading.Event()
+        self.__export_job = self.__scheduler.submit(
+            partial(export_mesh, path, self.parameters, cancel_event=self.__export_cancel),
+            priority=EXPORT,
+            done_fn=partial(self._on_export_done, path),
+        )
+
+    def _on_export_done(self, path, job):
+        """Called by the scheduler when the export is finished"""
+        try:
+            result = job.result()
+        except (OSError, ValueError) as e:
+            self._show_message("Export Failed", f"The mesh is not exported to {path}: {e}")
+            return
+        if result:
+            self._show_message("Export Finished", f"{result.faces} faces are exported to {result.path}")
+
+    def _show_message(self, title, message):
         dialog = MessageDialog(
-            title="Button Pressed Dialog",
-            message=f"Export Button was clicked with path inside: {path}",
+            title=title,
+            message=message,
             disable_cancel_button=True,
             ok_handler=lambda dialog: dialog.hide()
         )
         dialog.show()
 
+    def _request_preview(self):
+        """Start rendering the preview with the current stages and the chosen render method"""
+        method = self.__store.get(RENDER_METHOD) if RENDER_METHOD in self.__store else None
+        renderer = self.__path_tracer if method == PATH_TRACED else self.__renderer
+        if renderer is not self.__active_renderer:
+            self.__active_renderer.cancel()
+            self.__active_renderer = renderer
+        renderer.request()
+
+    def _on_values_changed(self, names):
+        """Called by the store at the drag rate, the stages are dirtied right away"""
+        self.__pipeline.invalidate(names)
+        self.__scheduler.notify(names)
+
+    def _on_frame_changes(self, names):
+        """Called by the scheduler once per frame, the preview is restarted when its stages are dirty"""
+        if any(name == RENDER_METHOD or self.__pipeline.get_stages(name) for name in names):
+            self._request_preview()
+
+    def _on_frame(self):
+        """Called by the scheduler each frame while it's busy, copies the finished tiles to the image"""
+        renderer = self.__active_renderer
+        # The uint8 buffer is uploaded as is, only in the frames that copied the finished tiles
+        if renderer.take_tiles():
+            self.__preview_provider.set_data_array(renderer.pixels, list(renderer.size))
+
+    def _track(self, widget):
+        """Keep the custom widget, so it follows the layout properties of the
+        window, and register its models.
+        """
+        if widget.label_width != self.__label_width:
+            widget.label_width = self.__label_width
+        self.__widgets.append(widget)
+        widget.register_models(self.__models, self.__group)
+        return widget
+
+    def _attribute(self, label, default, dtype=FLOAT, options=None):
+        """The model of the "Group/label" attribute. It's added to the store
+        when it's built the first time.
+        """
+        name = f"{self.__group}/{label}"
+        if name not in self.__store:
+            self.__store.add(name, default, dtype, options)
+        return self.__store.get_model(name)
+
+    @contextmanager
+    def _build_group(self, title):
+        """Build the CollapsableFrame of the group. The widgets built in this
+        context register their models under the title.
+        """
+        previous = self.__group
+        self.__group = title
+        try:
+            with ui.CollapsableFrame(title.upper(), name="group",
+                                     build_header_fn=self._build_collapsable_header):
+                yield
+        finally:
+            self.__group = previous
+
     def _build_title(self):
         with ui.VStack():
             ui.Spacer(height=10)
@@ -83,102 +290,127 @@ class JuliaModelerWindow(ui.Window):
             ui.Spacer(height=8)
             ui.Line(style_type_name_override="HeaderLine")
 
+    def _build_preview(self):
+        """Build the preview image"""
+        with self._build_group("Preview"):
+            with ui.VStack(height=0, spacing=SPACING):
+                ui.Spacer(height=6)
+                ui.ImageWithProvider(self.__preview_provider, height=self.__renderer.size[1],
+                                     fill_policy=ui.IwpFillPolicy.IWP_PRESERVE_ASPECT_FIT)
+
     def _build_calculations(self):
         """Build the widgets of the "Calculations" group"""
-        with ui.CollapsableFrame("Calculations".upper(), name="group",
-                                 build_header_fn=self._build_collapsable_header):
+        with self._build_group("Calculations"):
             with ui.VStack(height=0, spacing=SPACING):
                 ui.Spacer(height=6)
 
-                CustomSliderWidget(min=0, max=20, num_type="int",
-                                   label="Precision", default_val=6)
+                self._track(CustomSliderWidget(self._attribute("Precision", 6, INT),
+                                               min=0, max=20, num_type="int",
+                                               label="Precision", default_val=6))
 
-                CustomSliderWidget(min=0, max=20, num_type="int",
-                                   label="Iterations", default_val=10)
+                self._track(CustomSliderWidget(self._attribute("Iterations", 10, INT),
+                                               min=0, max=20, num_type="int",
+                                               label="Iterations", default_val=10))
 
     def _build_parameters(self):
         """Build the widgets of the "Parameters" group"""
-        with ui.CollapsableFrame("Parameters".upper(), name="group",
-                                 build_header_fn=self._build_collapsable_header):
+        with self._build_group("Parameters"):
             with ui.VStack(height=0, spacing=SPACING):
                 ui.Spacer(height=6)
 
-                CustomSliderWidget(min=-2, max=2, display_range=True,
-                                   label="Iterations", default_val=0.75)
+                self._track(CustomSliderWidget(self._attribute("Iterations", 0.75),
+                                               min=-2, max=2, display_range=True,
+                                               label="Iterations", default_val=0.75))
 
-                CustomSliderWidget(min=0, max=2, display_range=True,
-                                   label="i", default_val=0.65)
+                self._track(CustomSliderWidget(self._attribute("i", 0.65),
+                                               min=0, max=2, display_range=True,
+                                               label="i", default_val=0.65))
 
-                CustomSliderWidget(min=0, max=2, display_range=True,
-                                   label="j", default_val=0.25)
+                self._track(CustomSliderWidget(self._attribute("j", 0.25),
+                                               min=0, max=2, display_range=True,
+                                               label="j", default_val=0.25))
 
-                CustomSliderWidget(min=0, max=2, display_range=True,
-                                   label="k", default_val=0.55)
+                self._track(CustomSliderWidget(self._attribute("k", 0.55),
+                                               min=0, max=2, display_range=True,
+                                               label="k", default_val=0.55))
 
-                CustomSliderWidget(min=0, max=3.14, display_range=True,
-                                   label="Theta", default_val=1.25)
+                self._track(CustomSliderWidget(self._attribute("Theta", 1.25),
+                                               min=0, max=3.14, display_range=True,
+                                               label="Theta", default_val=1.25))
 
     def _build_light_1(self):
         """Build the widgets of the "Light 1" group"""
-        with ui.CollapsableFrame("Light 1".upper(), name="group",
-                                 build_header_fn=self._build_collapsable_header):
+        with self._build_group("Light 1"):
             with ui.VStack(height=0, spacing=SPACING):
                 ui.Spacer(height=6)
 
-                CustomMultifieldWidget(
+                self._track(CustomMultifieldWidget(
+                    self._attribute("Orientation", [0.0, 0.0, 0.0]),
                     label="Orientation",
                     default_vals=[0.0, 0.0, 0.0]
-                )
+                ))
 
-                CustomSliderWidget(min=0, max=1.75, label="Intensity", default_val=1.75)
+                self._track(CustomSliderWidget(self._attribute("Intensity", 1.75),
+                                               min=0, max=1.75, label="Intensity", default_val=1.75))
 
-                CustomColorWidget(1.0, 0.875, 0.5, label="Color")
+                self._track(CustomColorWidget(1.0, 0.875, 0.5, label="Color",
+                                              model=self._attribute("Color", [1.0, 0.875, 0.5])))
 
-                CustomBoolWidget(label="Shadow", default_value=True)
+                self._track(CustomBoolWidget(self._attribute("Shadow", True, BOOL),
+                                             label="Shadow", default_value=True))
 
-                CustomSliderWidget(min=0, max=2, label="Shadow Softness", default_val=.1)
+                self._track(CustomSliderWidget(self._attribute("Shadow Softness", .1),
+                                               min=0, max=2, label="Shadow Softness", default_val=.1))
 
     def _build_scene(self):
         """Build the widgets of the "Scene" group"""
-        with ui.CollapsableFrame("Scene".upper(), name="group",
-                                 build_header_fn=self._build_collapsable_header):
+        with self._build_group("Scene"):
             with ui.VStack(height=0, spacing=SPACING):
                 ui.Spacer(height=6)
 
-                CustomSliderWidget(min=0, max=160, display_range=True,
-                                   num_type="int", label="Field of View", default_val=60)
+                self._track(CustomSliderWidget(self._attribute("Field of View", 60, INT),
+                                               min=0, max=160, display_range=True,
+                                               num_type="int", label="Field of View", default_val=60))
 
-                CustomMultifieldWidget(
+                self._track(CustomMultifieldWidget(
+                    self._attribute("Orientation", [0.0, 0.0, 0.0]),
                     label="Orientation",
                     default_vals=[0.0, 0.0, 0.0]
-                )
+                ))
 
-                CustomSliderWidget(min=0, max=2, label="Camera Distance", default_val=.1)
+                self._track(CustomSliderWidget(self._attribute("Camera Distance", .1),
+                                               min=0, max=2, label="Camera Distance", default_val=.1))
 
-                CustomBoolWidget(label="Antialias", default_value=False)
+                self._track(CustomBoolWidget(self._attribute("Antialias", False, BOOL),
+                                             label="Antialias", default_value=False))
 
-                CustomBoolWidget(label="Ambient Occlusion", default_value=True)
+                self._track(CustomBoolWidget(self._attribute("Ambient Occlusion", True, BOOL),
+                                             label="Ambient Occlusion", default_value=True))
 
-                CustomMultifieldWidget(
+                self._track(CustomMultifieldWidget(
+                    self._attribute("Ambient Distance", [0.0, 200.0]),
                     label="Ambient Distance",
                     sublabels=["Min", "Max"],
                     default_vals=[0.0, 200.0]
-                )
+                ))
 
-                CustomComboboxWidget(label="Ambient Falloff",
-                                     options=["Linear", "Quadratic", "Cubic"])
+                falloff_options = ["Linear", "Quadratic", "Cubic"]
+                self._track(CustomComboboxWidget(self._attribute("Ambient Falloff", 0, INT, falloff_options),
+                                                 label="Ambient Falloff", options=falloff_options))
 
-                CustomColorWidget(.6, 0.62, 0.9, label="Background Color")
+                self._track(CustomColorWidget(.6, 0.62, 0.9, label="Background Color",
+                                              model=self._attribute("Background Color", [.6, 0.62, 0.9])))
 
-                CustomRadioCollection("Render Method", labels=["Path Traced", "Volumetric"],
-                                      default_value=1)
+                self._track(CustomRadioCollection("Render Method", labels=["Path Traced", "Volumetric"],
+                                                  model=self._attribute("Render Method", 1, INT),
+                                                  default_value=1))
 
-                CustomPathButtonWidget(
+                self._track(CustomPathButtonWidget(
                     label="Export Path",
                     path=".../export/mesh1.usd",
                     btn_label="Export",
                     btn_callback=self.on_export_btn_click,
-                )
+                ))
 
                 ui.Spacer(height=10)
 
@@ -187,11 +419,21 @@ class JuliaModelerWindow(ui.Window):
         The method that is called to build all the UI once the window is
         visible.
         """
-        with ui.ScrollingFrame(name="window_bg",
-                               horizontal_scrollbar_policy=ui.ScrollBarPolicy.SCROLLBAR_ALWAYS_OFF):
-            with ui.VStack(height=0):
-                self._build_title()
-                self._build_calculations()
-                self._build_parameters()
-                self._build_light_1()
-                self._build_scene()
+        self.__widgets = []
+        # The widgets are recreated with their models
+        self.__models.clear()
+
+        with self.__profiler.build(self.frame):
+            with ui.ScrollingFrame(name="window_bg",
+                                   horizontal_scrollbar_policy=ui.ScrollBarPolicy.SCROLLBAR_ALWAYS_OFF):
+                stack = ui.VStack(height=0)
+                with stack:
+                    self.__profiler.call(self._build_title, stack)
+                    self.__profiler.call(self._build_preview, stack)
+                    self.__profiler.call(self._build_calculations, stack)
+                    self.__profiler.call(self._build_parameters, stack)
+                    self.__profiler.call(self._build_light_1, stack)
+                    self.__profiler.call(self._build_scene, stack)
+
+        # All the values are in the store now
+        self._request_preview()
@@ -0,0 +1,200 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["BuildProfiler", "count_widgets"]
+
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+import json
+import time
+import tracemalloc
+import omni.ui as ui
+
+
+def count_widgets(widget: ui.Widget) -> int:
+    """The number of widgets in the tree including the given one"""
+    count = 0
+    stack = [widget]
+    while stack:
+        current = stack.pop()
+        count += 1
+        stack.extend(ui.Inspector.get_children(current))
+    return count
+
+
+class BuildRecord:
+    """The cost of one build of a section or of the whole window"""
+
+    def __init__(self, name: str, wall_time: float, widgets: Optional[int], allocated: Optional[int]):
+        self.name = name
+        # Seconds
+        self.wall_time = wall_time
+        # None when unknown
+        self.widgets = widgets
+        # Bytes allocated by Python and not freed yet, None when unknown
+        self.allocated = allocated
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "wall_time_ms": self.wall_time * 1000.0,
+            "widgets": self.widgets,
+            "allocated_bytes": self.allocated,
+        }
+
+
+class BuildProfiler:
+    """
+    Opt-in profiler of the window build. It records the wall time, the number
+    of widgets and the Python allocations of each section builder and of each
+    build of the whole window. When it's disabled, the sections are just called.
+
+    The Python allocations are traced with `tracemalloc`, that is started when
+    the profiler is enabled, and it makes the build slower. So the numbers are
+    good for comparing the sections and the builds with each other. With
+    `trace_memory` off, only the wall time and the widgets are recorded and
+    the build runs at its real speed, e.g. for the benchmarks.
+    """
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = True):
+        self.__enabled = False
+        self.__trace_memory = bool(trace_memory)
+        self.__started_tracemalloc = False
+        self.__builds: List[BuildRecord] = []
+        self.__sections: Dict[str, List[BuildRecord]] = {}
+        self.enabled = enabled
+
+    def destroy(self):
+        self.enabled = False
+
+    @property
+    def enabled(self) -> bool:
+        """True when the profiler records the builds"""
+        return self.__enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        """True when the profiler records the builds"""
+        value = bool(value)
+        if value == self.__enabled:
+            return
+        self.__enabled = value
+        self.__update_tracemalloc()
+
+    @property
+    def trace_memory(self) -> bool:
+        """True when the Python allocations are recorded with tracemalloc"""
+        return self.__trace_memory
+
+    @trace_memory.setter
+    def trace_memory(self, value: bool):
+        """True when the Python allocations are recorded with tracemalloc"""
+        self.__trace_memory = bool(value)
+        self.__update_tracemalloc()
+
+    @property
+    def builds(self) -> List[BuildRecord]:
+        """The records of the whole window builds. Everything after the first one is a rebuild."""
+        return list(self.__builds)
+
+    @property
+    def sections(self) -> Dict[str, List[BuildRecord]]:
+        """The records of each section builder"""
+        return {name: list(records) for name, records in self.__sections.items()}
+
+    def reset(self):
+        """Forget all the records"""
+        self.__builds = []
+        self.__sections = {}
+
+    @contextmanager
+    def build(self, root: Optional[ui.Widget] = None):
+        """Record the build of the whole window. The widgets are counted in root."""
+        if not self.__enabled:
+            yield
+            return
+
+        with self.__measure() as measure:
+            yield
+        widgets = count_widgets(root) if root else None
+        self.__builds.append(BuildRecord("build", measure["wall_time"], widgets, measure["allocated"]))
+
+    def call(self, build_fn: Callable[[], None], parent: Optional[ui.Widget] = None, name: str = None):
+        """
+        Call the section builder and record it with its name. The widgets are
+        counted in the new children of parent.
+        """
+        if not self.__enabled:
+            return build_fn()
+
+        name = name or build_fn.__name__
+        children_before = len(ui.Inspector.get_children(parent)) if parent else 0
+        with self.__measure() as measure:
+            result = build_fn()
+        widgets = None
+        if parent:
+            widgets = sum(count_widgets(child) for child in ui.Inspector.get_children(parent)[children_before:])
+        record = BuildRecord(name, measure["wall_time"], widgets, measure["allocated"])
+        self.__sections.setdefault(name, []).append(record)
+        return result
+
+    def summary(self) -> dict:
+        """The totals per section and per build"""
+
+        def summarize(records: List[BuildRecord]) -> dict:
+            times = [r.wall_time * 1000.0 for r in records]
+            return {
+                "count": len(records),
+                "total_ms": sum(times),
+                "mean_ms": sum(times) / len(times) if times else 0.0,
+                "max_ms": max(times) if times else 0.0,
+                "last_widgets": records[-1].widgets if records else None,
+                "last_allocated_bytes": records[-1].allocated if records else None,
+            }
+
+        return {
+            "builds": summarize(self.__builds),
+            "rebuilds": max(0, len(self.__builds) - 1),
+            "sections": {name: summarize(records) for name, records in self.__sections.items()},
+        }
+
+    def to_dict(self) -> dict:
+        """All the records"""
+        return {
+            "summary": self.summary(),
+            "builds": [r.to_dict() for r in self.__builds],
+            "sections": {name: [r.to_dict() for r in records] for name, records in self.__sections.items()},
+        }
+
+    def dump_json(self, path: str):
+        """Write all the records to the JSON file"""
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def __update_tracemalloc(self):
+        """Start tracemalloc when the memory is recorded, and stop it if it's started here"""
+        tracing = self.__enabled and self.__trace_memory
+        if tracing and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracemalloc = True
+        elif not tracing and self.__started_tracemalloc:
+            tracemalloc.stop()
+            self.__started_tracemalloc = False
+
+    @contextmanager
+    def __measure(self):
+        measure = {"wall_time": 0.0, "allocated": None}
+        tracing = self.__trace_memory and tracemalloc.is_tracing()
+        allocated_before = tracemalloc.get_traced_memory()[0] if tracing else 0
+        start = time.perf_counter()
+        try:
+            yield measure
+        finally:
+            measure["wall_time"] = time.perf_counter() - start
+            if tracing:
+                measure["allocated"] = tracemalloc.get_traced_memory()[0] - allocated_before
@@ -6,4 +6,6 @@
 # distribution of this software and related documentation without an express
 # license agreement from NVIDIA CORPORATION is strictly prohibited.
 #
+from .test_benchmark import TestBenchmark
+from .test_virtualized_list import TestVirtualizedList
 from .test_window import TestWindow
\ No newline at end of file
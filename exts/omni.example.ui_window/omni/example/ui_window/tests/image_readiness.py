@@ -0,0 +1,95 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["wait_for_images"]
+
+from functools import partial
+from typing import List, Optional
+import time
+
+import omni.kit.app
+import omni.ui as ui
+
+# The frames to draw after all the images are loaded
+SETTLE_FRAMES = 2
+# Seconds
+TIMEOUT = 10.0
+
+
+def _selector_matches(selector: str, image: ui.Image) -> bool:
+    """True if the style selector like "Image::name" applies to the image in the normal state"""
+    widget_type, _, name = selector.partition("::")
+    widget_type, _, type_state = widget_type.partition(":")
+    name, _, name_state = name.partition(":")
+    return widget_type in ("", "Image") and name in ("", image.name) and not type_state and not name_state
+
+
+def _get_image_url(image: ui.Image, styles: List[dict]) -> Optional[str]:
+    """The url of the image, from source_url or from the styles of the image and its parents"""
+    if image.source_url:
+        return image.source_url
+    url = None
+    # The inner styles override the outer ones
+    for style in styles:
+        for selector, value in style.items():
+            if isinstance(value, dict) and value.get("image_url") and _selector_matches(selector, image):
+                url = value["image_url"]
+    return (image.style or {}).get("image_url") or url
+
+
+def _find_images(widget: ui.Widget, styles: List[dict], images: List[ui.Image]):
+    """Collect the images of the built widget tree that have the url to load"""
+    if widget.style:
+        styles = styles + [widget.style]
+    # ImageWithProvider is not loaded, its provider already has the bytes
+    if isinstance(widget, ui.Image) and _get_image_url(widget, styles):
+        images.append(widget)
+    for child in ui.Inspector.get_children(widget):
+        _find_images(child, styles, images)
+
+
+async def wait_for_images(window: ui.Window, timeout: float = TIMEOUT, settle_frames: int = SETTLE_FRAMES) -> bool:
+    """
+    Wait until the images of the window are loaded. Start it before the first
+    frame of the window, e.g. with `asyncio.ensure_future`, so every `ui.Image`
+    is subscribed to the progress in the frame it's built, before it's loaded.
+    Only the images that have the url in `source_url` or in the resolved
+    style are waited, until they report the progress 1.0. Returns False when
+    it's timed out.
+    """
+    app = omni.kit.app.get_app()
+    # id of the image -> True when it's loaded
+    loaded = {}
+    # Keep the subscribed images, so their ids are not reused
+    subscribed = []
+
+    def on_progress(image_id, progress):
+        if progress >= 1.0:
+            loaded[image_id] = True
+
+    deadline = time.monotonic() + timeout
+    try:
+        while time.monotonic() < deadline:
+            images = []
+            _find_images(window.frame, [], images)
+            for image in images:
+                if id(image) not in loaded:
+                    loaded[id(image)] = False
+                    subscribed.append(image)
+                    image.set_progress_changed_fn(partial(on_progress, id(image)))
+            # The frame of the window is built on its first draw
+            built = bool(ui.Inspector.get_children(window.frame))
+            if built and all(loaded[id(image)] for image in images):
+                for _ in range(settle_frames):
+                    await app.next_update_async()
+                return True
+            await app.next_update_async()
+        return False
+    finally:
+        for image in subscribed:
+            image.set_progress_changed_fn(lambda progress: None)
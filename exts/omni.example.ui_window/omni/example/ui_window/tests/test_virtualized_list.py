@@ -0,0 +1,95 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["TestVirtualizedList"]
+
+from omni.example.ui_window.virtualized_list import AttributeRowDelegate, VirtualizedList
+import omni.kit.app
+import omni.kit.test
+import omni.ui as ui
+
+ROW_COUNT = 20000
+ROW_HEIGHT = 20
+
+
+class _CountingDelegate(AttributeRowDelegate):
+    """Counts the rows built and keeps them to check what they are bound to"""
+
+    def __init__(self, attributes):
+        super().__init__(attributes)
+        self.rows = []
+
+    def build_row(self):
+        row = super().build_row()
+        self.rows.append(row)
+        return row
+
+
+class TestVirtualizedList(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self.attributes = [(f"Attribute {i}", ui.SimpleFloatModel(i)) for i in range(ROW_COUNT)]
+        self.delegate = _CountingDelegate(self.attributes)
+        self.window = ui.Window("Virtualized", width=300, height=300)
+        with self.window.frame:
+            self.list = VirtualizedList(self.delegate, row_height=ROW_HEIGHT, height=200)
+        await self._wait()
+
+    async def tearDown(self):
+        self.list.destroy()
+        self.window.destroy()
+
+    async def _wait(self):
+        for _ in range(2):
+            await omni.kit.app.get_app().next_update_async()
+
+    def _check_rows(self):
+        """Every index of the visible range is shown by exactly one row with its label and model"""
+        first, last = self.list.visible_range
+        shown = {}
+        for label, field in self.delegate.rows:
+            index = int(label.text.split()[-1])
+            shown[index] = field
+        for index in range(first, last):
+            self.assertIn(index, shown)
+            self.assertEqual(shown[index].model, self.attributes[index][1])
+
+    async def test_scroll(self):
+        """Testing the number of the widgets doesn't change when scrolling 20,000 rows"""
+        built = self.list.built_rows
+        self.assertGreater(built, 0)
+        self.assertLess(built, 40)
+        self.assertEqual(len(self.delegate.rows), built)
+        self._check_rows()
+
+        for index in (5000, ROW_COUNT - 10, 12345, 0, 17):
+            self.list.scroll_to(index)
+            await self._wait()
+            first, last = self.list.visible_range
+            self.assertLessEqual(first, index)
+            self.assertLess(index, last)
+            # The rows are recycled, no new widgets
+            self.assertEqual(self.list.built_rows, built)
+            self.assertEqual(len(self.delegate.rows), built)
+            self._check_rows()
+
+        self.list.scroll_to(ROW_COUNT - 10)
+        await self._wait()
+        self.assertEqual(self.list.visible_range[1], ROW_COUNT)
+
+    async def test_refresh(self):
+        """Testing the rows are rebound when the data is replaced"""
+        self.list.scroll_to(100)
+        await self._wait()
+        self.attributes = [(f"Other {i}", ui.SimpleFloatModel(-i)) for i in range(ROW_COUNT // 2)]
+        self.delegate.attributes = self.attributes
+        self.list.refresh()
+        await self._wait()
+        self.assertEqual(len(self.delegate.rows), self.list.built_rows)
+        self._check_rows()
+        first, _ = self.list.visible_range
+        self.assertTrue(any(label.text == f"Other {first}" for label, _ in self.delegate.rows))
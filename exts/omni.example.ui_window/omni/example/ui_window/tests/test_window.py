@@ -11,9 +11,12 @@ __all__ = ["TestWindow"]
 from omni.example.ui_window import ExampleWindow
 from omni.ui.tests.test_base import OmniUiTest
 from pathlib import Path
+import asyncio
 import omni.kit.app
 import omni.kit.test
 
+from .image_readiness import wait_for_images
+
 
 EXTENSION_FOLDER_PATH = Path(omni.kit.app.get_app().get_extension_manager().get_extension_path_by_module(__name__))
 TEST_DATA_PATH = EXTENSION_FOLDER_PATH.joinpath("data/tests")
@@ -23,6 +26,8 @@ class TestWindow(OmniUiTest):
     async def test_general(self):
         """Testing general look of section"""
         window = ExampleWindow("Test")
+        # Subscribe to the progress of the images before they are built and loaded
+        images_loaded = asyncio.ensure_future(wait_for_images(window))
         await omni.kit.app.get_app().next_update_async()
         await self.docked_test_window(
             window=window,
@@ -31,7 +36,6 @@ class TestWindow(OmniUiTest):
         )
 
         # Wait for images
-        for _ in range(20):
-            await omni.kit.app.get_app().next_update_async()
+        self.assertTrue(await images_loaded)
 
         await self.finalize_test(golden_img_dir=TEST_DATA_PATH, golden_img_name="window.png")
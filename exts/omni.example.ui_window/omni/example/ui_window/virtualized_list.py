@@ -0,0 +1,198 @@
+# Copyright (c) 2022, NVIDIA CORPORATION.  All rights reserved.
+#
+# NVIDIA CORPORATION and its licensors retain all intellectual property
+# and proprietary rights in and to this software, related documentation
+# and any modifications thereto.  Any use, reproduction, disclosure or
+# distribution of this software and related documentation without an express
+# license agreement from NVIDIA CORPORATION is strictly prohibited.
+#
+__all__ = ["AbstractRowDelegate", "AttributeRowDelegate", "VirtualizedList"]
+
+from typing import Any, List, Optional, Sequence, Tuple
+import math
+import omni.ui as ui
+
+# The number of rows built above and below the visible area
+OVERSCAN = 4
+
+
+class AbstractRowDelegate:
+    """The delegate that builds the widgets of one row and binds them to the data"""
+
+    @property
+    def count(self) -> int:
+        """The number of rows"""
+        return 0
+
+    def build_row(self) -> Any:
+        """
+        Build the widgets of one row. The returned object is passed to
+        `bind_row`. The rows are recycled, so it should not depend on the index.
+        """
+        pass
+
+    def bind_row(self, row: Any, index: int):
+        """Connect the widgets of the row to the data of the given index"""
+        pass
+
+
+class AttributeRowDelegate(AbstractRowDelegate):
+    """The delegate for the list of (label, float value model) attributes"""
+
+    def __init__(self, attributes: Sequence[Tuple[str, ui.AbstractValueModel]], label_width=120):
+        self.attributes = attributes
+        self.__label_width = label_width
+        # All the labels built, to change their width in place
+        self._labels: List[ui.Label] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.attributes)
+
+    @property
+    def label_width(self):
+        """The width of the attribute label"""
+        return self.__label_width
+
+    @label_width.setter
+    def label_width(self, value):
+        """The width of the attribute label. The built rows are updated in place."""
+        self.__label_width = value
+        for label in self._labels:
+            label.width = ui.Pixel(value)
+
+    def build_row(self):
+        with ui.HStack():
+            label = ui.Label("", name="attribute_name", width=self.label_width)
+            field = ui.FloatDrag(name="attribute_float")
+        self._labels.append(label)
+        return label, field
+
+    def bind_row(self, row, index: int):
+        label, field = row
+        name, model = self.attributes[index]
+        label.text = name
+        field.model = model
+
+
+class _Slot:
+    """The recycled row of VirtualizedList"""
+
+    def __init__(self, placer: ui.Placer, row: Any):
+        self.placer = placer
+        self.row = row
+        self.index: Optional[int] = None
+
+
+class VirtualizedList:
+    """
+    The scrolling list that only builds the rows intersecting the visible area
+    plus a few rows of overscan. When the user scrolls, the rows that go out
+    of view are moved to the new position and bound to the new index, so the
+    number of widgets doesn't depend on the number of rows.
+
+    All the rows have the same height.
+    """
+
+    def __init__(self, delegate: AbstractRowDelegate, row_height: float, overscan: int = OVERSCAN, **kwargs):
+        self.__delegate = delegate
+        self.__row_height = row_height
+        self.__overscan = overscan
+        self.__slots: List[_Slot] = []
+        self.__first = 0
+        self.__last = 0
+
+        kwargs.setdefault("horizontal_scrollbar_policy", ui.ScrollBarPolicy.SCROLLBAR_ALWAYS_OFF)
+        self.__scrolling_frame = ui.ScrollingFrame(**kwargs)
+        with self.__scrolling_frame:
+            self.__content = ui.ZStack(height=0)
+            with self.__content:
+                # Makes the content as tall as all the rows
+                self.__spacer = ui.Spacer(height=self.__total_height())
+
+        self.__scrolling_frame.set_scroll_y_changed_fn(lambda _: self.__update())
+        self.__scrolling_frame.set_computed_content_size_changed_fn(self.__update)
+        self.__update()
+
+    def destroy(self):
+        self.__slots = []
+        self.__delegate = None
+        self.__spacer = None
+        self.__content = None
+        self.__scrolling_frame = None
+
+    def __getattr__(self, attr):
+        """
+        Pretend it's the ScrollingFrame, so we have access to width/height and
+        callbacks.
+        """
+        return getattr(self.__scrolling_frame, attr)
+
+    @property
+    def delegate(self) -> AbstractRowDelegate:
+        return self.__delegate
+
+    @property
+    def visible_range(self) -> Tuple[int, int]:
+        """The range of the indices that have the widgets now"""
+        return self.__first, self.__last
+
+    @property
+    def built_rows(self) -> int:
+        """The number of the row widgets, that is independent of the number of rows"""
+        return len(self.__slots)
+
+    def refresh(self):
+        """
+        Rebind all the rows. Should be called when the count of the delegate
+        or the data behind the rows is changed.
+        """
+        self.__spacer.height = ui.Pixel(self.__total_height())
+        for slot in self.__slots:
+            slot.index = None
+        self.__update()
+
+    def scroll_to(self, index: int):
+        """Scroll so the row is at the top"""
+        self.__scrolling_frame.scroll_y = index * self.__row_height
+
+    def __total_height(self):
+        return self.__delegate.count * self.__row_height
+
+    def __update(self):
+        if not self.__scrolling_frame:
+            return
+
+        count = self.__delegate.count
+        scroll_y = self.__scrolling_frame.scroll_y
+        viewport = self.__scrolling_frame.computed_height
+        first = max(0, int(scroll_y // self.__row_height) - self.__overscan)
+        last = min(count, math.ceil((scroll_y + viewport) / self.__row_height) + self.__overscan)
+        first = min(first, last)
+        self.__first, self.__last = first, last
+
+        # Grow the pool of the rows when the viewport became taller
+        while len(self.__slots) < last - first:
+            with self.__content:
+                placer = ui.Placer(offset_y=0)
+                with placer:
+                    with ui.Frame(height=self.__row_height):
+                        row = self.__delegate.build_row()
+            self.__slots.append(_Slot(placer, row))
+
+        # The slot of the row is `index % slots`, so when scrolling, only the
+        # rows that appear are rebound and the rest stay untouched
+        slots = len(self.__slots)
+        visible = set()
+        for index in range(first, last):
+            slot = self.__slots[index % slots]
+            visible.add(id(slot))
+            if slot.index != index:
+                slot.index = index
+                slot.placer.offset_y = index * self.__row_height
+                self.__delegate.bind_row(slot.row, index)
+            slot.placer.visible = True
+
+        for slot in self.__slots:
+            if id(slot) not in visible:
+                slot.placer.visible = False
@@ -11,9 +11,14 @@ __all__ = ["ExampleWindow"]
 import omni.ui as ui
 from .style import example_window_style
 from .color_widget import ColorWidget
+from .profiler import BuildProfiler
+from .snapshot import BOOL, FLOAT, INT, VECTOR, ModelRegistry
+from .virtualized_list import AttributeRowDelegate, VirtualizedList
 
 LABEL_WIDTH = 120
 SPACING = 4
+ATTRIBUTE_ROW_HEIGHT = 22
+ATTRIBUTES_HEIGHT = 300
 
 
 class ExampleWindow(ui.Window):
@@ -21,6 +26,15 @@ class ExampleWindow(ui.Window):
 
     def __init__(self, title: str, delegate=None, **kwargs):
         self.__label_width = LABEL_WIDTH
+        # The labels that follow label_width
+        self.__labels = []
+        # The list of (name, model) shown in the virtualized "Attributes" group
+        self.__attributes = kwargs.pop("attributes", None)
+        self.__attribute_list = None
+        # Opt-in, records the cost of each section builder, only the time with profile_memory=False
+        self.__profiler = BuildProfiler(kwargs.pop("profile", False), kwargs.pop("profile_memory", True))
+        # The models of the widgets, saved and restored with snapshots
+        self.__models = ModelRegistry()
 
         super().__init__(title, **kwargs)
 
@@ -31,6 +45,11 @@ class ExampleWindow(ui.Window):
         self.frame.set_build_fn(self._build_fn)
 
     def destroy(self):
+        if self.__attribute_list:
+            self.__attribute_list.destroy()
+            self.__attribute_list = None
+        self.__profiler.destroy()
+        self.__models.destroy()
         # It will destroy all the children
         super().destroy()
 
@@ -43,7 +62,57 @@ class ExampleWindow(ui.Window):
     def label_width(self, value):
         """The width of the attribute label"""
         self.__label_width = value
-        self.frame.rebuild()
+        # Only the width is changed, so the labels are updated in place
+        for label in self.__labels:
+            label.width = ui.Pixel(value)
+        if self.__attribute_list:
+            self.__attribute_list.delegate.label_width = value
+
+    @property
+    def profiler(self) -> BuildProfiler:
+        """The profiler of the section builders. Set `profiler.enabled` to start recording."""
+        return self.__profiler
+
+    @property
+    def attributes(self):
+        """The list of (name, model) shown in the "Attributes" group"""
+        return self.__attributes
+
+    @attributes.setter
+    def attributes(self, value):
+        """The list of (name, model) shown in the "Attributes" group"""
+        had_attributes = bool(self.__attributes)
+        self._unregister_attributes()
+        self.__attributes = value
+        self._register_attributes()
+        if self.__attribute_list and value:
+            # Only the visible rows are rebound
+            self.__attribute_list.delegate.attributes = value
+            self.__attribute_list.refresh()
+        elif had_attributes != bool(value):
+            self.frame.rebuild()
+
+    @property
+    def models(self) -> ModelRegistry:
+        """The models of the widgets by "Group/Label" key"""
+        return self.__models
+
+    def snapshot(self) -> bytes:
+        """Save the values of all the widgets to the compact binary form"""
+        return self.__models.snapshot()
+
+    def restore_snapshot(self, data: bytes) -> int:
+        """Set the values saved with `snapshot`. Returns the number of values set."""
+        return self.__models.restore(data)
+
+    def _register_attributes(self):
+        """Add the models of the "Attributes" group to the snapshot"""
+        for name, model in self.__attributes or []:
+            self.__models.register(f"Attributes/{name}", model, FLOAT)
+
+    def _unregister_attributes(self):
+        for name, _ in self.__attributes or []:
+            self.__models.unregister(f"Attributes/{name}")
 
     def _build_collapsable_header(self, collapsed, title):
         """Build a custom title of CollapsableFrame"""
@@ -56,70 +125,110 @@ class ExampleWindow(ui.Window):
                 image_name = "collapsable_closed"
             ui.Image(name=image_name, width=20, height=20)
 
+    def _build_label(self, text):
+        """Build the attribute label, its width follows label_width"""
+        label = ui.Label(text, name="attribute_name", width=self.label_width)
+        self.__labels.append(label)
+        return label
+
     def _build_calculations(self):
         """Build the widgets of the "Calculations" group"""
         with ui.CollapsableFrame("Calculations", name="group", build_header_fn=self._build_collapsable_header):
             with ui.VStack(height=0, spacing=SPACING):
                 with ui.HStack():
-                    ui.Label("Precision", name="attribute_name", width=self.label_width)
-                    ui.IntSlider(name="attribute_int")
+                    self._build_label("Precision")
+                    slider = ui.IntSlider(name="attribute_int")
+                    self.__models.register("Calculations/Precision", slider.model, INT)
 
                 with ui.HStack():
-                    ui.Label("Iterations", name="attribute_name", width=self.label_width)
-                    ui.IntSlider(name="attribute_int", min=0, max=5)
+                    self._build_label("Iterations")
+                    slider = ui.IntSlider(name="attribute_int", min=0, max=5)
+                    self.__models.register("Calculations/Iterations", slider.model, INT)
 
     def _build_parameters(self):
         """Build the widgets of the "Parameters" group"""
         with ui.CollapsableFrame("Parameters", name="group", build_header_fn=self._build_collapsable_header):
             with ui.VStack(height=0, spacing=SPACING):
                 with ui.HStack():
-                    ui.Label("Value", name="attribute_name", width=self.label_width)
-                    ui.FloatSlider(name="attribute_float")
+                    self._build_label("Value")
+                    slider = ui.FloatSlider(name="attribute_float")
+                    self.__models.register("Parameters/Value", slider.model, FLOAT)
 
                 with ui.HStack():
-                    ui.Label("i", name="attribute_name", width=self.label_width)
-                    ui.FloatSlider(name="attribute_float", min=-1, max=1)
+                    self._build_label("i")
+                    slider = ui.FloatSlider(name="attribute_float", min=-1, max=1)
+                    self.__models.register("Parameters/i", slider.model, FLOAT)
 
                 with ui.HStack():
-                    ui.Label("j", name="attribute_name", width=self.label_width)
-                    ui.FloatSlider(name="attribute_float", min=-1, max=1)
+                    self._build_label("j")
+                    slider = ui.FloatSlider(name="attribute_float", min=-1, max=1)
+                    self.__models.register("Parameters/j", slider.model, FLOAT)
 
                 with ui.HStack():
-                    ui.Label("k", name="attribute_name", width=self.label_width)
-                    ui.FloatSlider(name="attribute_float", min=-1, max=1)
+                    self._build_label("k")
+                    slider = ui.FloatSlider(name="attribute_float", min=-1, max=1)
+                    self.__models.register("Parameters/k", slider.model, FLOAT)
 
                 with ui.HStack():
-                    ui.Label("Theta", name="attribute_name", width=self.label_width)
-                    ui.FloatSlider(name="attribute_float")
+                    self._build_label("Theta")
+                    slider = ui.FloatSlider(name="attribute_float")
+                    self.__models.register("Parameters/Theta", slider.model, FLOAT)
 
     def _build_light_1(self):
         """Build the widgets of the "Light 1" group"""
         with ui.CollapsableFrame("Light 1", name="group", build_header_fn=self._build_collapsable_header):
             with ui.VStack(height=0, spacing=SPACING):
                 with ui.HStack():
-                    ui.Label("Orientation", name="attribute_name", width=self.label_width)
-                    ui.MultiFloatDragField(0.0, 0.0, 0.0, h_spacing=SPACING, name="attribute_vector")
+                    self._build_label("Orientation")
+                    field = ui.MultiFloatDragField(0.0, 0.0, 0.0, h_spacing=SPACING, name="attribute_vector")
+                    self.__models.register("Light 1/Orientation", field.model, VECTOR)
 
                 with ui.HStack():
-                    ui.Label("Intensity", name="attribute_name", width=self.label_width)
-                    ui.FloatSlider(name="attribute_float")
+                    self._build_label("Intensity")
+                    slider = ui.FloatSlider(name="attribute_float")
+                    self.__models.register("Light 1/Intensity", slider.model, FLOAT)
 
                 with ui.HStack():
-                    ui.Label("Color", name="attribute_name", width=self.label_width)
+                    self._build_label("Color")
                     # The custom compound widget
-                    ColorWidget(0.25, 0.5, 0.75)
+                    color_widget = ColorWidget(0.25, 0.5, 0.75)
+                    self.__models.register("Light 1/Color", color_widget.model, VECTOR)
 
                 with ui.HStack():
-                    ui.Label("Shadow", name="attribute_name", width=self.label_width)
-                    ui.CheckBox(name="attribute_bool")
+                    self._build_label("Shadow")
+                    checkbox = ui.CheckBox(name="attribute_bool")
+                    self.__models.register("Light 1/Shadow", checkbox.model, BOOL)
+
+    def _build_attributes(self):
+        """Build the "Attributes" group. Only the visible rows have widgets."""
+        if self.__attribute_list:
+            self.__attribute_list.destroy()
+            self.__attribute_list = None
+        if not self.__attributes:
+            return
+
+        with ui.CollapsableFrame("Attributes", name="group", build_header_fn=self._build_collapsable_header):
+            self.__attribute_list = VirtualizedList(
+                AttributeRowDelegate(self.__attributes, self.label_width),
+                row_height=ATTRIBUTE_ROW_HEIGHT,
+                height=ATTRIBUTES_HEIGHT,
+            )
 
     def _build_fn(self):
         """
         The method that is called to build all the UI once the window is
         visible.
         """
-        with ui.ScrollingFrame():
-            with ui.VStack(height=0):
-                self._build_calculations()
-                self._build_parameters()
-                self._build_light_1()
+        self.__labels = []
+        # The widgets are recreated with their models
+        self.__models.clear()
+        self._register_attributes()
+
+        with self.__profiler.build(self.frame):
+            with ui.ScrollingFrame():
+                stack = ui.VStack(height=0)
+                with stack:
+                    self.__profiler.call(self._build_calculations, stack)
+                    self.__profiler.call(self._build_parameters, stack)
+                    self.__profiler.call(self._build_light_1, stack)
+                    self.__profiler.call(self._build_attributes, stack)